@@ -1,41 +1,154 @@
 """Cleanup utilities for managing temporary repos and embeddings."""
 
+import asyncio
+import logging
+import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
-from qdrant_client import QdrantClient
-from config.settings import Settings
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+from config.connections import qdrant_client_kwargs
+from config.settings import Settings, get_settings
+
+if TYPE_CHECKING:
+    from qdrant_client import QdrantClient
+
+
+log = logging.getLogger(__name__)
+
+# Qdrant clients shared across CleanupManager instances, keyed by connection params
+_QDRANT_CLIENTS: Dict[Tuple[str, Optional[str], bool], "QdrantClient"] = {}
+
+
+def _get_qdrant_client(settings: Settings) -> "QdrantClient":
+    """Return the process-wide Qdrant client for these settings, creating it once."""
+    key = (settings.qdrant_url, settings.qdrant_api_key, settings.qdrant_prefer_grpc)
+    client = _QDRANT_CLIENTS.get(key)
+    if client is None:
+        # Imported here so filesystem-only cleanup never loads qdrant-client/grpc
+        from qdrant_client import QdrantClient
+        
+        client = QdrantClient(
+            **qdrant_client_kwargs(settings.qdrant_url, settings.qdrant_api_key, settings.qdrant_prefer_grpc)
+        )
+        _QDRANT_CLIENTS[key] = client
+    return client
+
+
+def close_qdrant_clients() -> None:
+    """Close and forget every shared Qdrant client (call on shutdown)."""
+    while _QDRANT_CLIENTS:
+        _, client = _QDRANT_CLIENTS.popitem()
+        try:
+            client.close()
+        except Exception as e:
+            log.warning("⚠️  Failed to close Qdrant client: %s", e)
+
+
+def vector_repo_name(repo_id: str) -> str:
+    """
+    Return the 'repo' payload (owner/name) of a repo's Qdrant points.
+    
+    repo_id is "{owner}_{name}_{branch}"; GitHub owners cannot contain
+    underscores, so the first one always ends the owner.
+    
+    Args:
+        repo_id: Repository ID, e.g. "owner_my_repo_main"
+        
+    Returns:
+        Repository full name, e.g. "owner/my_repo"
+    """
+    owner, rest = repo_id.split("_", 1)
+    return f"{owner}/{rest.rsplit('_', 1)[0]}"
+
+
+def fast_rmtree(path: Path, workers: int = 16) -> None:
+    """
+    Delete a directory tree, unlinking files from a thread pool.
+    
+    Cloned repos hold tens of thousands of small files under .git/objects;
+    shutil.rmtree unlinks them one by one, which is syscall-bound. Here the
+    files are unlinked concurrently, then the (now empty) directories are
+    removed bottom-up.
+    
+    Args:
+        path: Directory to delete
+        workers: Number of threads issuing unlink calls
+    """
+    files = []
+    dirs = []
+    for root, dirnames, filenames in os.walk(path, topdown=False):
+        files.extend(os.path.join(root, name) for name in filenames)
+        # Symlinks to directories are listed as dirs but must be unlinked
+        files.extend(os.path.join(root, name) for name in dirnames if os.path.islink(os.path.join(root, name)))
+        dirs.append(root)
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(os.unlink, files))
+    
+    # os.walk(topdown=False) yields children before their parents
+    for directory in dirs:
+        os.rmdir(directory)
+
+
+def _count_json_files(directory: Path) -> int:
+    """
+    Count .json files in a directory and its per-repo subdirectories.
+    
+    Uses os.scandir, whose entries carry the file type from the directory
+    listing, so no per-file stat is needed (unlike Path.glob).
+    """
+    count = 0
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                count += _count_json_files(Path(entry.path))
+            elif entry.name.endswith(".json"):
+                count += 1
+    return count
 
 
 class CleanupManager:
     """Manage cleanup of temporary resources."""
     
     def __init__(self, settings: Optional[Settings] = None):
-        self.settings = settings or Settings()
+        self.settings = settings or get_settings()
         self.temp_repos_dir = Path("temp_repos")
         self.embedding_cache_dir = Path("embedding_cache")
-        try:
-            self.qdrant_client = QdrantClient(
-                url=self.settings.qdrant_url,
-                api_key=self.settings.qdrant_api_key
-            )
-        except Exception as e:
-            print(f"⚠️  Qdrant connection failed: {e}")
-            self.qdrant_client = None
+        self.retrieval_cache_dir = Path("retrieval_cache")
+        self._qdrant_client: Optional["QdrantClient"] = None
+        self._qdrant_connected = False
+    
+    @property
+    def qdrant_client(self) -> Optional["QdrantClient"]:
+        """Qdrant client, connected on first use (None if unavailable)."""
+        if not self._qdrant_connected:
+            self._qdrant_connected = True
+            try:
+                self._qdrant_client = _get_qdrant_client(self.settings)
+            except Exception as e:
+                log.warning("⚠️  Qdrant connection failed: %s", e)
+                self._qdrant_client = None
+        return self._qdrant_client
+    
+    @qdrant_client.setter
+    def qdrant_client(self, client: Optional["QdrantClient"]):
+        self._qdrant_client = client
+        self._qdrant_connected = True
     
     def cleanup_temp_repo(self, repo_name: str):
         """Delete temporary cloned repository."""
         repo_path = self.temp_repos_dir / repo_name
         if repo_path.exists():
-            shutil.rmtree(repo_path)
-            print(f"✓ Deleted temp repo: {repo_path}")
+            fast_rmtree(repo_path)
+            log.info("✓ Deleted temp repo: %s", repo_path)
     
     def cleanup_all_temp_repos(self):
         """Delete all temporary repositories."""
         if self.temp_repos_dir.exists():
-            shutil.rmtree(self.temp_repos_dir)
+            fast_rmtree(self.temp_repos_dir)
             self.temp_repos_dir.mkdir(exist_ok=True)
-            print(f"✓ Cleaned all temp repos")
+            log.info("✓ Cleaned all temp repos")
     
     def cleanup_embedding_cache(self, repo_id: str):
         """Delete embedding cache for specific repo."""
@@ -43,52 +156,139 @@ class CleanupManager:
             return
         
         deleted_count = 0
-        for cache_file in self.embedding_cache_dir.glob("*.json"):
-            if repo_id in cache_file.stem:
-                cache_file.unlink()
-                deleted_count += 1
         
-        print(f"✓ Deleted {deleted_count} embedding cache files for {repo_id}")
+        # Cache files are grouped per repo: embedding_cache/{repo_id}/*.json
+        repo_cache_dir = self.embedding_cache_dir / repo_id
+        if repo_cache_dir.is_dir():
+            deleted_count += _count_json_files(repo_cache_dir)
+            shutil.rmtree(repo_cache_dir)
+        
+        # Legacy flat layout: embedding_cache/{repo_id}_*.json
+        with os.scandir(self.embedding_cache_dir) as entries:
+            for entry in entries:
+                if repo_id in entry.name and entry.name.endswith(".json") and entry.is_file():
+                    os.unlink(entry.path)
+                    deleted_count += 1
+        
+        log.info("✓ Deleted %d embedding cache files for %s", deleted_count, repo_id)
     
     def cleanup_all_embedding_cache(self):
         """Delete all embedding cache files."""
         if self.embedding_cache_dir.exists():
-            deleted_count = len(list(self.embedding_cache_dir.glob("*.json")))
+            deleted_count = _count_json_files(self.embedding_cache_dir)
             shutil.rmtree(self.embedding_cache_dir)
             self.embedding_cache_dir.mkdir(exist_ok=True)
-            print(f"✓ Deleted {deleted_count} embedding cache files")
+            log.info("✓ Deleted %d embedding cache files", deleted_count)
+    
+    def cleanup_retrieval_cache(self, repo_id: Optional[str] = None):
+        """Delete cached retrieval bundles for one repo, or for all repos."""
+        cache_dir = self.retrieval_cache_dir / repo_id if repo_id else self.retrieval_cache_dir
+        if cache_dir.is_dir():
+            shutil.rmtree(cache_dir)
+            log.info("✓ Deleted retrieval cache: %s", cache_dir)
+    
+    async def acleanup_temp_repo(self, repo_name: str):
+        """Async variant of cleanup_temp_repo (runs in a worker thread)."""
+        await asyncio.to_thread(self.cleanup_temp_repo, repo_name)
+    
+    async def acleanup_all_temp_repos(self):
+        """Async variant of cleanup_all_temp_repos (runs in a worker thread)."""
+        await asyncio.to_thread(self.cleanup_all_temp_repos)
+    
+    async def acleanup_embedding_cache(self, repo_id: str):
+        """Async variant of cleanup_embedding_cache (runs in a worker thread)."""
+        await asyncio.to_thread(self.cleanup_embedding_cache, repo_id)
+    
+    async def acleanup_all_embedding_cache(self):
+        """Async variant of cleanup_all_embedding_cache (runs in a worker thread)."""
+        await asyncio.to_thread(self.cleanup_all_embedding_cache)
     
     def cleanup_qdrant_collection(self, repo_id: str):
         """Delete vectors for specific repo from Qdrant."""
+        self.cleanup_qdrant_collections([repo_id])
+    
+    def count_repo_vectors(self, repo_id: str) -> Optional[int]:
+        """Count a repo's vectors in Qdrant (None if Qdrant cannot be queried)."""
+        if not self.qdrant_client:
+            return None
+        
+        try:
+            from qdrant_client.models import FieldCondition, Filter, MatchValue
+            
+            return self.qdrant_client.count(
+                collection_name=self.settings.qdrant_collection_name,
+                count_filter=Filter(must=[
+                    FieldCondition(key="repo", match=MatchValue(value=vector_repo_name(repo_id)))
+                ]),
+                exact=True
+            ).count
+        except Exception as e:
+            log.warning("⚠️  Could not count Qdrant vectors for %s: %s", repo_id, e)
+            return None
+    
+    def cleanup_qdrant_collections(self, repo_ids: List[str]):
+        """Delete vectors for several repos from Qdrant in a single request."""
+        if not repo_ids:
+            return
+        
         if not self.qdrant_client:
-            print(f"⚠️  Qdrant not available, skipping vector cleanup for {repo_id}")
+            log.warning("⚠️  Qdrant not available, skipping vector cleanup for %s", ", ".join(repo_ids))
             return
         
         try:
+            from qdrant_client.models import FieldCondition, Filter, FilterSelector, MatchAny
+            
             collection_name = self.settings.qdrant_collection_name
             
-            # Delete by filter
+            # One filter matching any of the repos (OR), one round-trip; points
+            # carry the owner/name 'repo' payload, as in QdrantVectorStore.delete_by_repo
+            repos = [vector_repo_name(repo_id) for repo_id in repo_ids]
+            self.qdrant_client.delete(
+                collection_name=collection_name,
+                points_selector=FilterSelector(
+                    filter=Filter(
+                        should=[FieldCondition(key="repo", match=MatchAny(any=repos))]
+                    )
+                )
+            )
+            log.info("✓ Deleted Qdrant vectors for %s", ", ".join(repo_ids))
+        except Exception as e:
+            log.warning("⚠️  Could not delete Qdrant vectors: %s", e)
+    
+    def cleanup_all_points(self, collection_name: Optional[str] = None):
+        """Delete all points from a collection, keeping its config and indexes."""
+        if not self.qdrant_client:
+            log.warning("⚠️  Qdrant not available, skipping points cleanup")
+            return
+        
+        collection_name = collection_name or self.settings.qdrant_collection_name
+        
+        try:
+            from qdrant_client.models import Filter, FilterSelector
+            
+            # An empty filter matches every point
             self.qdrant_client.delete(
                 collection_name=collection_name,
-                points_selector={
-                    "filter": {
-                        "must": [
-                            {
-                                "key": "repo_id",
-                                "match": {"value": repo_id}
-                            }
-                        ]
-                    }
-                }
+                points_selector=FilterSelector(filter=Filter(must=[]))
             )
-            print(f"✓ Deleted Qdrant vectors for {repo_id}")
+            log.info("✓ Deleted all vectors in Qdrant collection: %s", collection_name)
         except Exception as e:
-            print(f"⚠️  Could not delete Qdrant vectors: {e}")
+            log.warning("⚠️  Could not delete Qdrant vectors: %s", e)
     
-    def cleanup_all_qdrant_vectors(self):
-        """Recreate Qdrant collection (delete all vectors)."""
+    def cleanup_all_qdrant_vectors(self, force: bool = False):
+        """
+        Delete all vectors from the Qdrant collection.
+        
+        By default only the points are deleted, so the collection keeps its
+        vector config and payload indexes. With force=True the collection is
+        dropped and recreated from scratch.
+        """
         if not self.qdrant_client:
-            print(f"⚠️  Qdrant not available, skipping collection cleanup")
+            log.warning("⚠️  Qdrant not available, skipping collection cleanup")
+            return
+        
+        if not force:
+            self.cleanup_all_points()
             return
         
         try:
@@ -105,38 +305,92 @@ class CleanupManager:
                     distance=Distance.COSINE
                 )
             )
-            print(f"✓ Recreated Qdrant collection: {collection_name}")
+            log.info("✓ Recreated Qdrant collection: %s", collection_name)
         except Exception as e:
-            print(f"⚠️  Could not recreate Qdrant collection: {e}")
+            log.warning("⚠️  Could not recreate Qdrant collection: %s", e)
+    
+    def cleanup_repo_data(self, repo_id: str):
+        """
+        Delete a repository's vectors, embedding cache and retrieval cache.
+        
+        Touches nothing belonging to other repos (and not temp_repos), so it
+        can run while a different repository is being ingested.
+        """
+        self.cleanup_qdrant_collection(repo_id)
+        self.cleanup_embedding_cache(repo_id)
+        self.cleanup_retrieval_cache(repo_id)
     
     def cleanup_for_new_repo(self, old_repo_id: str, new_repo_id: str):
         """Cleanup when switching to a different repository."""
-        print(f"\n🧹 Cleaning up for new repo: {new_repo_id}")
+        log.info("🧹 Cleaning up for new repo: %s", new_repo_id)
         
         # Clean old repo's resources
-        self.cleanup_qdrant_collection(old_repo_id)
-        self.cleanup_embedding_cache(old_repo_id)
+        self.cleanup_repo_data(old_repo_id)
         
         # Clean all temp repos
         self.cleanup_all_temp_repos()
         
-        print("✓ Cleanup complete\n")
+        log.info("✓ Cleanup complete")
     
     def cleanup_for_same_repo(self, repo_id: str):
         """Cleanup when using same repo (different PR)."""
-        print(f"\n🧹 Using existing embeddings for: {repo_id}")
+        log.info("🧹 Using existing embeddings for: %s", repo_id)
         
         # Only clean temp repos
         self.cleanup_all_temp_repos()
         
-        print("✓ Temp repos cleaned, embeddings preserved\n")
+        log.info("✓ Temp repos cleaned, embeddings preserved")
     
     def full_cleanup(self):
         """Complete cleanup of all resources."""
-        print("\n🧹 Performing full cleanup...")
+        log.info("🧹 Performing full cleanup...")
         
         self.cleanup_all_temp_repos()
         self.cleanup_all_embedding_cache()
+        self.cleanup_retrieval_cache()
         self.cleanup_all_qdrant_vectors()
         
-        print("✓ Full cleanup complete\n")
+        log.info("✓ Full cleanup complete")
+    
+    def prepare_for(self, repo_id: str, previous: Optional[str] = None) -> str:
+        """
+        Run the cleanup needed before working on a repository.
+        
+        Args:
+            repo_id: Repository about to be reviewed
+            previous: Repository used by the last run (None on first run)
+            
+        Returns:
+            Cleanup performed: "new_repo", "same_repo" or "full"
+        """
+        if previous and previous != repo_id:
+            # Different repo - drop the old repo's vectors and caches
+            self.cleanup_for_new_repo(previous, repo_id)
+            return "new_repo"
+        if previous == repo_id:
+            # Same repo - just clean temp repos
+            self.cleanup_for_same_repo(repo_id)
+            return "same_repo"
+        # First run - clean everything
+        self.full_cleanup()
+        return "full"
+    
+    async def aprepare_for(self, repo_id: str, previous: Optional[str] = None) -> str:
+        """Async variant of prepare_for (runs in a worker thread)."""
+        return await asyncio.to_thread(self.prepare_for, repo_id, previous)
+    
+    async def acleanup_repo_data(self, repo_id: str):
+        """Async variant of cleanup_repo_data (runs in a worker thread)."""
+        await asyncio.to_thread(self.cleanup_repo_data, repo_id)
+    
+    async def acleanup_for_new_repo(self, old_repo_id: str, new_repo_id: str):
+        """Async variant of cleanup_for_new_repo (runs in a worker thread)."""
+        await asyncio.to_thread(self.cleanup_for_new_repo, old_repo_id, new_repo_id)
+    
+    async def acleanup_for_same_repo(self, repo_id: str):
+        """Async variant of cleanup_for_same_repo (runs in a worker thread)."""
+        await asyncio.to_thread(self.cleanup_for_same_repo, repo_id)
+    
+    async def afull_cleanup(self):
+        """Async variant of full_cleanup (runs in a worker thread)."""
+        await asyncio.to_thread(self.full_cleanup)
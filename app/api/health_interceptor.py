@@ -0,0 +1,58 @@
+"""ASGI wrapper that answers liveness probes before they reach FastAPI."""
+
+from typing import Any, Awaitable, Callable, Dict
+
+LIVENESS_PATH = "/health/live"
+
+_LIVE_BODY = b'{"status":"ok"}'
+_LIVE_HEADERS = [
+    (b"content-type", b"application/json"),
+    (b"content-length", str(len(_LIVE_BODY)).encode()),
+]
+_NOT_ALLOWED_BODY = b'{"detail":"Method Not Allowed"}'
+_NOT_ALLOWED_HEADERS = [
+    (b"content-type", b"application/json"),
+    (b"content-length", str(len(_NOT_ALLOWED_BODY)).encode()),
+    (b"allow", b"GET, HEAD"),
+]
+
+Scope = Dict[str, Any]
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class HealthCheckInterceptor:
+    """
+    Short-circuit liveness probes with a prebuilt response.
+
+    Orchestrators poll liveness every few seconds; answering here skips the
+    middleware stack, routing and response serialization entirely. The deep
+    readiness check (Qdrant, Ollama) stays on the FastAPI router at /health.
+    """
+
+    def __init__(self, app: Callable[[Scope, Receive, Send], Awaitable[None]]):
+        """
+        Initialize interceptor.
+
+        Args:
+            app: ASGI application that handles every other request
+        """
+        self.app = app
+
+    def __getattr__(self, name: str) -> Any:
+        # Expose the wrapped app's attributes (routes, state, ...) unchanged
+        return getattr(self.app, name)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] != LIVENESS_PATH:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        if method in ("GET", "HEAD"):
+            status, headers, body = 200, _LIVE_HEADERS, _LIVE_BODY
+        else:
+            status, headers, body = 405, _NOT_ALLOWED_HEADERS, _NOT_ALLOWED_BODY
+
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": b"" if method == "HEAD" else body})
@@ -5,16 +5,24 @@ from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pathlib import Path
+from typing import Dict
 
+from .health_interceptor import HealthCheckInterceptor
 from .routes import router
+from config.logging_config import setup_logging
 
-app = FastAPI(
+setup_logging()
+
+# No custom default_response_class: routes with a response model (or return
+# annotation) are serialized straight to JSON bytes by pydantic-core, which a
+# custom class such as ORJSONResponse would bypass
+fastapi_app = FastAPI(
     title="Repo-Copilot HITL Interface",
     description="Human-in-the-loop code review interface",
     version="1.0.0"
 )
 
-app.add_middleware(
+fastapi_app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
@@ -25,16 +33,20 @@ app.add_middleware(
 templates_dir = Path(__file__).parent / "templates"
 templates = Jinja2Templates(directory=str(templates_dir))
 
-app.include_router(router)
+fastapi_app.include_router(router)
 
 
-@app.get("/", response_class=HTMLResponse)
+@fastapi_app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
     """Render main page."""
     return templates.TemplateResponse("index.html", {"request": request})
 
 
-@app.get("/health")
-async def health_check():
+@fastapi_app.get("/health")
+async def health_check() -> Dict[str, str]:
     """Health check endpoint."""
     return {"status": "healthy"}
+
+
+# ASGI entry point: liveness probes are answered before FastAPI sees them
+app = HealthCheckInterceptor(fastapi_app)
@@ -1,30 +1,528 @@
 """Main orchestration layer for the PR review workflow."""
 
+import asyncio
+import atexit
+import json
+import logging
+import multiprocessing
+import os
+import re
 import time
-import hashlib
-from typing import Optional, Dict, Any, List
-from datetime import datetime
+import struct
+import tempfile
+import threading
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Tuple, Callable, Hashable, NamedTuple
+from datetime import datetime, timezone
 
-from config.settings import Settings
-from app.api.cleanup import CleanupManager
+import xxhash
+
+from config.settings import Settings, get_settings
+from app.api.cleanup import CleanupManager, close_qdrant_clients
 from app.ingest import quick_ingest_repo
-from app.workflow import WorkflowState, create_review_workflow, run_workflow
-from app.pr_review import PRFetcher, DiffParser, PRReviewCoordinator
+from app.workflow import (
+    CHECKPOINT_DURABILITY,
+    HITLAction,
+    HITLDecision,
+    WorkflowState,
+    create_review_workflow,
+    run_workflow
+)
+from app.pr_review import PRFetcher, PRReviewCoordinator, review_units_to_hunks
+
+
+log = logging.getLogger(__name__)
+
+
+class MemoryCache:
+    """Bounded in-memory cache with per-entry TTL and LRU eviction."""
+    
+    def __init__(
+        self,
+        max_size: int = 256,
+        ttl_seconds: float = 60.0,
+        on_evict: Optional[Callable[[Hashable, Any], None]] = None
+    ):
+        """
+        Initialize cache.
+        
+        Args:
+            max_size: Maximum number of entries kept before evicting the least recently used
+            ttl_seconds: Default time-to-live for new entries
+            on_evict: Called with (key, value) when an entry expires or is evicted
+                (not when it is popped), to release resources the value holds
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.on_evict = on_evict
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+    
+    def _evicted(self, key: Hashable, value: Any) -> None:
+        """Hand an expired or evicted entry to on_evict."""
+        if self.on_evict is not None:
+            self.on_evict(key, value)
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return a live entry (refreshing its LRU position) or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self._evicted(key, value)
+            return None
+        self._entries.move_to_end(key)
+        return value
+    
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Store an entry, evicting the least recently used one when full."""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            evicted_key, (_, evicted_value) = self._entries.popitem(last=False)
+            self._evicted(evicted_key, evicted_value)
+    
+    def pop(self, key: Hashable) -> Optional[Any]:
+        """Remove an entry and return its value (None if absent or expired)."""
+        entry = self._entries.pop(key, None)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+    
+    def cleanup(self) -> int:
+        """Drop expired entries and return how many were removed."""
+        now = time.monotonic()
+        expired = [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            _, value = self._entries.pop(key)
+            self._evicted(key, value)
+        return len(expired)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# owner/repo with an optional (scheme +) github.com prefix, .git suffix and trailing slash
+_GH_RE = re.compile(r'^(?:(?:https?://)?github\.com/)?(?P<owner>[^/]+)/(?P<repo>[^/]+?)(?:\.git)?/?$')
+
+
+class ProgressStep(NamedTuple):
+    """One entry of a progress/steps list, serialized by _finalize_progress."""
+    step: str
+    status: str
+    message: str
+    data: Optional[Dict[str, Any]]
+    t_ns: int  # time.monotonic_ns() when the step was recorded
+
+
+class RepoRef(NamedTuple):
+    """A parsed GitHub repository and the identifiers derived from it."""
+    owner: str
+    repo: str
+    clone_url: str
+    full_name: str  # owner/repo, the 'repo' payload of the repo's Qdrant points
+    repo_id: str  # Cache and ingestion-index key for the main branch
+
+
+@lru_cache(maxsize=512)
+def _parse_github_url(url: str) -> RepoRef:
+    """Parse a stripped GitHub URL into a RepoRef; cached since the UI re-sends the same URL."""
+    match = _GH_RE.match(url)
+    if not match:
+        raise ValueError(f"Invalid GitHub URL: {url}")
+    owner, repo = match['owner'], match['repo']
+    return RepoRef(
+        owner=owner,
+        repo=repo,
+        clone_url=f"https://github.com/{owner}/{repo}",
+        full_name=f"{owner}/{repo}",
+        repo_id=f"{owner}_{repo}_main"
+    )
+
+
+def _field(obj: Any, key: str, default: Any = None) -> Any:
+    """Read a field from a state value that may be a dict or a model (or None)."""
+    if isinstance(obj, dict):
+        return obj.get(key, default)
+    return getattr(obj, key, default)
+
+
+def _summarize_review(state: Any) -> Dict[str, Any]:
+    """Build the 'review' block of a workflow response from a final state (dict or model)."""
+    if isinstance(state, dict):
+        get = state.get
+    else:
+        def get(key: str, default: Any = None) -> Any:
+            return getattr(state, key, default)
+    
+    return {
+        'issues_found': len(get('review_issues') or []),
+        'fix_tasks': len(get('fix_tasks') or []),
+        'guardrails_passed': _field(get('guardrail_result'), 'passed', False),
+        'hitl_decision': _field(get('hitl_decision'), 'action', 'unknown'),
+        'published': _field(get('publish_result'), 'published', False),
+        'notification_sent': _field(get('notification_result'), 'slack_sent', False)
+    }
+
+
+# Settings of the orchestrator that owns this worker process (set by the pool initializer)
+_WORKER_SETTINGS: Optional[Settings] = None
+
+
+def _init_workflow_worker(settings: Settings) -> None:
+    """Process-pool initializer: keep the owning orchestrator's settings."""
+    global _WORKER_SETTINGS
+    _WORKER_SETTINGS = settings
+
+
+@lru_cache(maxsize=4)
+def _worker_workflow(github_token: Optional[str]) -> Any:
+    """Return this worker's compiled review workflow for a token, building it on first use."""
+    return create_review_workflow(github_token=github_token, settings=_WORKER_SETTINGS)
+
+
+def _run_workflow_in_process(state: Dict[str, Any], github_token: Optional[str]) -> Dict[str, Any]:
+    """
+    Process-pool entry point for run_workflow.
+    
+    The compiled graph holds LLM clients and a MemorySaver that cannot be
+    pickled, so only the state crosses the process boundary and each
+    worker builds (and caches) its own workflow from the settings passed
+    to _init_workflow_worker.
+    """
+    return _run_workflow_once(WorkflowState(**state), _worker_workflow(github_token))
+
+
+def _run_workflow_once(initial_state: WorkflowState, workflow: Any) -> Dict[str, Any]:
+    """
+    run_workflow for runs that are never resumed, releasing their checkpoint.
+    
+    A run that pauses at HITL here cannot be resumed later, so its
+    checkpoint is dropped whether it completed or not.
+    """
+    try:
+        return run_workflow(initial_state, workflow)
+    finally:
+        workflow.checkpointer.delete_thread(initial_state.run_id)
+
+
+def compute_diff_hash(hunks: List[Dict[str, Any]]) -> str:
+    """
+    Hash a PR's hunks into a short, stable identifier.
+    
+    Feeds each hunk's path, line range and changed lines straight into an
+    XXH3 hasher instead of hashing ``str(hunks)``, so no repr of the whole
+    diff is ever built.
+    
+    Args:
+        hunks: Hunk dicts as produced by Phase 2
+        
+    Returns:
+        16-character hex digest
+    """
+    h = xxhash.xxh3_64()
+    for hunk in hunks:
+        h.update(hunk.get("file_path", "").encode())
+        h.update(struct.pack(
+            "<IIII",
+            hunk.get("old_line_start") or 0,
+            hunk.get("old_line_end") or 0,
+            hunk.get("new_line_start") or 0,
+            hunk.get("new_line_end") or 0
+        ))
+        # One update per side keeps per-call overhead off the per-line path
+        h.update(b"\x01")
+        h.update("\n".join(hunk.get("added_lines", ())).encode())
+        h.update(b"\x02")
+        h.update("\n".join(hunk.get("removed_lines", ())).encode())
+        h.update(b"\0")
+    return h.hexdigest()
 
 
 class WorkflowOrchestrator:
     """Orchestrate the complete PR review workflow."""
     
     def __init__(self, settings: Optional[Settings] = None):
-        self.settings = settings or Settings()
+        self.settings = settings or get_settings()
         self.cleanup_manager = CleanupManager(self.settings)
         self.current_repo_id: Optional[str] = None
         self.ingested_repos: Dict[str, Dict[str, Any]] = {}  # Track ingested repos
-        self.active_workflows: Dict[str, Any] = {}  # Track running workflows
+        self._load_ingested_index()
+        # Workflows paused at HITL, keyed by run_id; abandoned ones expire
+        self.active_workflows = MemoryCache(
+            max_size=self.settings.hitl_max_paused_workflows,
+            ttl_seconds=self.settings.hitl_pause_ttl_seconds,
+            on_evict=self._release_run
+        )
+        self._bg_tasks: set[asyncio.Task] = set()  # Fire-and-forget cleanups still running
+        # One long-lived fetcher per token so GitHub connections are reused
+        self._fetchers: Dict[str, PRFetcher] = {}
+        self._fetchers_lock = threading.Lock()
+        atexit.register(self._close_all_fetchers)
+        # Compiled review graphs per token; runs are isolated by their run_id thread
+        self._workflows: Dict[Optional[str], Any] = {}
+        self._workflows_lock = threading.Lock()
+        # Recently fetched PR sessions keyed by (owner, repo, pr_number, token)
+        self._pr_cache = MemoryCache(
+            max_size=self.settings.pr_cache_size,
+            ttl_seconds=self.settings.pr_cache_ttl_seconds
+        )
+        # One in-flight fetch per PR: concurrent misses wait for it instead of refetching
+        self._pr_fetch_locks: Dict[Tuple[str, str, int, str], threading.Lock] = {}
+        self._pr_fetch_locks_lock = threading.Lock()
+        # Worker processes for Phases 3-6, created on first use and replaced if broken
+        self._workflow_pool: Optional[ProcessPoolExecutor] = None
+        self._workflow_pool_lock = threading.Lock()
+    
+    def _load_ingested_index(self):
+        """Restore ingested repos from disk so restarts reuse the vector store."""
+        try:
+            with open(self.settings.ingested_index_path, 'r') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.ingested_repos = index.get('repos', {})
+        self.current_repo_id = index.get('current_repo_id')
+    
+    def _save_ingested_index(self):
+        """Write the ingested repos index atomically."""
+        path = self.settings.ingested_index_path
+        index_dir = os.path.dirname(os.path.abspath(path))
+        os.makedirs(index_dir, exist_ok=True)
+        # Unique temp file in the same directory, so concurrent writers never share one
+        with tempfile.NamedTemporaryFile('w', dir=index_dir, suffix='.tmp', delete=False) as f:
+            json.dump({'current_repo_id': self.current_repo_id, 'repos': self.ingested_repos}, f, indent=2)
+        os.replace(f.name, path)
     
-    def parse_github_url(self, url: str) -> tuple[str, str]:
+    def _forget_ingested(self, *repo_ids: str):
+        """Drop repos whose vectors were just cleaned up (all repos if none given)."""
+        if repo_ids:
+            for repo_id in repo_ids:
+                self.ingested_repos.pop(repo_id, None)
+        else:
+            self.ingested_repos.clear()
+        self._save_ingested_index()
+    
+    def _spawn_background(self, coro) -> asyncio.Task:
+        """Run a coroutine off the request path, keeping a reference until it finishes."""
+        task = asyncio.create_task(coro)
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._bg_tasks.discard)
+        return task
+    
+    async def _drain_background(self):
+        """Wait for pending background cleanups (they must not race a new clone)."""
+        if self._bg_tasks:
+            results = await asyncio.gather(*self._bg_tasks, return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    log.warning("⚠️  Background cleanup failed: %s", result)
+    
+    async def _trailing_cleanup(self):
+        """Post-review cleanup of temp repos and stale cached PRs."""
+        await self.cleanup_manager.acleanup_all_temp_repos()
+        self._pr_cache.cleanup()
+        self.active_workflows.cleanup()
+    
+    async def aclose(self):
+        """Finish background work and release GitHub/Qdrant connections and workers (call on shutdown)."""
+        await self._drain_background()
+        self._close_all_fetchers()
+        close_qdrant_clients()
+        with self._workflow_pool_lock:
+            pool, self._workflow_pool = self._workflow_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+    
+    def _error_trace(self, message: str) -> Optional[str]:
         """
-        Parse GitHub URL to extract owner and repo.
+        Log the exception being handled and return its traceback for the response.
+        
+        The traceback is always logged server-side; it is only formatted into
+        the response when settings.debug_tracebacks is enabled.
+        
+        Args:
+            message: Log message describing the failed stage
+            
+        Returns:
+            Formatted traceback, or None when tracebacks are not exposed
+        """
+        log.exception("❌ %s", message)
+        return traceback.format_exc() if self.settings.debug_tracebacks else None
+    
+    def _get_fetcher(self, token: str) -> PRFetcher:
+        """Return the shared PRFetcher for a token, creating it on first use."""
+        with self._fetchers_lock:
+            fetcher = self._fetchers.get(token)
+            if fetcher is None:
+                fetcher = PRFetcher(github_token=token, pool_size=self.settings.github_pool_size)
+                self._fetchers[token] = fetcher
+            return fetcher
+    
+    def _get_workflow(self, token: Optional[str]) -> Any:
+        """Return the compiled review workflow for a token, building it on first use."""
+        with self._workflows_lock:
+            workflow = self._workflows.get(token)
+            if workflow is None:
+                workflow = create_review_workflow(github_token=token, settings=self.settings)
+                self._workflows[token] = workflow
+            return workflow
+    
+    def _get_workflow_pool(self) -> ProcessPoolExecutor:
+        """Return the workflow process pool, creating it on first use."""
+        with self._workflow_pool_lock:
+            if self._workflow_pool is None:
+                # spawn: forking a process that already runs logging/event-loop threads is unsafe
+                self._workflow_pool = ProcessPoolExecutor(
+                    max_workers=self.settings.workflow_process_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_workflow_worker,
+                    initargs=(self.settings,)
+                )
+            return self._workflow_pool
+    
+    def _discard_workflow_pool(self, pool: ProcessPoolExecutor):
+        """Drop a broken pool so the next run starts a fresh one."""
+        with self._workflow_pool_lock:
+            if self._workflow_pool is pool:
+                self._workflow_pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+    
+    @staticmethod
+    def _release_run(run_id: str, workflow_info: Dict[str, Any]):
+        """Drop an evicted paused run's checkpoint from the shared graph's MemorySaver."""
+        workflow_info['workflow'].checkpointer.delete_thread(run_id)
+    
+    def _close_all_fetchers(self):
+        """Close every shared fetcher (registered with atexit)."""
+        with self._fetchers_lock:
+            fetchers = list(self._fetchers.values())
+            self._fetchers.clear()
+        for fetcher in fetchers:
+            fetcher.close()
+    
+    def _remote_head_sha(self, repo_owner: str, repo_name: str, token: Optional[str]) -> Optional[str]:
+        """Return the HEAD SHA of main, or None if it cannot be checked."""
+        if not token:
+            return None
+        try:
+            return self._get_fetcher(token).fetch_branch_head_sha(f"{repo_owner}/{repo_name}", "main")
+        except Exception as e:
+            log.warning("⚠️  Could not check HEAD of %s/%s: %s", repo_owner, repo_name, e)
+            return None
+    
+    def _current_ingestion(self, repo_id: str, head_sha: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Return the stored ingestion record if it is still current.
+        
+        The record must match the remote HEAD and the vector store must still
+        hold its chunks (e.g. Qdrant was not wiped since). Checks that cannot
+        be made (no token, Qdrant unreachable) are skipped.
+        
+        Args:
+            repo_id: Repository ID
+            head_sha: Remote HEAD SHA (None when it could not be checked)
+            
+        Returns:
+            Ingestion record, or None if the repo needs (re-)ingesting
+        """
+        record = self.ingested_repos.get(repo_id)
+        if record is None:
+            return None
+        if head_sha and record.get('head_sha') != head_sha:
+            return None
+        vector_count = self.cleanup_manager.count_repo_vectors(repo_id)
+        if vector_count is not None and vector_count < record['chunks_created']:
+            log.info("⚠️  %s has %d of %d vectors, re-ingesting", repo_id, vector_count, record['chunks_created'])
+            return None
+        return record
+    
+    def _record_ingestion(
+        self,
+        repo_id: str,
+        repo_owner: str,
+        repo_name: str,
+        ingestion_result: Dict[str, Any],
+        ingestion_time: float,
+        head_sha: Optional[str]
+    ):
+        """Store a successful ingestion and persist the index."""
+        self.ingested_repos[repo_id] = {
+            'repo_owner': repo_owner,
+            'repo_name': repo_name,
+            'chunks_created': ingestion_result['chunks_created'],
+            'files_processed': ingestion_result.get('files_processed', 0),
+            'head_sha': head_sha,
+            'timestamp': datetime.now().isoformat(),
+            'ingestion_time': ingestion_time
+        }
+        self._save_ingested_index()
+        # Bundles keyed by the previous index SHA can no longer be hit
+        self.cleanup_manager.cleanup_retrieval_cache(repo_id)
+    
+    def _index_sha(self, repo_id: str) -> Optional[str]:
+        """Return the main HEAD the repo's vectors were built from (None if unknown)."""
+        return (self.ingested_repos.get(repo_id) or {}).get('head_sha')
+    
+    @staticmethod
+    def _step(
+        name: str,
+        status: str,
+        message: str,
+        data: Optional[Dict[str, Any]] = None
+    ) -> ProgressStep:
+        """Build a progress entry stamped with a raw monotonic nanosecond timestamp."""
+        return ProgressStep(name, status, message, data, time.monotonic_ns())
+    
+    @staticmethod
+    def _mark(progress: List[ProgressStep], status: str, message: str):
+        """Update the status and message of the most recent progress entry."""
+        progress[-1] = progress[-1]._replace(status=status, message=message)
+    
+    @classmethod
+    def _closing_steps(cls, final_state: WorkflowState) -> List[ProgressStep]:
+        """Build the publish/notify/persist progress entries for a finished run."""
+        steps = [
+            cls._step("publish", "success", "✓ Published to GitHub") if final_state.posted_comment_url else None,
+            cls._step("notify", "success", "✓ Notifications sent") if final_state.notification_sent else None,
+            cls._step("persist", "success", "✓ Workflow state persisted"),
+        ]
+        return [step for step in steps if step is not None]
+    
+    @staticmethod
+    def _finalize_progress(progress: List[ProgressStep]) -> List[Dict[str, Any]]:
+        """
+        Serialize progress entries with an ISO-8601 'timestamp' and 'step_ms' offset.
+        
+        The wall clock is read once and monotonic stamps are projected onto it,
+        so dicts are built and formatted only here, at the API boundary.
+        """
+        wall_ns = time.time_ns()
+        now_ns = time.monotonic_ns()
+        start_ns = progress[0].t_ns if progress else 0
+        return [
+            {
+                'step': entry.step,
+                'status': entry.status,
+                'message': entry.message,
+                'data': entry.data,
+                'timestamp': datetime.fromtimestamp((wall_ns - (now_ns - entry.t_ns)) / 1e9, tz=timezone.utc).isoformat(),
+                'step_ms': round((entry.t_ns - start_ns) / 1e6, 3)
+            }
+            for entry in progress
+        ]
+    
+    @staticmethod
+    def parse_github_url(url: str) -> RepoRef:
+        """
+        Parse GitHub URL into a RepoRef (owner, repo, clone_url, repo_id).
         
         Supports:
         - https://github.com/owner/repo
@@ -32,31 +530,179 @@ class WorkflowOrchestrator:
         - github.com/owner/repo
         - owner/repo
         """
-        url = url.strip()
+        # Strip before the cache lookup so padded copies of a URL share one entry
+        return _parse_github_url(url.strip())
+    
+    def _prepare_pr_session(self, repo_owner: str, repo_name: str, pr_number: int, token: str):
+        """
+        Fetch and parse a PR, reusing a recent fetch of the same PR.
         
-        # Remove .git suffix
-        if url.endswith('.git'):
-            url = url[:-4]
+        Args:
+            repo_owner: Repository owner
+            repo_name: Repository name
+            pr_number: PR number
+            token: GitHub token
+            
+        Returns:
+            PRReviewSession for the PR
+        """
+        # Keyed by token too, so a PR fetched with one token is never served to another
+        cache_key = (repo_owner, repo_name, pr_number, token)
+        session = self._pr_cache.get(cache_key)
+        if session is not None:
+            log.info("⚡ Using cached PR #%d for %s/%s", pr_number, repo_owner, repo_name)
+            return session
         
-        # Remove protocol
-        url = url.replace('https://', '').replace('http://', '')
+        with self._pr_fetch_locks_lock:
+            fetch_lock = self._pr_fetch_locks.setdefault(cache_key, threading.Lock())
         
-        # Remove github.com prefix
-        url = url.replace('github.com/', '')
+        try:
+            with fetch_lock:
+                # Another request may have fetched the PR while this one waited
+                session = self._pr_cache.get(cache_key)
+                if session is not None:
+                    return session
+                
+                # The coordinator borrows the shared fetcher, so it is not closed here
+                coordinator = PRReviewCoordinator(fetcher=self._get_fetcher(token))
+                session = coordinator.prepare_pr_review(
+                    repo_full_name=f"{repo_owner}/{repo_name}",
+                    pr_number=pr_number,
+                    strategy="per_hunk"
+                )
+                
+                self._pr_cache.set(cache_key, session)
+                return session
+        finally:
+            with self._pr_fetch_locks_lock:
+                if self._pr_fetch_locks.get(cache_key) is fetch_lock and not fetch_lock.locked():
+                    del self._pr_fetch_locks[cache_key]
+    
+    def _rebuild_vectors(self, ref: RepoRef) -> Dict[str, Any]:
+        """
+        Replace a repo's vectors with a fresh ingestion of main (blocking).
+        
+        Point IDs are derived from path::index, so upserting over the old
+        points would keep the chunks of deleted or shrunk files; the repo's
+        points are deleted first.
+        """
+        self.cleanup_manager.cleanup_qdrant_collection(ref.repo_id)
+        return quick_ingest_repo(
+            repo_url=ref.clone_url,
+            branch="main",
+            settings_obj=self.settings
+        )
+    
+    def _ingest_repo(
+        self,
+        ref: RepoRef,
+        token: Optional[str] = None,
+        force_reingest: bool = False
+    ) -> Tuple[Dict[str, Any], float]:
+        """Phase 1: clone and embed the repository, unless main is unchanged (blocking)."""
+        ingestion_start = time.time()
+        repo_id = ref.repo_id
+        head_sha = self._remote_head_sha(ref.owner, ref.repo, token)
         
-        # Split to get owner/repo
-        parts = url.split('/')
-        if len(parts) >= 2:
-            return parts[-2], parts[-1]
+        record = None if force_reingest else self._current_ingestion(repo_id, head_sha)
+        if record is not None:
+            log.info("⚡ %s unchanged since last ingestion, reusing embeddings", repo_id)
+            return {
+                'chunks_created': record['chunks_created'],
+                'files_processed': record.get('files_processed', 0),
+                'cached': True
+            }, time.time() - ingestion_start
         
-        raise ValueError(f"Invalid GitHub URL: {url}")
+        ingestion_result = self._rebuild_vectors(ref)
+        ingestion_time = time.time() - ingestion_start
+        self._record_ingestion(repo_id, ref.owner, ref.repo, ingestion_result, ingestion_time, head_sha)
+        return ingestion_result, ingestion_time
+    
+    def _fetch_pr_hunks(
+        self,
+        repo_owner: str,
+        repo_name: str,
+        pr_number: int,
+        token: str
+    ) -> Tuple[Dict[str, Any], List[Dict[str, Any]], float]:
+        """Phase 2: fetch the PR and parse it into hunks (blocking)."""
+        fetch_start = time.time()
+        session = self._prepare_pr_session(repo_owner, repo_name, pr_number, token)
+        
+        pr_data_obj = session.pr_data
+        pr_data = {
+            'title': pr_data_obj.title,
+            'author': pr_data_obj.author,
+            'sha': pr_data_obj.head_sha,
+            'files_count': pr_data_obj.changed_files_count,
+            'additions': pr_data_obj.additions,
+            'deletions': pr_data_obj.deletions
+        }
+        
+        return pr_data, review_units_to_hunks(session.review_units), time.time() - fetch_start
+    
+    async def _execute_workflow(self, initial_state: WorkflowState, token: str) -> Dict[str, Any]:
+        """
+        Run Phases 3-6 off the event loop.
+        
+        Uses the workflow process pool so concurrent reviews run on separate
+        cores, or a worker thread when process workers are disabled. A run
+        whose worker dies is not retried: it may already have published.
+        
+        Args:
+            initial_state: Initial workflow state
+            token: GitHub token
+            
+        Returns:
+            Final state dictionary
+        """
+        if self.settings.workflow_process_workers <= 0:
+            workflow = self._get_workflow(token)
+            return await asyncio.to_thread(_run_workflow_once, initial_state, workflow)
+        
+        loop = asyncio.get_running_loop()
+        state = initial_state.model_dump()
+        pool = self._get_workflow_pool()
+        try:
+            future = loop.run_in_executor(pool, _run_workflow_in_process, state, token)
+        except BrokenProcessPool:
+            # Broken by an earlier run; nothing was submitted, so use a fresh pool
+            self._discard_workflow_pool(pool)
+            pool = self._get_workflow_pool()
+            future = loop.run_in_executor(pool, _run_workflow_in_process, state, token)
+        
+        try:
+            return await future
+        except BrokenProcessPool as e:
+            self._discard_workflow_pool(pool)
+            raise RuntimeError(
+                f"Workflow worker died during run {initial_state.run_id}; "
+                "not retried because it may already have published"
+            ) from e
+    
+    def _evaluate(self, final_state: Any, workflow_time: float) -> Dict[str, Any]:
+        """
+        Phase 7 evaluation of a live review (runs in a worker thread).
+        
+        app.evaluation.Evaluator scores reviews against synthetic PRs with
+        known ground truth, which real PRs lack, so it is not constructed
+        here; only latency can be measured for a live review.
+        """
+        return {
+            'groundedness': 'N/A - Requires manual evaluation',
+            'precision': 'N/A - Requires manual evaluation',
+            'usefulness': 'N/A - Requires manual evaluation',
+            'consistency': 'N/A - Requires manual evaluation',
+            'latency': workflow_time
+        }
     
     async def run_full_workflow(
         self,
         repo_url: str,
         pr_number: int,
         github_token: Optional[str] = None,
-        run_evaluation: bool = False
+        run_evaluation: bool = False,
+        force_reingest: bool = False
     ) -> Dict[str, Any]:
         """
         Run the complete PR review workflow.
@@ -66,6 +712,7 @@ class WorkflowOrchestrator:
             pr_number: PR number to review
             github_token: GitHub token (optional, uses settings if not provided)
             run_evaluation: Whether to run evaluation metrics
+            force_reingest: Re-ingest even if main is unchanged since the last ingestion
             
         Returns:
             Dict with workflow results
@@ -74,7 +721,7 @@ class WorkflowOrchestrator:
         
         # Parse repo URL
         try:
-            repo_owner, repo_name = self.parse_github_url(repo_url)
+            ref = self.parse_github_url(repo_url)
         except ValueError as e:
             return {
                 'success': False,
@@ -82,7 +729,7 @@ class WorkflowOrchestrator:
                 'stage': 'url_parsing'
             }
         
-        repo_id = f"{repo_owner}_{repo_name}_main"
+        repo_owner, repo_name, repo_id = ref.owner, ref.repo, ref.repo_id
         
         # Use provided token or fallback to settings
         token = github_token or self.settings.github_token
@@ -93,126 +740,93 @@ class WorkflowOrchestrator:
                 'stage': 'authentication'
             }
         
-        print(f"\n{'=' * 80}")
-        print("PR REVIEW WORKFLOW")
-        print(f"{'=' * 80}")
-        print(f"Repository: {repo_owner}/{repo_name}")
-        print(f"PR Number: {pr_number}")
-        print(f"{'=' * 80}\n")
+        log.info("PR REVIEW WORKFLOW: %s/%s PR #%d", repo_owner, repo_name, pr_number)
         
-        # Handle cleanup based on repo change
-        if self.current_repo_id and self.current_repo_id != repo_id:
-            # Different repo - full cleanup
-            self.cleanup_manager.cleanup_for_new_repo(self.current_repo_id, repo_id)
-        elif self.current_repo_id == repo_id:
-            # Same repo - just clean temp repos
-            self.cleanup_manager.cleanup_for_same_repo(repo_id)
-        else:
-            # First run - clean everything
-            self.cleanup_manager.full_cleanup()
+        # Handle cleanup based on repo change (gates ingestion, so it stays inline)
+        await self._drain_background()
+        previous_repo_id = self.current_repo_id
+        cleanup = await self.cleanup_manager.aprepare_for(repo_id, previous=previous_repo_id)
+        if cleanup == "new_repo":
+            self._forget_ingested(previous_repo_id)
+        elif cleanup == "full":
+            self._forget_ingested()
         
         self.current_repo_id = repo_id
+        self._save_ingested_index()
         
         try:
-            # Phase 1: Ingestion
-            print("\n📥 PHASE 1: INGESTION")
-            print("-" * 80)
+            # Phase 1 + 2: Ingestion and PR fetch are independent network-bound
+            # steps, so run them concurrently in worker threads
+            log.info("📥 PHASE 1: INGESTION  |  📋 PHASE 2: PR FETCH & PARSE")
             
-            ingestion_start = time.time()
-            ingestion_result = quick_ingest_repo(
-                repo_url=f"https://github.com/{repo_owner}/{repo_name}",
-                branch="main",
-                settings_obj=self.settings
+            phases_start = time.time()
+            ingestion_outcome, pr_outcome = await asyncio.gather(
+                asyncio.to_thread(self._ingest_repo, ref, token, force_reingest),
+                asyncio.to_thread(self._fetch_pr_hunks, repo_owner, repo_name, pr_number, token),
+                return_exceptions=True
             )
-            ingestion_time = time.time() - ingestion_start
-            
-            print(f"✓ Ingestion complete: {ingestion_result['chunks_created']} chunks in {ingestion_time:.2f}s")
+            phases_time = time.time() - phases_start
             
-            # Phase 2: PR Fetch & Parse
-            print("\n📋 PHASE 2: PR FETCH & PARSE")
-            print("-" * 80)
+            # Report a failure against the phase that raised it
+            for stage, outcome in (('ingestion', ingestion_outcome), ('pr_fetch', pr_outcome)):
+                if isinstance(outcome, Exception):
+                    log.error("❌ %s failed: %s", stage, outcome)
+                    return {
+                        'success': False,
+                        'error': str(outcome),
+                        'stage': stage
+                    }
             
-            fetcher = PRFetcher(github_token=token)
-            pr_data = fetcher.fetch_pr(repo_owner, repo_name, pr_number)
+            ingestion_result, ingestion_time = ingestion_outcome
+            pr_data, hunks, pr_fetch_time = pr_outcome
             
-            if not pr_data or 'error' in pr_data:
-                return {
-                    'success': False,
-                    'error': pr_data.get('error', 'Failed to fetch PR'),
-                    'stage': 'pr_fetch'
-                }
-            
-            print(f"✓ Fetched PR #{pr_number}: {pr_data['title']}")
-            print(f"  Files changed: {pr_data['files_count']}")
-            print(f"  +{pr_data['additions']} -{pr_data['deletions']}")
-            
-            # Parse diff
-            parser = DiffParser()
-            review_units = parser.parse_diff(pr_data)
-            hunks = [unit.to_hunk() for unit in review_units]
-            
-            print(f"✓ Parsed into {len(hunks)} hunks")
+            log.info("✓ Ingestion complete: %d chunks in %.2fs", ingestion_result['chunks_created'], ingestion_time)
+            log.info(
+                "✓ Fetched PR #%d: %s (%d files, +%d -%d)",
+                pr_number, pr_data['title'], pr_data['files_count'], pr_data['additions'], pr_data['deletions']
+            )
+            log.info("✓ Parsed into %d hunks", len(hunks))
+            log.info("✓ Phases 1-2 complete in %.2fs", phases_time)
             
             # Phase 3-6: Workflow Execution
-            print("\n🔄 PHASE 3-6: WORKFLOW EXECUTION")
-            print("-" * 80)
+            log.info("🔄 PHASE 3-6: WORKFLOW EXECUTION")
             
-            run_id = f"{repo_id}_pr{pr_number}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            diff_hash = hashlib.md5(str(hunks).encode()).hexdigest()[:12]
+            # Nanosecond suffix keeps ids unique even for same-second submits
+            run_id = f"{repo_id}_pr{pr_number}_{time.time_ns()}"
+            diff_hash = compute_diff_hash(hunks)
             
             initial_state = WorkflowState(
                 run_id=run_id,
                 repo_owner=repo_owner,
                 repo_name=repo_name,
                 repo_id=repo_id,
+                vector_repo=ref.full_name,
+                index_sha=self._index_sha(repo_id),
                 pr_number=pr_number,
                 pr_sha=pr_data['sha'],
                 diff_hash=diff_hash,
                 hunks=hunks
             )
             
-            workflow = create_review_workflow(
-                github_token=token,
-                settings=self.settings
-            )
-            
             workflow_start = time.time()
-            final_state = run_workflow(initial_state, workflow)
+            final_state = await self._execute_workflow(initial_state, token)
             workflow_time = time.time() - workflow_start
             
-            print(f"✓ Workflow complete in {workflow_time:.2f}s")
+            log.info("✓ Workflow complete in %.2fs", workflow_time)
             
-            # Convert to dict if needed
-            if not isinstance(final_state, dict):
-                final_state = final_state.__dict__ if hasattr(final_state, '__dict__') else {}
+            # Cleanup temp repos and stale cached PRs after responding; started
+            # first so the disk-bound cleanup overlaps with evaluation
+            self._spawn_background(self._trailing_cleanup())
             
             # Phase 7: Evaluation (optional)
             evaluation_results = None
             if run_evaluation:
-                print("\n📊 PHASE 7: EVALUATION")
-                print("-" * 80)
-                
-                # Evaluator would be used here for actual evaluation
-                # For now, return placeholder results
-                # evaluator = Evaluator(settings=self.settings)
-                evaluation_results = {
-                    'groundedness': 'N/A - Requires manual evaluation',
-                    'precision': 'N/A - Requires manual evaluation',
-                    'usefulness': 'N/A - Requires manual evaluation',
-                    'consistency': 'N/A - Requires manual evaluation',
-                    'latency': workflow_time
-                }
-            
-            # Cleanup temp repos
-            self.cleanup_manager.cleanup_all_temp_repos()
+                log.info("📊 PHASE 7: EVALUATION")
+                evaluation_results = await asyncio.to_thread(self._evaluate, final_state, workflow_time)
             
             total_time = time.time() - start_time
             
-            print(f"\n{'=' * 80}")
-            print("✅ WORKFLOW COMPLETE")
-            print(f"{'=' * 80}")
-            print(f"Total time: {total_time:.2f}s")
-            print(f"{'=' * 80}\n")
+            log.info("✅ WORKFLOW COMPLETE in %.2fs", total_time)
             
             return {
                 'success': True,
@@ -223,6 +837,8 @@ class WorkflowOrchestrator:
                 'run_id': run_id,
                 'timings': {
                     'ingestion': ingestion_time,
+                    'pr_fetch': pr_fetch_time,
+                    'ingestion_and_pr_fetch': phases_time,
                     'workflow': workflow_time,
                     'total': total_time
                 },
@@ -238,103 +854,83 @@ class WorkflowOrchestrator:
                     'deletions': pr_data['deletions'],
                     'hunks': len(hunks)
                 },
-                'review': {
-                    'issues_found': len(final_state.get('review_issues', [])),
-                    'fix_tasks': len(final_state.get('fix_tasks', [])),
-                    'guardrails_passed': final_state.get('guardrail_result', {}).get('passed', False) if isinstance(final_state.get('guardrail_result'), dict) else getattr(final_state.get('guardrail_result'), 'passed', False),
-                    'hitl_decision': final_state.get('hitl_decision', {}).get('action', 'unknown') if isinstance(final_state.get('hitl_decision'), dict) else getattr(final_state.get('hitl_decision'), 'action', 'unknown'),
-                    'published': final_state.get('publish_result', {}).get('published', False) if isinstance(final_state.get('publish_result'), dict) else getattr(final_state.get('publish_result'), 'published', False),
-                    'notification_sent': final_state.get('notification_result', {}).get('slack_sent', False) if isinstance(final_state.get('notification_result'), dict) else getattr(final_state.get('notification_result'), 'slack_sent', False)
-                },
+                'review': _summarize_review(final_state),
                 'evaluation': evaluation_results,
-                'workflow_state': final_state
+                'workflow_state': final_state if isinstance(final_state, dict) else vars(final_state)
             }
             
         except Exception as e:
-            import traceback
-            error_trace = traceback.format_exc()
-            
-            print(f"\n❌ ERROR: {e}")
-            print(error_trace)
+            error_trace = self._error_trace("Review workflow failed")
             
             return {
                 'success': False,
                 'error': str(e),
                 'error_trace': error_trace,
                 'stage': 'workflow_execution'
-            }    
+            }
+    
     async def run_ingestion_only(
         self,
-        repo_url: str
+        repo_url: str,
+        github_token: Optional[str] = None,
+        force_reingest: bool = False
     ) -> Dict[str, Any]:
         """
         Step 1: Ingest repository only.
         
-        Returns detailed progress and handles repo switching logic.
+        Returns detailed progress and handles repo switching logic. A repo
+        already ingested at the current HEAD of main (checked when a token
+        is available) is not ingested again unless force_reingest is set.
         """
-        import time
-        
         start_time = time.time()
         progress = []
         
         # Step 1: Parse URL
-        progress.append({
-            'step': 'parse_url',
-            'status': 'in_progress',
-            'message': 'Parsing GitHub URL...',
-            'timestamp': datetime.now().isoformat()
-        })
+        progress.append(self._step('parse_url', 'in_progress', 'Parsing GitHub URL...'))
         
         try:
-            repo_owner, repo_name = self.parse_github_url(repo_url)
-            repo_id = f"{repo_owner}_{repo_name}_main"
-            
-            progress.append({
-                'step': 'parse_url',
-                'status': 'success',
-                'message': f'Repository: {repo_owner}/{repo_name}',
-                'data': {
+            ref = self.parse_github_url(repo_url)
+            repo_owner, repo_name, repo_id = ref.owner, ref.repo, ref.repo_id
+            
+            progress.append(self._step(
+                'parse_url',
+                'success',
+                f'Repository: {repo_owner}/{repo_name}',
+                data={
                     'repo_owner': repo_owner,
                     'repo_name': repo_name,
                     'repo_id': repo_id
-                },
-                'timestamp': datetime.now().isoformat()
-            })
+                }
+            ))
             
         except ValueError as e:
-            progress.append({
-                'step': 'parse_url',
-                'status': 'error',
-                'message': str(e),
-                'timestamp': datetime.now().isoformat()
-            })
+            progress.append(self._step('parse_url', 'error', str(e)))
             return {
                 'success': False,
                 'error': str(e),
-                'progress': progress
+                'progress': self._finalize_progress(progress)
             }
         
         # Step 2: Check if repo is already ingested
-        progress.append({
-            'step': 'check_repo',
-            'status': 'in_progress',
-            'message': 'Checking repository status...',
-            'timestamp': datetime.now().isoformat()
-        })
-        
-        if repo_id in self.ingested_repos:
-            # Repo already ingested
-            progress.append({
-                'step': 'check_repo',
-                'status': 'success',
-                'message': f'Repository already ingested with {self.ingested_repos[repo_id]["chunks_created"]} chunks',
-                'data': {
+        progress.append(self._step('check_repo', 'in_progress', 'Checking repository status...'))
+        
+        head_sha = await asyncio.to_thread(
+            self._remote_head_sha, repo_owner, repo_name, github_token or self.settings.github_token
+        )
+        record = None if force_reingest else await asyncio.to_thread(self._current_ingestion, repo_id, head_sha)
+        
+        if record is not None:
+            # Repo already ingested at this HEAD
+            progress.append(self._step(
+                'check_repo',
+                'success',
+                f'Repository already ingested with {record["chunks_created"]} chunks',
+                data={
                     'already_ingested': True,
-                    'chunks_created': self.ingested_repos[repo_id]['chunks_created'],
-                    'ingested_at': self.ingested_repos[repo_id]['timestamp']
-                },
-                'timestamp': datetime.now().isoformat()
-            })
+                    'chunks_created': record['chunks_created'],
+                    'ingested_at': record['timestamp']
+                }
+            ))
             
             return {
                 'success': True,
@@ -343,106 +939,82 @@ class WorkflowOrchestrator:
                 'repo_name': repo_name,
                 'repo_id': repo_id,
                 'already_ingested': True,
-                'chunks_created': self.ingested_repos[repo_id]['chunks_created'],
-                'progress': progress,
+                'chunks_created': record['chunks_created'],
+                'progress': self._finalize_progress(progress),
                 'duration': time.time() - start_time
             }
         
-        progress.append({
-            'step': 'check_repo',
-            'status': 'success',
-            'message': 'New repository detected',
-            'data': {'already_ingested': False},
-            'timestamp': datetime.now().isoformat()
-        })
+        progress.append(self._step(
+            'check_repo',
+            'success',
+            'New repository detected',
+            data={'already_ingested': False}
+        ))
         
         # Step 3: Cleanup old repos if switching
+        await self._drain_background()
+        previous_repo_id = None
         if self.current_repo_id and self.current_repo_id != repo_id:
-            progress.append({
-                'step': 'cleanup',
-                'status': 'in_progress',
-                'message': f'Cleaning up previous repository: {self.current_repo_id}',
-                'timestamp': datetime.now().isoformat()
-            })
+            previous_repo_id = self.current_repo_id
+            progress.append(self._step(
+                'cleanup',
+                'in_progress',
+                f'Cleaning up previous repository: {previous_repo_id}'
+            ))
             
+            # Only the temp clones must go before downloading; the previous repo's
+            # vectors and caches are dropped while the new one is ingested
             try:
-                self.cleanup_manager.cleanup_for_new_repo(self.current_repo_id, repo_id)
-                
-                progress.append({
-                    'step': 'cleanup',
-                    'status': 'success',
-                    'message': 'Previous repository cleaned up',
-                    'timestamp': datetime.now().isoformat()
-                })
+                await self.cleanup_manager.acleanup_all_temp_repos()
             except Exception as e:
-                progress.append({
-                    'step': 'cleanup',
-                    'status': 'warning',
-                    'message': f'Cleanup warning: {str(e)}',
-                    'timestamp': datetime.now().isoformat()
-                })
+                progress.append(self._step('cleanup', 'warning', f'Cleanup warning: {str(e)}'))
         elif not self.current_repo_id:
-            progress.append({
-                'step': 'cleanup',
-                'status': 'in_progress',
-                'message': 'First run - performing full cleanup',
-                'timestamp': datetime.now().isoformat()
-            })
+            progress.append(self._step('cleanup', 'in_progress', 'First run - performing full cleanup'))
             
             try:
-                self.cleanup_manager.full_cleanup()
+                await self.cleanup_manager.afull_cleanup()
+                self._forget_ingested()
                 
-                progress.append({
-                    'step': 'cleanup',
-                    'status': 'success',
-                    'message': 'Full cleanup completed',
-                    'timestamp': datetime.now().isoformat()
-                })
+                progress.append(self._step('cleanup', 'success', 'Full cleanup completed'))
             except Exception as e:
-                progress.append({
-                    'step': 'cleanup',
-                    'status': 'warning',
-                    'message': f'Cleanup warning: {str(e)}',
-                    'timestamp': datetime.now().isoformat()
-                })
+                progress.append(self._step('cleanup', 'warning', f'Cleanup warning: {str(e)}'))
         
         # Step 4: Clone and ingest repository
-        progress.append({
-            'step': 'ingestion',
-            'status': 'in_progress',
-            'message': 'Cloning and embedding repository...',
-            'timestamp': datetime.now().isoformat()
-        })
+        progress.append(self._step('ingestion', 'in_progress', 'Cloning and embedding repository...'))
         
         try:
             ingestion_start = time.time()
-            ingestion_result = quick_ingest_repo(
-                repo_url=f"https://github.com/{repo_owner}/{repo_name}",
-                branch="main",
-                settings_obj=self.settings
+            ingestion_result, cleanup_error = await asyncio.gather(
+                asyncio.to_thread(self._rebuild_vectors, ref),
+                self.cleanup_manager.acleanup_repo_data(previous_repo_id) if previous_repo_id else asyncio.sleep(0),
+                return_exceptions=True
             )
             ingestion_time = time.time() - ingestion_start
             
+            if previous_repo_id:
+                if isinstance(cleanup_error, Exception):
+                    progress.append(self._step('cleanup', 'warning', f'Cleanup warning: {str(cleanup_error)}'))
+                else:
+                    self._forget_ingested(previous_repo_id)
+                    progress.append(self._step('cleanup', 'success', 'Previous repository cleaned up'))
+            if isinstance(ingestion_result, Exception):
+                raise ingestion_result
+            
             # Store ingestion info
-            self.ingested_repos[repo_id] = {
-                'repo_owner': repo_owner,
-                'repo_name': repo_name,
-                'chunks_created': ingestion_result['chunks_created'],
-                'timestamp': datetime.now().isoformat(),
-                'ingestion_time': ingestion_time
-            }
             self.current_repo_id = repo_id
+            await asyncio.to_thread(
+                self._record_ingestion, repo_id, repo_owner, repo_name, ingestion_result, ingestion_time, head_sha
+            )
             
-            progress.append({
-                'step': 'ingestion',
-                'status': 'success',
-                'message': f'Repository ingested: {ingestion_result["chunks_created"]} chunks in {ingestion_time:.2f}s',
-                'data': {
+            progress.append(self._step(
+                'ingestion',
+                'success',
+                f'Repository ingested: {ingestion_result["chunks_created"]} chunks in {ingestion_time:.2f}s',
+                data={
                     'chunks_created': ingestion_result['chunks_created'],
                     'ingestion_time': ingestion_time
-                },
-                'timestamp': datetime.now().isoformat()
-            })
+                }
+            ))
             
             return {
                 'success': True,
@@ -453,26 +1025,20 @@ class WorkflowOrchestrator:
                 'already_ingested': False,
                 'chunks_created': ingestion_result['chunks_created'],
                 'ingestion_time': ingestion_time,
-                'progress': progress,
+                'progress': self._finalize_progress(progress),
                 'duration': time.time() - start_time
             }
             
         except Exception as e:
-            import traceback
-            error_trace = traceback.format_exc()
+            error_trace = self._error_trace("Ingestion failed")
             
-            progress.append({
-                'step': 'ingestion',
-                'status': 'error',
-                'message': f'Ingestion failed: {str(e)}',
-                'timestamp': datetime.now().isoformat()
-            })
+            progress.append(self._step('ingestion', 'error', f'Ingestion failed: {str(e)}'))
             
             return {
                 'success': False,
                 'error': str(e),
                 'traceback': error_trace,
-                'progress': progress,
+                'progress': self._finalize_progress(progress),
                 'duration': time.time() - start_time
             }
     
@@ -487,38 +1053,29 @@ class WorkflowOrchestrator:
         
         try:
             # Step 1: Parse URL
-            steps.append({"step": "parse_url", "status": "in_progress", "message": "Parsing repository URL"})
+            steps.append(self._step("parse_url", "in_progress", "Parsing repository URL"))
             try:
-                owner, name = self.parse_github_url(repo_url)
+                ref = self.parse_github_url(repo_url)
+                owner, name = ref.owner, ref.repo
                 repo_id = f"{owner}/{name}"
-                steps[-1]["status"] = "success"
-                steps[-1]["message"] = f"✓ Parsed: {repo_id}"
+                self._mark(steps, "success", f"✓ Parsed: {repo_id}")
             except Exception as e:
-                steps[-1]["status"] = "error"
-                steps[-1]["message"] = f"✗ Failed to parse URL: {str(e)}"
-                return {"success": False, "steps": steps, "error": str(e)}
+                self._mark(steps, "error", f"✗ Failed to parse URL: {str(e)}")
+                return {"success": False, "steps": self._finalize_progress(steps), "error": str(e)}
             
             # Step 2: Validate token
-            steps.append({"step": "validate_token", "status": "in_progress", "message": "Validating GitHub token"})
+            steps.append(self._step("validate_token", "in_progress", "Validating GitHub token"))
             token = github_token or self.settings.github_token
             if not token:
-                steps[-1]["status"] = "error"
-                steps[-1]["message"] = "✗ GitHub token required"
-                return {"success": False, "steps": steps, "error": "GitHub token required"}
-            steps[-1]["status"] = "success"
-            steps[-1]["message"] = "✓ Token validated"
+                self._mark(steps, "error", "✗ GitHub token required")
+                return {"success": False, "steps": self._finalize_progress(steps), "error": "GitHub token required"}
+            self._mark(steps, "success", "✓ Token validated")
             
             # Step 3: Fetch PR and build review units
-            steps.append({"step": "fetch_pr", "status": "in_progress", "message": f"Fetching PR #{pr_number}"})
+            steps.append(self._step("fetch_pr", "in_progress", f"Fetching PR #{pr_number}"))
             try:
-                coordinator = PRReviewCoordinator(github_token=token)
-                
-                # Use prepare_pr_review which returns a PRReviewSession
-                session = coordinator.prepare_pr_review(
-                    repo_full_name=f"{owner}/{name}",
-                    pr_number=pr_number,
-                    strategy="per_hunk"
-                )
+                # PRReviewSession, reused if this PR was fetched moments ago
+                session = await asyncio.to_thread(self._prepare_pr_session, owner, name, pr_number, token)
                 
                 # Extract data from session
                 pr_data_obj = session.pr_data
@@ -538,35 +1095,16 @@ class WorkflowOrchestrator:
                 }
                 
                 # Convert review units to dict format
-                review_units = []
-                for unit in session.review_units:
-                    review_units.append({
-                        "hunk_id": f"{unit.context.file_path}:{unit.context.new_line_start or 0}",
-                        "file_path": unit.context.file_path,
-                        "old_line_start": unit.context.old_line_start or 0,
-                        "old_line_end": unit.context.old_line_end or 0,
-                        "new_line_start": unit.context.new_line_start or 0,
-                        "new_line_end": unit.context.new_line_end or 0,
-                        "added_lines": unit.context.added_lines,
-                        "removed_lines": unit.context.removed_lines,
-                        "context_lines": unit.context.context_lines
-                    })
+                review_units = review_units_to_hunks(session.review_units)
                 
-                coordinator.close()
-                
-                steps[-1]["status"] = "success"
-                steps[-1]["message"] = f"✓ Fetched PR: {pr_data.get('title', 'Unknown')}"
+                self._mark(steps, "success", f"✓ Fetched PR: {pr_data.get('title', 'Unknown')}")
                 
                 # Add metrics step
-                steps.append({
-                    "step": "metrics",
-                    "status": "success",
-                    "message": f"✓ Created {len(review_units)} review units"
-                })
+                steps.append(self._step("metrics", "success", f"✓ Created {len(review_units)} review units"))
                 
                 return {
                     "success": True,
-                    "steps": steps,
+                    "steps": self._finalize_progress(steps),
                     "pr_data": pr_data,
                     "review_units": review_units,
                     "repo_id": repo_id,
@@ -583,14 +1121,13 @@ class WorkflowOrchestrator:
                 }
                 
             except Exception as e:
-                steps[-1]["status"] = "error"
-                steps[-1]["message"] = f"✗ Failed to fetch PR: {str(e)}"
-                return {"success": False, "steps": steps, "error": str(e)}
+                self._mark(steps, "error", f"✗ Failed to fetch PR: {str(e)}")
+                return {"success": False, "steps": self._finalize_progress(steps), "error": str(e)}
                 
         except Exception as e:
             return {
                 "success": False,
-                "steps": steps,
+                "steps": self._finalize_progress(steps),
                 "error": str(e)
             }
     
@@ -608,20 +1145,15 @@ class WorkflowOrchestrator:
         
         try:
             # Parse URL
-            owner, name = self.parse_github_url(repo_url)
-            repo_id = f"{owner}/{name}"
+            ref = self.parse_github_url(repo_url)
+            owner, name, repo_id = ref.owner, ref.repo, ref.repo_id
             
             # Step 1: Create Initial State
-            steps.append({"step": "create_state", "status": "in_progress", "message": "Creating workflow state"})
+            steps.append(self._step("create_state", "in_progress", "Creating workflow state"))
             try:
-                from app.workflow import WorkflowState
-                import uuid
-                import hashlib
-                
                 # Convert review_units to hunks format
-                hunks = []
-                for unit in review_units:
-                    hunks.append({
+                hunks = [
+                    {
                         "hunk_id": unit.get("hunk_id", ""),
                         "file_path": unit.get("file_path", ""),
                         "old_line_start": unit.get("old_line_start", 0),
@@ -631,17 +1163,20 @@ class WorkflowOrchestrator:
                         "added_lines": unit.get("added_lines", []),
                         "removed_lines": unit.get("removed_lines", []),
                         "context_lines": unit.get("context_lines", [])
-                    })
+                    }
+                    for unit in review_units
+                ]
                 
                 # Create diff hash for caching
-                diff_content = str(hunks)
-                diff_hash = hashlib.md5(diff_content.encode()).hexdigest()
+                diff_hash = compute_diff_hash(hunks)
                 
                 initial_state = WorkflowState(
                     run_id=str(uuid.uuid4()),
                     repo_owner=owner,
                     repo_name=name,
                     repo_id=repo_id,
+                    vector_repo=ref.full_name,
+                    index_sha=self._index_sha(repo_id),
                     pr_number=pr_number,
                     pr_sha=pr_data.get("head", {}).get("sha", ""),
                     diff_hash=diff_hash,
@@ -660,61 +1195,56 @@ class WorkflowOrchestrator:
                     started_at=datetime.now()
                 )
                 
-                steps[-1]["status"] = "success"
-                steps[-1]["message"] = f"✓ State created with {len(hunks)} hunks"
+                self._mark(steps, "success", f"✓ State created with {len(hunks)} hunks")
             except Exception as e:
-                steps[-1]["status"] = "error"
-                steps[-1]["message"] = f"✗ Failed to create state: {str(e)}"
-                return {"success": False, "steps": steps, "error": str(e)}
+                self._mark(steps, "error", f"✗ Failed to create state: {str(e)}")
+                return {"success": False, "steps": self._finalize_progress(steps), "error": str(e)}
             
             # Step 2: Create Workflow
-            steps.append({"step": "create_workflow", "status": "in_progress", "message": "Building LangGraph workflow"})
+            steps.append(self._step("create_workflow", "in_progress", "Building LangGraph workflow"))
             try:
-                from app.workflow import create_review_workflow
-                
                 token = github_token or self.settings.github_token
-                workflow = create_review_workflow(
-                    github_token=token,
-                    settings=self.settings
-                )
+                workflow = self._get_workflow(token)
                 
-                steps[-1]["status"] = "success"
-                steps[-1]["message"] = "✓ Workflow graph created with 7 agent nodes"
+                self._mark(steps, "success", "✓ Workflow graph created with 7 agent nodes")
             except Exception as e:
-                steps[-1]["status"] = "error"
-                steps[-1]["message"] = f"✗ Failed to create workflow: {str(e)}"
-                return {"success": False, "steps": steps, "error": str(e)}
+                self._mark(steps, "error", f"✗ Failed to create workflow: {str(e)}")
+                return {"success": False, "steps": self._finalize_progress(steps), "error": str(e)}
             
             # Step 3: Run Workflow
-            steps.append({"step": "run_workflow", "status": "in_progress", "message": "Executing workflow agents"})
+            steps.append(self._step("run_workflow", "in_progress", "Executing workflow agents"))
             try:
-                from app.workflow import WorkflowState as WFState
-                
                 # Create config for checkpointing
                 config = {"configurable": {"thread_id": initial_state.run_id}}
                 
                 # Start workflow execution
-                print(f"\n{'='*80}")
-                print(f"🚀 Starting Workflow - Run ID: {initial_state.run_id}")
-                print(f"{'='*80}\n")
+                log.info("🚀 Starting Workflow - Run ID: %s", initial_state.run_id)
                 
                 # Stream workflow events
-                for event in workflow.stream(initial_state.model_dump(), config):
+                async for event in workflow.astream(
+                    initial_state, config, durability=CHECKPOINT_DURABILITY
+                ):
                     # Check if we hit a breakpoint (HITL)
                     if '__interrupt__' in event:
                         # Workflow paused at HITL - store for resumption
-                        print(f"\n⏸️  Workflow paused at HITL - awaiting user decision")
+                        log.info("⏸️  Workflow paused at HITL - awaiting user decision")
                         
                         # Store workflow for later resumption
-                        self.active_workflows[initial_state.run_id] = {
+                        self.active_workflows.set(initial_state.run_id, {
                             'workflow': workflow,
                             'config': config,
-                            'started_at': datetime.now()
-                        }
+                            'started_at': initial_state.started_at,
+                            # Fixed metadata for status polls
+                            'snapshot': {
+                                'repo_full_name': f"{initial_state.repo_owner}/{initial_state.repo_name}",
+                                'pr_number': initial_state.pr_number
+                            }
+                        })
                         
                         # Get current state to return HITL data
-                        current_state = workflow.get_state(config)
-                        state_dict = current_state.values
+                        # Checkpointed values are already validated, so skip revalidation
+                        current_state = await workflow.aget_state(config)
+                        partial_state = WorkflowState.model_construct(**current_state.values)
                         
                         # Extract interrupt data (it's stored in the Interrupt object)
                         interrupt_obj = event['__interrupt__']
@@ -731,17 +1261,17 @@ class WorkflowOrchestrator:
                                 # Fallback: construct from current state
                                 hitl_data = {
                                     "type": "hitl_decision_required",
-                                    "issues_count": len(state_dict.get('review_issues', [])),
-                                    "tasks_count": len(state_dict.get('fix_tasks', [])),
-                                    "guardrails_passed": state_dict.get('guardrail_result', {}).get('passed', True) if isinstance(state_dict.get('guardrail_result'), dict) else True,
+                                    "issues_count": len(partial_state.review_issues),
+                                    "tasks_count": len(partial_state.fix_tasks),
+                                    "guardrails_passed": partial_state.guardrail_result.passed if partial_state.guardrail_result else True,
                                     "summary": "Review complete - decision required"
                                 }
                         except Exception as e:
-                            print(f"Warning: Could not extract interrupt data: {e}")
+                            log.warning("⚠️  Could not extract interrupt data: %s", e)
                             hitl_data = {
                                 "type": "hitl_decision_required",
-                                "issues_count": len(state_dict.get('review_issues', [])),
-                                "tasks_count": len(state_dict.get('fix_tasks', [])),
+                                "issues_count": len(partial_state.review_issues),
+                                "tasks_count": len(partial_state.fix_tasks),
                                 "summary": "Review complete - decision required"
                             }
                         
@@ -751,99 +1281,62 @@ class WorkflowOrchestrator:
                             "paused_at_hitl": True,
                             "run_id": initial_state.run_id,
                             "hitl_data": hitl_data,
-                            "review_issues": state_dict.get('review_issues', []),
-                            "fix_tasks": state_dict.get('fix_tasks', []),
-                            "guardrail_result": state_dict.get('guardrail_result'),
-                            "steps": steps
+                            "review_issues": partial_state.review_issues,
+                            "fix_tasks": partial_state.fix_tasks,
+                            "guardrail_result": partial_state.guardrail_result,
+                            "steps": self._finalize_progress(steps)
                         }
                 
-                # Workflow completed without interruption
-                final_state_dict = workflow.get_state(config).values
-                final_state = WFState(**final_state_dict)
+                # Workflow completed without interruption; checkpointed values are
+                # the agents' already-validated models, so skip revalidation
+                final_state_dict = (await workflow.aget_state(config)).values
+                final_state = WorkflowState.model_construct(**final_state_dict)
+                workflow.checkpointer.delete_thread(initial_state.run_id)
                 
-                steps[-1]["status"] = "success"
-                steps[-1]["message"] = "✓ Workflow execution complete"
-                
-                # Add detailed step results
-                steps.append({
-                    "step": "retrieval",
-                    "status": "success",
-                    "message": f"✓ Retrieved {len(final_state.retrieval_bundles)} context bundles"
-                })
-                
-                steps.append({
-                    "step": "review",
-                    "status": "success",
-                    "message": f"✓ Found {len(final_state.review_issues)} issues"
-                })
-                
-                steps.append({
-                    "step": "planning",
-                    "status": "success",
-                    "message": f"✓ Created {len(final_state.fix_tasks)} fix tasks"
-                })
+                self._mark(steps, "success", "✓ Workflow execution complete")
                 
+                # Add detailed step results in one batch
                 guardrail_passed = final_state.guardrail_result.passed if final_state.guardrail_result else True
-                steps.append({
-                    "step": "guardrails",
-                    "status": "success" if guardrail_passed else "warning",
-                    "message": f"✓ Guardrails {'passed' if guardrail_passed else 'failed'}"
-                })
-                
                 hitl_action = final_state.hitl_decision.action if final_state.hitl_decision else "unknown"
-                steps.append({
-                    "step": "hitl",
-                    "status": "success",
-                    "message": f"✓ HITL decision: {hitl_action}"
-                })
-                
-                if final_state.posted_comment_url:
-                    steps.append({
-                        "step": "publish",
-                        "status": "success",
-                        "message": "✓ Published to GitHub"
-                    })
-                
-                if final_state.notification_sent:
-                    steps.append({
-                        "step": "notify",
-                        "status": "success",
-                        "message": "✓ Notifications sent"
-                    })
-                
-                steps.append({
-                    "step": "persist",
-                    "status": "success",
-                    "message": "✓ Workflow state persisted"
-                })
+                steps.extend([
+                    self._step("retrieval", "success", f"✓ Retrieved {len(final_state.retrieval_bundles)} context bundles"),
+                    self._step("review", "success", f"✓ Found {len(final_state.review_issues)} issues"),
+                    self._step("planning", "success", f"✓ Created {len(final_state.fix_tasks)} fix tasks"),
+                    self._step("guardrails", "success" if guardrail_passed else "warning", f"✓ Guardrails {'passed' if guardrail_passed else 'failed'}"),
+                    self._step("hitl", "success", f"✓ HITL decision: {hitl_action}"),
+                    *self._closing_steps(final_state)
+                ])
                 
+                # Models are returned as-is: the route's response model serializes
+                # them straight to JSON bytes in pydantic-core, in a single pass
                 return {
                     "success": True,
-                    "steps": steps,
-                    "final_state": final_state.model_dump(mode='json'),
+                    "steps": self._finalize_progress(steps),
+                    "final_state": final_state,
                     "run_id": final_state.run_id,
-                    "review_issues": [issue.model_dump(mode='json') for issue in final_state.review_issues],
-                    "fix_tasks": [task.model_dump(mode='json') for task in final_state.fix_tasks],
-                    "guardrail_result": final_state.guardrail_result.model_dump(mode='json') if final_state.guardrail_result else None,
-                    "hitl_decision": final_state.hitl_decision.model_dump(mode='json') if final_state.hitl_decision else None,
+                    "review_issues": final_state.review_issues,
+                    "fix_tasks": final_state.fix_tasks,
+                    "guardrail_result": final_state.guardrail_result,
+                    "hitl_decision": final_state.hitl_decision,
                     "posted_comment_url": final_state.posted_comment_url,
                     "notification_sent": final_state.notification_sent,
                     "persistence_path": final_state.persistence_path
                 }
                 
             except Exception as e:
-                steps[-1]["status"] = "error"
-                steps[-1]["message"] = f"✗ Workflow execution failed: {str(e)}"
-                import traceback
-                return {"success": False, "steps": steps, "error": str(e), "traceback": traceback.format_exc()}
+                # A failed run cannot be resumed; drop it and its checkpoint
+                self.active_workflows.pop(initial_state.run_id)
+                workflow.checkpointer.delete_thread(initial_state.run_id)
+                self._mark(steps, "error", f"✗ Workflow execution failed: {str(e)}")
+                error_trace = self._error_trace("Workflow execution failed")
+                return {"success": False, "steps": self._finalize_progress(steps), "error": str(e), "traceback": error_trace}
                 
         except Exception as e:
-            import traceback
             return {
                 "success": False,
-                "steps": steps,
+                "steps": self._finalize_progress(steps),
                 "error": str(e),
-                "traceback": traceback.format_exc()
+                "traceback": self._error_trace("Workflow execution failed")
             }
     
     async def resume_workflow_with_hitl(
@@ -854,20 +1347,15 @@ class WorkflowOrchestrator:
         feedback: Optional[str] = None
     ) -> Dict[str, Any]:
         """Resume workflow after HITL decision."""
-        from app.workflow import WorkflowState as WFState
-        from app.workflow.state import HITLAction
-        
         # Check if workflow exists
-        if run_id not in self.active_workflows:
+        workflow_info = self.active_workflows.get(run_id)
+        if workflow_info is None:
             return {"success": False, "error": "Workflow not found or already completed"}
         
-        workflow_info = self.active_workflows[run_id]
         workflow = workflow_info['workflow']
         config = workflow_info['config']
         
         # Create HITL decision object
-        from app.workflow.state import HITLDecision
-        
         decision = HITLDecision(
             action=HITLAction(action),
             edited_content=edited_content,
@@ -876,70 +1364,78 @@ class WorkflowOrchestrator:
         
         try:
             # Update state with HITL decision
-            current_state = workflow.get_state(config)
+            current_state = await workflow.aget_state(config)
             
             # Update the state with the decision
-            workflow.update_state(
+            await workflow.aupdate_state(
                 config,
                 {"hitl_decision": decision}
             )
             
             # Continue workflow execution from interrupt
-            for event in workflow.stream(None, config):
+            async for event in workflow.astream(None, config, durability=CHECKPOINT_DURABILITY):
                 pass  # Continue to completion
             
-            # Get final state
-            final_state_dict = workflow.get_state(config).values
-            final_state = WFState(**final_state_dict)
+            # Get final state (already-validated checkpoint values)
+            final_state_dict = (await workflow.aget_state(config)).values
+            final_state = WorkflowState.model_construct(**final_state_dict)
             
-            # Remove from active workflows
-            del self.active_workflows[run_id]
+            # Remove from active workflows and drop the finished run's checkpoint
+            self.active_workflows.pop(run_id)
+            workflow.checkpointer.delete_thread(run_id)
             
             # Return final results
-            steps = []
-            steps.append({"step": "hitl_resumed", "status": "success", "message": f"✓ HITL decision: {action}"})
-            
-            if final_state.posted_comment_url:
-                steps.append({"step": "publish", "status": "success", "message": "✓ Published to GitHub"})
-            
-            if final_state.notification_sent:
-                steps.append({"step": "notify", "status": "success", "message": "✓ Notifications sent"})
-            
-            steps.append({"step": "persist", "status": "success", "message": "✓ Workflow state persisted"})
+            steps = [
+                self._step("hitl_resumed", "success", f"✓ HITL decision: {action}"),
+                *self._closing_steps(final_state)
+            ]
             
             return {
                 "success": True,
                 "workflow_complete": True,
-                "steps": steps,
-                "final_state": final_state.model_dump(mode='json'),
+                "steps": self._finalize_progress(steps),
+                "final_state": final_state,
                 "posted_comment_url": final_state.posted_comment_url,
                 "notification_sent": final_state.notification_sent,
                 "persistence_path": final_state.persistence_path
             }
         except Exception as e:
-            import traceback
             return {
                 "success": False,
                 "error": str(e),
-                "traceback": traceback.format_exc()
+                "traceback": self._error_trace("HITL resume failed")
             }
     
-    async def get_workflow_status(self, run_id: str) -> Dict[str, Any]:
-        """Get current workflow status."""
-        if run_id not in self.active_workflows:
+    async def get_workflow_status(self, run_id: str, include_state: bool = True) -> Dict[str, Any]:
+        """
+        Get current workflow status.
+        
+        Args:
+            run_id: Workflow run ID
+            include_state: Include the full workflow state (hunks, issues, ...);
+                pollers that only need progress should pass False
+        
+        Returns:
+            Dict with status metadata (and the state if requested)
+        """
+        workflow_info = self.active_workflows.get(run_id)
+        if workflow_info is None:
             return {"success": False, "error": "Workflow not found"}
         
-        workflow_info = self.active_workflows[run_id]
         workflow = workflow_info['workflow']
         config = workflow_info['config']
         
         # Get current state
-        current_state = workflow.get_state(config)
+        current_state = await workflow.aget_state(config)
         
-        return {
+        result = {
             "success": True,
             "run_id": run_id,
+            **workflow_info['snapshot'],
+            "started_at": workflow_info['started_at'],
             "current_node": current_state.next,
-            "state": current_state.values,
             "paused_at_hitl": "hitl" in (current_state.next or [])
-        }
\ No newline at end of file
+        }
+        if include_state:
+            result["state"] = current_state.values
+        return result
\ No newline at end of file
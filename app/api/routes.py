@@ -1,26 +1,80 @@
 """FastAPI routes for PR review system."""
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any, List
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Response
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, Dict, Any, Set, TYPE_CHECKING
 from datetime import datetime
 
-from app.api.orchestrator import WorkflowOrchestrator
-from config.settings import Settings
+from app.api.cleanup import _get_qdrant_client
+from app.api.orchestrator import MemoryCache, WorkflowOrchestrator
+from config.connections import ollama_async_http_client
+from config.settings import Settings, get_settings
 
-router = APIRouter()
+if TYPE_CHECKING:
+    import httpx
+
+
+@asynccontextmanager
+async def _lifespan(app):
+    """Let the orchestrator finish background cleanups on shutdown."""
+    yield
+    await orchestrator.aclose()
+    while _ollama_http:
+        _, client = _ollama_http.popitem()
+        await client.aclose()
+
+
+router = APIRouter(lifespan=_lifespan)
 
 # Global orchestrator instance
 orchestrator = WorkflowOrchestrator()
 
+# Long-lived Ollama clients for the health probe (keyed by base URL), so each
+# probe reuses a kept-alive connection instead of a new TCP (and TLS)
+# handshake; the async client also keeps the probe off the event loop
+_ollama_http: Dict[str, "httpx.AsyncClient"] = {}
+
+
+def _ollama_client(base_url: str) -> "httpx.AsyncClient":
+    """Return the probe client for an Ollama URL, creating it once."""
+    client = _ollama_http.get(base_url)
+    if client is None:
+        client = _ollama_http[base_url] = ollama_async_http_client(base_url, timeout=5)
+    return client
+
+
+# Background review jobs started by POST /review (run_id -> job info); bounded
+# so finished results are dropped once they expire or the history is full
+review_jobs = MemoryCache(
+    max_size=orchestrator.settings.review_jobs_max,
+    ttl_seconds=orchestrator.settings.review_job_ttl_seconds
+)
+# Strong references to unfinished review tasks, which must outlive eviction
+_review_tasks: Set[asyncio.Task] = set()
+review_semaphore = asyncio.Semaphore(orchestrator.settings.max_concurrent_reviews)
+
+
+# Request bodies are read-only and unknown fields are dropped
+_REQUEST_CONFIG = ConfigDict(extra="ignore", frozen=True)
+
 
 class IngestRequest(BaseModel):
     """Request model for repository ingestion."""
+    model_config = _REQUEST_CONFIG
+    
     repo_url: str = Field(..., description="GitHub repository URL")
+    github_token: Optional[str] = Field(None, description="GitHub token used to check whether main changed")
+    force_reingest: bool = Field(False, description="Re-ingest even if main is unchanged")
 
 
 class PRFetchRequest(BaseModel):
     """Request model for PR fetch and parse."""
+    model_config = _REQUEST_CONFIG
+    
     repo_url: str = Field(..., description="GitHub repository URL")
     pr_number: int = Field(..., description="Pull request number", gt=0)
     github_token: Optional[str] = Field(None, description="GitHub token (optional)")
@@ -28,16 +82,22 @@ class PRFetchRequest(BaseModel):
 
 class ExecuteWorkflowRequest(BaseModel):
     """Request model for workflow execution (Phase 3-6)."""
+    model_config = _REQUEST_CONFIG
+    
     repo_url: str = Field(..., description="GitHub repository URL")
     pr_number: int = Field(..., description="Pull request number", gt=0)
-    pr_data: Dict[str, Any] = Field(..., description="PR data from Phase 2")
-    review_units: List[Dict[str, Any]] = Field(..., description="Review units from Phase 2")
+    # Opaque Phase 2 payloads: bare dict/list are passed through as parsed
+    # instead of being copied element by element during validation
+    pr_data: dict = Field(..., description="PR data from Phase 2")
+    review_units: list = Field(..., description="Review units from Phase 2")
     github_token: Optional[str] = Field(None, description="GitHub token (optional)")
     run_evaluation: bool = Field(False, description="Run evaluation metrics")
 
 
 class PRReviewRequest(BaseModel):
     """Request model for PR review."""
+    model_config = _REQUEST_CONFIG
+    
     repo_url: str = Field(..., description="GitHub repository URL")
     pr_number: int = Field(..., description="Pull request number", gt=0)
     github_token: Optional[str] = Field(None, description="GitHub token (optional)")
@@ -60,38 +120,46 @@ class HealthResponse(BaseModel):
     services: Dict[str, str]
 
 
+# The root payload never changes, so it is serialized once at import
+_ROOT_BYTES = orjson.dumps({
+    "service": "Repo-Copilot PR Review API",
+    "version": "1.0.0",
+    "docs": "/docs",
+    "health": "/health"
+})
+
+
 @router.get("/", response_model=Dict[str, str])
 async def root():
     """Root endpoint."""
-    return {
-        "service": "Repo-Copilot PR Review API",
-        "version": "1.0.0",
-        "docs": "/docs",
-        "health": "/health"
-    }
+    return Response(content=_ROOT_BYTES, media_type="application/json")
 
 
-@router.get("/health", response_model=HealthResponse)
-async def health_check():
-    """Health check endpoint."""
-    settings = Settings()
-    
-    # Check Qdrant connection
+async def _check_qdrant(settings: Settings) -> str:
+    """Probe Qdrant from a worker thread (the client is synchronous)."""
     try:
-        from qdrant_client import QdrantClient
-        client = QdrantClient(url=settings.qdrant_url, api_key=settings.qdrant_api_key)
-        client.get_collections()
-        qdrant_status = "healthy"
+        # Same shared client (and transport) as the cleanup manager; created
+        # on the first probe, and retried on the next one if that fails
+        await asyncio.to_thread(lambda: _get_qdrant_client(settings).get_collections())
+        return "healthy"
     except Exception as e:
-        qdrant_status = f"unhealthy: {str(e)}"
-    
-    # Check Ollama connection
+        return f"unhealthy: {str(e)}"
+
+
+async def _check_ollama(settings: Settings) -> str:
+    """Probe Ollama's model list endpoint."""
     try:
-        import requests
-        response = requests.get(f"{settings.ollama_base_url}/api/tags", timeout=5)
-        ollama_status = "healthy" if response.status_code == 200 else "unhealthy"
+        response = await _ollama_client(settings.ollama_base_url).get("/api/tags")
+        return "healthy" if response.status_code == 200 else "unhealthy"
     except Exception as e:
-        ollama_status = f"unhealthy: {str(e)}"
+        return f"unhealthy: {str(e)}"
+
+
+@router.get("/health", response_model=HealthResponse)
+async def health_check(settings: Settings = Depends(get_settings)):
+    """Health check endpoint."""
+    # Probe both services concurrently: latency is the slower probe, not the sum
+    qdrant_status, ollama_status = await asyncio.gather(_check_qdrant(settings), _check_ollama(settings))
     
     return HealthResponse(
         status="healthy",
@@ -105,12 +173,38 @@ async def health_check():
     )
 
 
-@router.post("/review", response_model=PRReviewResponse)
+async def _run_review_job(job: Dict[str, Any], request: PRReviewRequest) -> Dict[str, Any]:
+    """Run a queued review once a slot frees up and record its outcome."""
+    async with review_semaphore:
+        job["status"] = "running"
+        job["started_at"] = datetime.now().isoformat()
+        
+        try:
+            result = await orchestrator.run_full_workflow(
+                repo_url=request.repo_url,
+                pr_number=request.pr_number,
+                github_token=request.github_token,
+                run_evaluation=request.run_evaluation
+            )
+            job["status"] = "completed" if result['success'] else "failed"
+            return result
+        except Exception as e:
+            job["status"] = "failed"
+            job["error"] = str(e)
+            raise
+        finally:
+            job["finished_at"] = datetime.now().isoformat()
+
+
+@router.post("/review", response_model=PRReviewResponse, status_code=202)
 async def review_pr(request: PRReviewRequest):
     """
-    Run PR review workflow.
+    Queue a PR review workflow and return immediately.
+    
+    The review runs as a background task (at most max_concurrent_reviews
+    at a time); poll GET /review/{run_id} for its status and result.
     
-    This endpoint executes the complete workflow:
+    The workflow:
     1. Ingestion - Clone and embed repository
     2. PR Fetch - Get PR data from GitHub
     3. Retrieval - Find relevant context
@@ -120,40 +214,74 @@ async def review_pr(request: PRReviewRequest):
     7. Publish - Post comments and notifications
     8. Evaluation - Optional metrics calculation
     """
-    try:
-        result = await orchestrator.run_full_workflow(
-            repo_url=request.repo_url,
-            pr_number=request.pr_number,
-            github_token=request.github_token,
-            run_evaluation=request.run_evaluation
+    run_id = uuid.uuid4().hex
+    job = {
+        "status": "queued",
+        "repo_url": request.repo_url,
+        "pr_number": request.pr_number,
+        "created_at": datetime.now().isoformat()
+    }
+    job["task"] = task = asyncio.create_task(_run_review_job(job, request))
+    _review_tasks.add(task)
+    task.add_done_callback(_review_tasks.discard)
+    review_jobs.set(run_id, job)
+    
+    return PRReviewResponse(
+        success=True,
+        message=f"PR review queued for {request.repo_url} #{request.pr_number}",
+        data={"run_id": run_id, "status": "queued"}
+    )
+
+
+@router.get("/review/{run_id}", response_model=PRReviewResponse)
+async def get_review(run_id: str):
+    """Get the status (and result, once finished) of a queued PR review."""
+    job = review_jobs.get(run_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Review {run_id} not found")
+    
+    task = job["task"]
+    data = {key: value for key, value in job.items() if key != "task"}
+    data["run_id"] = run_id
+    
+    if not task.done():
+        return PRReviewResponse(
+            success=True,
+            message=f"PR review {job['status']}",
+            data=data
         )
-        
-        if result['success']:
-            return PRReviewResponse(
-                success=True,
-                message=f"PR review complete for {result['repo_owner']}/{result['repo_name']} #{result['pr_number']}",
-                data=result
-            )
-        else:
-            return PRReviewResponse(
-                success=False,
-                message="PR review failed",
-                error=result.get('error', 'Unknown error'),
-                data=result
-            )
     
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Internal server error: {str(e)}"
+    if task.exception() is not None:
+        return PRReviewResponse(
+            success=False,
+            message="PR review failed",
+            error=str(task.exception()),
+            data=data
         )
+    
+    # Finished: return the workflow result, same shape as the old synchronous response
+    result = task.result()
+    
+    if result['success']:
+        return PRReviewResponse(
+            success=True,
+            message=f"PR review complete for {result['repo_owner']}/{result['repo_name']} #{result['pr_number']}",
+            data=result
+        )
+    
+    return PRReviewResponse(
+        success=False,
+        message="PR review failed",
+        error=result.get('error', 'Unknown error'),
+        data=result
+    )
 
 
 @router.post("/cleanup", response_model=Dict[str, str])
 async def cleanup_all():
     """Force cleanup of all temporary resources."""
     try:
-        orchestrator.cleanup_manager.full_cleanup()
+        await orchestrator.cleanup_manager.afull_cleanup()
         orchestrator.current_repo_id = None
         
         return {
@@ -189,7 +317,9 @@ async def ingest_repository(request: IngestRequest):
     """
     try:
         result = await orchestrator.run_ingestion_only(
-            repo_url=request.repo_url
+            repo_url=request.repo_url,
+            github_token=request.github_token,
+            force_reingest=request.force_reingest
         )
         
         return result
@@ -234,6 +364,8 @@ async def execute_workflow(request: ExecuteWorkflowRequest):
 
 class HITLDecisionRequest(BaseModel):
     """Request model for HITL decision."""
+    model_config = _REQUEST_CONFIG
+    
     run_id: str = Field(..., description="Workflow run ID")
     action: str = Field(..., description="HITL action: approve, edit, reject, post_summary_only")
     edited_content: Optional[str] = Field(None, description="Edited review content")
@@ -256,10 +388,10 @@ async def submit_hitl_decision(request: HITLDecisionRequest):
 
 
 @router.get("/workflow-status/{run_id}", response_model=Dict[str, Any])
-async def get_workflow_status(run_id: str):
-    """Get current workflow status."""
+async def get_workflow_status(run_id: str, include_state: bool = True):
+    """Get current workflow status (pass include_state=false for cheap polling)."""
     try:
-        result = await orchestrator.get_workflow_status(run_id)
+        result = await orchestrator.get_workflow_status(run_id, include_state=include_state)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -14,6 +14,7 @@ from qdrant_client.models import (
     MatchValue,
 )
 
+from config.connections import qdrant_client_kwargs
 from config.settings import settings
 from .conventions_ingestor import Convention
 
@@ -40,10 +41,8 @@ class ConventionsVectorStore:
         
         # Initialize Qdrant client
         self.client = QdrantClient(
-            url=self.url,
-            api_key=self.api_key,
-            timeout=60,
-            prefer_grpc=False
+            **qdrant_client_kwargs(self.url, self.api_key, prefer_grpc=False),
+            timeout=60
         )
         
         # Initialize collection
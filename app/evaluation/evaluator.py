@@ -10,7 +10,7 @@ from pathlib import Path
 from .synthetic_pr_generator import SyntheticPR, SyntheticPRGenerator
 from .metrics import EvaluationMetrics, MetricsResult
 from app.workflow.state import WorkflowState
-from config.settings import Settings
+from config.settings import Settings, get_settings
 
 
 @dataclass
@@ -75,7 +75,7 @@ class Evaluator:
     
     def __init__(self, settings: Optional[Settings] = None):
         """Initialize evaluator."""
-        self.settings = settings or Settings()
+        self.settings = settings or get_settings()
         self.generator = SyntheticPRGenerator()
         self.metrics = EvaluationMetrics()
     
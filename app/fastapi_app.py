@@ -3,6 +3,9 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.routes import router
+from config.logging_config import setup_logging
+
+setup_logging()
 
 app = FastAPI(
     title="Repo-Copilot API",
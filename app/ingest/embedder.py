@@ -1,6 +1,9 @@
 """Embedding generation using HuggingFace BGE model."""
 
+import hashlib
+import threading
 import time
+from collections import OrderedDict
 from typing import List, Optional, Dict, Any
 from dataclasses import dataclass
 
@@ -78,6 +81,12 @@ class Embedder:
         self.failed_chunks = []
         # Use expected dimension from settings, will validate against actual
         self.expected_dimension = settings.embedding_dimension
+        
+        # Recent query embeddings by content hash; the cache belongs to this
+        # embedder, so entries never outlive a model switch
+        self.query_cache_size = settings.embedding_query_cache_size
+        self._query_cache: "OrderedDict[bytes, EmbeddingResult]" = OrderedDict()
+        self._query_cache_lock = threading.Lock()
     
     def embed_text(self, text: str) -> EmbeddingResult:
         """
@@ -92,15 +101,55 @@ class Embedder:
         if not text or not text.strip():
             raise ValueError("Text cannot be empty")
         
+        return self.embed_texts([text])[0]
+    
+    def embed_texts(self, texts: List[str]) -> List[EmbeddingResult]:
+        """
+        Generate embeddings for several query texts in one model call.
+        
+        Texts already in the query cache are served from it; the rest are
+        embedded together (duplicates once) and results keep the input order.
+        
+        Args:
+            texts: Non-empty texts to embed
+        
+        Returns:
+            EmbeddingResult objects, one per input text
+        """
+        # Identical hunks and queries recur across PRs and re-runs
+        keys = [hashlib.blake2b(text.encode(), digest_size=16).digest() for text in texts]
+        results: Dict[bytes, EmbeddingResult] = {}
+        with self._query_cache_lock:
+            for key in keys:
+                cached = self._query_cache.get(key)
+                if cached is not None:
+                    self._query_cache.move_to_end(key)
+                    results[key] = cached
+        
+        misses = {key: text for key, text in zip(keys, texts) if key not in results}
+        if misses:
+            embedded = self._embed_texts_uncached(list(misses.values()))
+            results.update(zip(misses, embedded))
+            
+            if self.query_cache_size > 0:
+                with self._query_cache_lock:
+                    for key, result in zip(misses, embedded):
+                        self._query_cache[key] = result
+                    while len(self._query_cache) > self.query_cache_size:
+                        self._query_cache.popitem(last=False)
+        
+        return [results[key] for key in keys]
+    
+    def _embed_texts_uncached(self, texts: List[str]) -> List[EmbeddingResult]:
+        """Embed texts in one embed_documents call with retry logic, bypassing the query cache."""
         # Retry with exponential backoff
         max_retries = self.max_retries
         base_delay = self.retry_delay
         
         for attempt in range(max_retries):
             try:
-                # Use embed_documents for consistency (even for single text)
-                embedding_vector = self.embedding_model.embed_documents([text])[0]
-                dimension = len(embedding_vector)
+                embedding_vectors = self.embedding_model.embed_documents(texts)
+                dimension = len(embedding_vectors[0])
                 
                 # Validate dimension
                 if dimension != self.expected_dimension:
@@ -111,15 +160,16 @@ class Embedder:
                         raise ValueError(f"Dimension mismatch: expected {self.expected_dimension}, got {dimension}")
                 
                 # Estimate token count (rough approximation: ~4 chars per token)
-                estimated_tokens = len(text) // 4
-                
-                return EmbeddingResult(
-                    chunk_id="text_embed",
-                    embedding=embedding_vector,
-                    token_count=estimated_tokens,
-                    model=self.model,
-                    dimension=dimension
-                )
+                return [
+                    EmbeddingResult(
+                        chunk_id="text_embed",
+                        embedding=embedding_vector,
+                        token_count=len(text) // 4,
+                        model=self.model,
+                        dimension=dimension
+                    )
+                    for text, embedding_vector in zip(texts, embedding_vectors)
+                ]
             
             except Exception as e:
                 # For local embeddings, retries are mainly for transient errors
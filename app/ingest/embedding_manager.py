@@ -242,7 +242,9 @@ class EmbeddingManager:
         
         # Combine all components: repo_branch_chunkid_modelhash.json
         filename = f"{safe_repo}_{safe_branch}_{safe_id}_{model_hash}.json"
-        return self.cache_dir / filename
+        
+        # Group files per repo/branch so a repo's cache can be dropped with one rmtree
+        return self.cache_dir / f"{safe_repo}_{safe_branch}" / filename
     
     def _save_to_cache(
         self,
@@ -267,6 +269,7 @@ class EmbeddingManager:
         }
         
         try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
             with open(cache_path, 'w') as f:
                 json.dump(cache_data, f)
         except Exception as e:
@@ -338,7 +341,7 @@ class EmbeddingManager:
                 'cache_size_mb': 0
             }
         
-        cache_files = list(self.cache_dir.glob('*.json'))
+        cache_files = list(self.cache_dir.glob('**/*.json'))
         total_size = sum(f.stat().st_size for f in cache_files)
         
         return {
@@ -1,6 +1,7 @@
 """Repository loader for fetching code from GitHub."""
 
 import os
+import re
 import shutil
 import tempfile
 from pathlib import Path
@@ -15,6 +16,10 @@ from git import Repo as GitRepo
 from config.settings import settings
 
 
+# owner/repo with an optional (scheme +) github.com prefix, .git suffix and trailing slash
+_REPO_URL_RE = re.compile(r'^(?:(?:https?://)?github\.com/)?(?P<owner>[^/]+)/(?P<repo>[^/]+?)(?:\.git)?/?$')
+
+
 class LoadMethod(Enum):
     """Method to use for loading repository."""
     CLONE = "clone"  # Git clone (for large repos or full history)
@@ -133,19 +138,9 @@ class RepositoryLoader:
         # - github.com/owner/repo
         # - owner/repo
         
-        repo_url = repo_url.strip().rstrip('/')
-        
-        if repo_url.startswith('http://') or repo_url.startswith('https://'):
-            # Extract from full URL
-            parts = repo_url.split('github.com/')[-1].split('/')
-        else:
-            # Handle "owner/repo" format
-            parts = repo_url.split('/')
-        
-        if len(parts) >= 2:
-            owner = parts[-2]
-            repo_name = parts[-1].replace('.git', '')
-            return owner, repo_name
+        match = _REPO_URL_RE.match(repo_url.strip())
+        if match:
+            return match['owner'], match['repo']
         
         raise ValueError(f"Invalid GitHub repository URL: {repo_url}")
     
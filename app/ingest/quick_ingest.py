@@ -1,5 +1,6 @@
 """Quick ingestion utility for workflow orchestration."""
 
+import logging
 from typing import Optional, Dict, Any
 from pathlib import Path
 
@@ -12,6 +13,9 @@ from app.storage import QdrantVectorStore
 from config.settings import Settings, settings
 
 
+log = logging.getLogger(__name__)
+
+
 def quick_ingest_repo(
     repo_url: str,
     branch: Optional[str] = None,
@@ -28,20 +32,20 @@ def quick_ingest_repo(
     Returns:
         Dict with ingestion results
     """
-    settings_obj = settings_obj or Settings()
+    settings_obj = settings_obj or settings
     
     # Initialize components
     ingestor = RepositoryIngestor(github_token=settings_obj.github_token)
     
     # Ingest repository
-    print(f"📥 Ingesting repository: {repo_url}")
+    log.info("📥 Ingesting repository: %s", repo_url)
     result = ingestor.ingest_repository(
         repo_url=repo_url,
         method=LoadMethod.API,
         branch=branch or "main"
     )
     
-    print(f"✓ Loaded {result.total_files} files")
+    log.info("✓ Loaded %d files", result.total_files)
     
     # Initialize chunker with repo info
     repo_name = f"{result.repo_info.owner}/{result.repo_info.name}"
@@ -50,7 +54,7 @@ def quick_ingest_repo(
     vector_store = QdrantVectorStore()
     
     # Chunk and embed files
-    print("✂️  Chunking code files...")
+    log.info("✂️  Chunking code files...")
     all_chunks = []
     all_embeddings = []
     all_metadata = []
@@ -90,17 +94,17 @@ def quick_ingest_repo(
                     all_chunks.append(chunk)
                     
                 except Exception as embed_error:
-                    print(f"⚠️  Error embedding chunk from {file_info.relative_path}: {embed_error}")
+                    log.warning("⚠️  Error embedding chunk from %s: %s", file_info.relative_path, embed_error)
                     continue
             
         except Exception as e:
-            print(f"⚠️  Error processing {file_info.relative_path}: {e}")
+            log.warning("⚠️  Error processing %s: %s", file_info.relative_path, e)
             continue
     
-    print(f"✓ Created {len(all_chunks)} chunks")
+    log.info("✓ Created %d chunks", len(all_chunks))
     
     # Store in Qdrant
-    print("💾 Storing embeddings in Qdrant...")
+    log.info("💾 Storing embeddings in Qdrant...")
     stored_count = 0
     
     if all_embeddings and len(all_embeddings) == len(all_metadata) == len(all_chunks):
@@ -110,9 +114,12 @@ def quick_ingest_repo(
             metadata_list=all_metadata,
             contents=contents,
         )
-        print(f"✓ Stored {stored_count} embeddings")
+        log.info("✓ Stored %d embeddings", stored_count)
     else:
-        print(f"⚠️  Mismatch: {len(all_embeddings)} embeddings, {len(all_metadata)} metadata, {len(all_chunks)} chunks")
+        log.warning(
+            "⚠️  Mismatch: %d embeddings, %d metadata, %d chunks",
+            len(all_embeddings), len(all_metadata), len(all_chunks)
+        )
     
     repo_id = f"{result.repo_info.owner}_{result.repo_info.name}_{branch or 'main'}"
     
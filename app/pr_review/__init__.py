@@ -2,7 +2,7 @@
 
 from .pr_fetcher import PRFetcher, PRData, PRFile
 from .diff_parser import DiffParser, Hunk, FileDiff, LineType, DiffLine
-from .review_units import ReviewUnit, ReviewUnitBuilder, ReviewUnitType, ReviewContext
+from .review_units import ReviewUnit, ReviewUnitBuilder, ReviewUnitType, ReviewContext, review_units_to_hunks
 from .coordinator import PRReviewCoordinator, PRReviewSession, quick_prepare_review
 
 __all__ = [
@@ -23,6 +23,7 @@ __all__ = [
     'ReviewUnitBuilder',
     'ReviewUnitType',
     'ReviewContext',
+    'review_units_to_hunks',
     
     # Coordinator
     'PRReviewCoordinator',
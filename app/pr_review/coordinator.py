@@ -1,5 +1,6 @@
 """High-level PR review coordinator combining all Phase 2 components."""
 
+import logging
 from typing import List, Optional, Dict, Any
 from dataclasses import dataclass
 
@@ -8,6 +9,9 @@ from .diff_parser import DiffParser, FileDiff, Hunk
 from .review_units import ReviewUnitBuilder, ReviewUnit, ReviewUnitType
 
 
+log = logging.getLogger(__name__)
+
+
 @dataclass
 class PRReviewSession:
     """Complete PR review session data."""
@@ -58,14 +62,15 @@ class PRReviewCoordinator:
     - Review unit building (Step 2.3)
     """
     
-    def __init__(self, github_token: Optional[str] = None):
+    def __init__(self, github_token: Optional[str] = None, fetcher: Optional[PRFetcher] = None):
         """
         Initialize coordinator.
         
         Args:
             github_token: GitHub API token
+            fetcher: Existing PRFetcher to reuse (its connection pool is kept alive)
         """
-        self.fetcher = PRFetcher(github_token)
+        self.fetcher = fetcher or PRFetcher(github_token)
     
     def prepare_pr_review(
         self,
@@ -89,18 +94,18 @@ class PRReviewCoordinator:
             PRReviewSession with all data ready for Phase 3 (retrieval + review)
         """
         # Step 2.1: Fetch PR data
-        print(f"Step 2.1: Fetching PR #{pr_number} from {repo_full_name}...")
+        log.info("Step 2.1: Fetching PR #%s from %s...", pr_number, repo_full_name)
         pr_data = self.fetcher.fetch_pr(
             repo_full_name,
             pr_number,
             include_reviews=include_reviews
         )
-        print(f"  ✓ Fetched PR: {pr_data.title}")
-        print(f"  ✓ Files changed: {pr_data.changed_files_count}")
-        print(f"  ✓ Changes: +{pr_data.additions} -{pr_data.deletions}")
+        log.info(
+            "  ✓ Fetched PR: %s (%d files, +%d -%d)",
+            pr_data.title, pr_data.changed_files_count, pr_data.additions, pr_data.deletions
+        )
         
         # Step 2.2: Parse diffs into hunks
-        print(f"\nStep 2.2: Parsing diffs into hunks...")
         file_diffs = []
         
         for pr_file in pr_data.files:
@@ -118,11 +123,9 @@ class PRReviewCoordinator:
                 file_diffs.append(file_diff)
         
         total_hunks = sum(len(fd.hunks) for fd in file_diffs)
-        print(f"  ✓ Parsed {len(file_diffs)} files")
-        print(f"  ✓ Total hunks: {total_hunks}")
+        log.info("Step 2.2: Parsed %d files into %d hunks", len(file_diffs), total_hunks)
         
         # Step 2.3: Build review units
-        print(f"\nStep 2.3: Building review units (strategy: {strategy})...")
         builder = ReviewUnitBuilder(pr_data, file_diffs)
         review_units = builder.build_all_units(
             strategy=strategy,
@@ -130,8 +133,10 @@ class PRReviewCoordinator:
         )
         
         high_priority = len([u for u in review_units if u.priority == 1])
-        print(f"  ✓ Created {len(review_units)} review units")
-        print(f"  ✓ High priority: {high_priority}")
+        log.info(
+            "Step 2.3: Created %d review units (strategy: %s, high priority: %d)",
+            len(review_units), strategy, high_priority
+        )
         
         # Create session
         session = PRReviewSession(
@@ -140,8 +145,6 @@ class PRReviewCoordinator:
             review_units=review_units
         )
         
-        print(f"\n✓ Phase 2 complete - Ready for review!")
-        
         return session
     
     def get_file_content_at_base(
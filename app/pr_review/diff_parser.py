@@ -1,7 +1,7 @@
 """Parse unified diffs into structured hunks."""
 
 import re
-from typing import List, Optional, Tuple
+from typing import Iterator, List, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -145,13 +145,31 @@ class DiffParser:
         Returns:
             List of FileDiff objects, one per file
         """
+        return list(DiffParser.parse_diff_iter(diff_text))
+    
+    @staticmethod
+    def parse_diff_iter(diff_text: str) -> Iterator[FileDiff]:
+        """
+        Parse unified diff lazily, yielding each FileDiff once it is complete.
+        
+        Lets callers build downstream objects in the same pass (or stop after
+        the first file) instead of materializing the whole list first.
+        
+        Args:
+            diff_text: Unified diff text (from git diff or PR patch)
+        
+        Yields:
+            FileDiff objects, one per file
+        """
         if not diff_text or not diff_text.strip():
-            return []
+            return
         
         lines = diff_text.split('\n')
-        file_diffs = []
         current_file = None
         current_hunk = None
+        # Next old/new line numbers inside current_hunk
+        old_line_no = 0
+        new_line_no = 0
         i = 0
         
         while i < len(lines):
@@ -161,13 +179,12 @@ class DiffParser:
             if DiffParser.BINARY_DIFF.match(line):
                 # Binary files - create minimal FileDiff
                 if current_file:
-                    file_diffs.append(current_file)
-                current_file = FileDiff(
+                    yield current_file
+                yield FileDiff(
                     old_path="binary",
                     new_path="binary",
                     is_binary=True
                 )
-                file_diffs.append(current_file)
                 current_file = None
                 i += 1
                 continue
@@ -180,7 +197,7 @@ class DiffParser:
                     if current_hunk:
                         current_file.hunks.append(current_hunk)
                         current_hunk = None
-                    file_diffs.append(current_file)
+                    yield current_file
                 
                 old_path = old_match.group(1)
                 # Remove a/ or b/ prefix if present
@@ -229,6 +246,8 @@ class DiffParser:
                     new_count=new_count,
                     header_context=header_context
                 )
+                old_line_no = old_start
+                new_line_no = new_start
                 i += 1
                 continue
             
@@ -236,48 +255,32 @@ class DiffParser:
             if current_hunk and line:
                 if line.startswith('+') and not line.startswith('+++'):
                     # Added line
-                    content = line[1:]  # Remove + prefix
-                    diff_line = DiffLine(
+                    current_hunk.lines.append(DiffLine(
                         line_type=LineType.ADDED,
-                        content=content,
-                        new_line_no=current_hunk.new_start + len([
-                            l for l in current_hunk.lines 
-                            if l.line_type in (LineType.ADDED, LineType.CONTEXT)
-                        ])
-                    )
-                    current_hunk.lines.append(diff_line)
+                        content=line[1:],  # Remove + prefix
+                        new_line_no=new_line_no
+                    ))
+                    new_line_no += 1
                 
                 elif line.startswith('-') and not line.startswith('---'):
                     # Removed line
-                    content = line[1:]  # Remove - prefix
-                    diff_line = DiffLine(
+                    current_hunk.lines.append(DiffLine(
                         line_type=LineType.REMOVED,
-                        content=content,
-                        old_line_no=current_hunk.old_start + len([
-                            l for l in current_hunk.lines 
-                            if l.line_type in (LineType.REMOVED, LineType.CONTEXT)
-                        ])
-                    )
-                    current_hunk.lines.append(diff_line)
+                        content=line[1:],  # Remove - prefix
+                        old_line_no=old_line_no
+                    ))
+                    old_line_no += 1
                 
                 elif line.startswith(' '):
                     # Context line (unchanged)
-                    content = line[1:]  # Remove space prefix
-                    old_line_no = current_hunk.old_start + len([
-                        l for l in current_hunk.lines 
-                        if l.line_type in (LineType.REMOVED, LineType.CONTEXT)
-                    ])
-                    new_line_no = current_hunk.new_start + len([
-                        l for l in current_hunk.lines 
-                        if l.line_type in (LineType.ADDED, LineType.CONTEXT)
-                    ])
-                    diff_line = DiffLine(
+                    current_hunk.lines.append(DiffLine(
                         line_type=LineType.CONTEXT,
-                        content=content,
+                        content=line[1:],  # Remove space prefix
                         old_line_no=old_line_no,
                         new_line_no=new_line_no
-                    )
-                    current_hunk.lines.append(diff_line)
+                    ))
+                    old_line_no += 1
+                    new_line_no += 1
             
             i += 1
         
@@ -285,9 +288,7 @@ class DiffParser:
         if current_hunk and current_file:
             current_file.hunks.append(current_hunk)
         if current_file:
-            file_diffs.append(current_file)
-        
-        return file_diffs
+            yield current_file
     
     @staticmethod
     def parse_file_patch(patch: str, filename: str) -> FileDiff:
@@ -308,9 +309,10 @@ class DiffParser:
         if not patch.startswith('---'):
             patch = f"--- a/{filename}\n+++ b/{filename}\n{patch}"
         
-        file_diffs = DiffParser.parse_diff(patch)
+        # Only the first file is needed, so stop parsing once it is complete
+        file_diff = next(DiffParser.parse_diff_iter(patch), None)
         
-        if file_diffs:
-            return file_diffs[0]
+        if file_diff is not None:
+            return file_diff
         
         return FileDiff(old_path=filename, new_path=filename)
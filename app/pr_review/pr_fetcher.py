@@ -1,6 +1,12 @@
 """Fetch pull request data from GitHub API."""
 
-from typing import List, Optional, Dict, Any
+import json
+import logging
+import math
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import List, Optional, Dict, Any, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -11,6 +17,9 @@ from github.Repository import Repository
 from config.settings import settings
 
 
+log = logging.getLogger(__name__)
+
+
 @dataclass
 class PRFile:
     """Represents a file changed in a PR."""
@@ -84,22 +93,160 @@ class PRData:
             self.reviews = []
 
 
+def _parse_github_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parse a GitHub ISO-8601 timestamp (e.g. 2024-01-31T12:00:00Z)."""
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _pr_file_from_json(data: Dict[str, Any]) -> PRFile:
+    """Build a PRFile from a REST /pulls/{n}/files entry."""
+    return PRFile(
+        filename=data["filename"],
+        status=data["status"],
+        additions=data["additions"],
+        deletions=data["deletions"],
+        changes=data["changes"],
+        patch=data.get("patch"),
+        previous_filename=data.get("previous_filename"),
+        sha=data.get("sha"),
+        blob_url=data.get("blob_url"),
+        raw_url=data.get("raw_url")
+    )
+
+
+def _pr_data_from_json(data: Dict[str, Any], repo_full_name: str, files: List[PRFile]) -> PRData:
+    """Build a PRData (without reviews) from a REST /pulls/{n} response."""
+    owner, name = repo_full_name.split('/')
+    return PRData(
+        number=data["number"],
+        title=data["title"],
+        description=data["body"] or "",
+        state=data["state"],
+        author=(data["user"] or {}).get("login", "ghost"),
+        author_association=data["author_association"],
+        base_branch=data["base"]["ref"],
+        head_branch=data["head"]["ref"],
+        base_sha=data["base"]["sha"],
+        head_sha=data["head"]["sha"],
+        repo_owner=owner,
+        repo_name=name,
+        repo_full_name=repo_full_name,
+        created_at=_parse_github_datetime(data["created_at"]),
+        updated_at=_parse_github_datetime(data["updated_at"]),
+        merged_at=_parse_github_datetime(data.get("merged_at")),
+        closed_at=_parse_github_datetime(data.get("closed_at")),
+        files=files,
+        commits_count=data["commits"],
+        changed_files_count=data["changed_files"],
+        additions=data["additions"],
+        deletions=data["deletions"],
+        labels=[label["name"] for label in data.get("labels") or []],
+        requested_reviewers=[reviewer["login"] for reviewer in data.get("requested_reviewers") or []],
+        html_url=data["html_url"],
+        diff_url=data["diff_url"],
+        patch_url=data["patch_url"]
+    )
+
+
+def _reviews_from_graphql(review_nodes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Flatten GraphQL reviews into the review/comment dicts built by _fetch_reviews."""
+    reviews = []
+    comments = []
+    for review in review_nodes:
+        reviews.append({
+            'id': review["databaseId"],
+            'user': (review["author"] or {}).get("login"),
+            'state': review["state"],
+            'body': review["body"],
+            'submitted_at': _parse_github_datetime(review["submittedAt"]),
+        })
+        for comment in review["comments"]["nodes"]:
+            comments.append({
+                'id': comment["databaseId"],
+                'user': (comment["author"] or {}).get("login"),
+                'path': comment["path"],
+                'position': comment["position"],
+                'original_position': comment["originalPosition"],
+                'line': comment["line"],
+                'original_line': comment["originalLine"],
+                'body': comment["body"],
+                'created_at': _parse_github_datetime(comment["createdAt"]),
+                'in_reply_to_id': (comment["replyTo"] or {}).get("databaseId"),
+            })
+    # Same order as the REST path: reviews first, then inline comments
+    return reviews + comments
+
+
 class PRFetcher:
     """Fetch pull request data from GitHub."""
     
-    def __init__(self, github_token: Optional[str] = None):
+    # Concurrent GitHub requests per fetch_pr call (stays well under abuse limits)
+    MAX_PARALLEL_REQUESTS = 10
+    # Page size for list endpoints (GitHub's maximum)
+    PER_PAGE = 100
+    
+    # PRs remembered for conditional (If-None-Match) re-fetches
+    ETAG_CACHE_SIZE = 128
+    
+    # PR metadata and reviews in one GraphQL round-trip (patches are REST-only)
+    PR_GRAPHQL_QUERY = """
+    query($owner: String!, $name: String!, $number: Int!, $withReviews: Boolean!) {
+      repository(owner: $owner, name: $name) {
+        pullRequest(number: $number) {
+          number title body state url authorAssociation
+          author { login }
+          baseRefName headRefName baseRefOid headRefOid
+          createdAt updatedAt mergedAt closedAt
+          commits { totalCount }
+          changedFiles additions deletions
+          labels(first: 100) { nodes { name } }
+          reviewRequests(first: 100) { nodes { requestedReviewer { ... on User { login } } } }
+          reviews(first: 100) @include(if: $withReviews) {
+            nodes {
+              databaseId state body submittedAt
+              author { login }
+              comments(first: 100) {
+                nodes {
+                  databaseId path position originalPosition line originalLine body createdAt
+                  author { login }
+                  replyTo { databaseId }
+                }
+              }
+            }
+          }
+        }
+      }
+    }
+    """
+    
+    def __init__(
+        self,
+        github_token: Optional[str] = None,
+        pool_size: Optional[int] = None,
+        graphql_reviews: Optional[bool] = None
+    ):
         """
         Initialize PR fetcher.
         
         Args:
             github_token: GitHub API token (uses settings if not provided)
+            pool_size: Keep-alive connections per host (PyGithub default if None)
+            graphql_reviews: Fetch PRs with reviews via one GraphQL query
+                (uses settings if not provided)
         """
         self.github_token = github_token or settings.github_token
+        self.graphql_reviews = settings.github_graphql_reviews if graphql_reviews is None else graphql_reviews
         
         if not self.github_token:
             raise ValueError("GitHub token required. Set GITHUB_TOKEN in .env file")
         
-        self.github = Github(self.github_token)
+        self.github = Github(self.github_token, pool_size=pool_size, per_page=self.PER_PAGE)
+        
+        # (repo_full_name, pr_number) -> (ETag, PRData without reviews)
+        self._etag_cache: Dict[Tuple[str, int], Tuple[str, PRData]] = {}
+        self._etag_lock = threading.Lock()
     
     def fetch_pr(
         self,
@@ -110,6 +257,14 @@ class PRFetcher:
         """
         Fetch complete PR data.
         
+        Without reviews, the PR resource is requested with If-None-Match:
+        a 304 Not Modified (free against the primary rate limit) returns the
+        previously fetched PRData, and a 200 body is used as the metadata,
+        so only the file pages are requested on top of it; this replaces the
+        GraphQL metadata query on that path. Reviews do not change the PR's
+        ETag, so with include_reviews the PR is always fetched in full, with
+        metadata and reviews in one GraphQL query when graphql_reviews is set.
+        
         Args:
             repo_full_name: Repository in format "owner/repo"
             pr_number: PR number
@@ -118,19 +273,89 @@ class PRFetcher:
         Returns:
             PRData object with all PR information
         """
-        repo = self.github.get_repo(repo_full_name)
+        if include_reviews:
+            return self._fetch_pr_with_reviews(repo_full_name, pr_number)
+        
+        key = (repo_full_name, pr_number)
+        with self._etag_lock:
+            cached = self._etag_cache.get(key)
+        
+        requester = self.github.requester
+        status, headers, body = requester.requestJson(
+            "GET",
+            f"/repos/{repo_full_name}/pulls/{pr_number}",
+            headers={"If-None-Match": cached[0]} if cached else None
+        )
+        if status == 304 and cached:
+            return cached[1]
+        
+        data = json.loads(body) if body else None
+        if status >= 400:
+            raise requester.createException(status, headers, data)
+        
+        pr_data = _pr_data_from_json(
+            data, repo_full_name, self._fetch_file_pages(repo_full_name, pr_number, data["changed_files"])
+        )
+        
+        etag = headers.get("etag")
+        if etag:
+            with self._etag_lock:
+                self._etag_cache.pop(key, None)
+                if len(self._etag_cache) >= self.ETAG_CACHE_SIZE:
+                    # Evict the oldest entry (dicts keep insertion order)
+                    self._etag_cache.pop(next(iter(self._etag_cache)))
+                self._etag_cache[key] = (etag, pr_data)
+        
+        return pr_data
+    
+    def _fetch_pr_with_reviews(self, repo_full_name: str, pr_number: int) -> PRData:
+        """Fetch PR data and reviews via GraphQL (falling back to REST) or REST."""
+        if self.graphql_reviews:
+            try:
+                return self.fetch_pr_graphql(repo_full_name, pr_number, include_reviews=True)
+            except Exception as e:
+                log.warning("⚠️  GraphQL PR fetch failed (%s), falling back to REST", e)
+        return self._fetch_pr_rest(repo_full_name, pr_number, include_reviews=True)
+    
+    def _fetch_files_page(self, repo_full_name: str, pr_number: int, page: int) -> List[Dict[str, Any]]:
+        """Fetch one (0-based) page of the REST files endpoint as raw JSON."""
+        _, data = self.github.requester.requestJsonAndCheck(
+            "GET",
+            f"/repos/{repo_full_name}/pulls/{pr_number}/files",
+            parameters={"per_page": self.PER_PAGE, "page": page + 1}
+        )
+        return data
+    
+    def _fetch_file_pages(self, repo_full_name: str, pr_number: int, changed_files: int) -> List[PRFile]:
+        """Fetch every page of the REST files endpoint, in parallel when there are several."""
+        fetch_page = partial(self._fetch_files_page, repo_full_name, pr_number)
+        pages = max(1, math.ceil(changed_files / self.PER_PAGE))
+        if pages == 1:
+            raw_files = fetch_page(0)
+        else:
+            with ThreadPoolExecutor(max_workers=min(pages, self.MAX_PARALLEL_REQUESTS)) as pool:
+                raw_files = [f for page in pool.map(fetch_page, range(pages)) for f in page]
+        return [_pr_file_from_json(f) for f in raw_files]
+    
+    def _fetch_pr_rest(
+        self,
+        repo_full_name: str,
+        pr_number: int,
+        include_reviews: bool = False
+    ) -> PRData:
+        """Fetch complete PR data through the REST API."""
+        # Lazy repo: get_pull only needs the name, saving a round-trip
+        repo = self.github.get_repo(repo_full_name, lazy=True)
         pr = repo.get_pull(pr_number)
         
         # Extract repo owner and name
         owner, name = repo_full_name.split('/')
         
-        # Fetch files
-        files = self._fetch_files(pr)
-        
-        # Fetch reviews if requested
-        reviews = []
-        if include_reviews:
-            reviews = self._fetch_reviews(pr)
+        # Files (page by page) and reviews are independent requests; run them in parallel
+        with ThreadPoolExecutor(max_workers=self.MAX_PARALLEL_REQUESTS) as pool:
+            reviews_future = pool.submit(self._fetch_reviews, pr) if include_reviews else None
+            files = self._fetch_files(pr, pool)
+            reviews = reviews_future.result() if reviews_future else []
         
         # Build PRData
         pr_data = PRData(
@@ -166,11 +391,99 @@ class PRFetcher:
         
         return pr_data
     
-    def _fetch_files(self, pr: PullRequest) -> List[PRFile]:
-        """Fetch all changed files in the PR."""
+    def fetch_pr_graphql(
+        self,
+        repo_full_name: str,
+        pr_number: int,
+        include_reviews: bool = False
+    ) -> PRData:
+        """
+        Fetch complete PR data with one GraphQL query plus REST file pages.
+        
+        Metadata, labels, reviewers and reviews come from a single GraphQL
+        request (one rate-limit point). GraphQL does not expose patches, so
+        files still come from the REST files endpoint; the first page is
+        requested alongside the query and the rest in parallel once the
+        file count is known.
+        
+        Args:
+            repo_full_name: Repository in format "owner/repo"
+            pr_number: PR number
+            include_reviews: Whether to fetch review comments
+        
+        Returns:
+            PRData object with all PR information
+        """
+        owner, name = repo_full_name.split('/')
+        requester = self.github.requester
+        fetch_files_page = partial(self._fetch_files_page, repo_full_name, pr_number)
+        
+        with ThreadPoolExecutor(max_workers=self.MAX_PARALLEL_REQUESTS) as pool:
+            first_page = pool.submit(fetch_files_page, 0)
+            _, data = requester.graphql_query(
+                self.PR_GRAPHQL_QUERY,
+                {"owner": owner, "name": name, "number": pr_number, "withReviews": include_reviews}
+            )
+            pr = data["data"]["repository"]["pullRequest"]
+            
+            pages = max(1, math.ceil(pr["changedFiles"] / self.PER_PAGE))
+            raw_files = first_page.result()
+            for page in pool.map(fetch_files_page, range(1, pages)):
+                raw_files.extend(page)
+        
+        url = pr["url"]
+        return PRData(
+            number=pr["number"],
+            title=pr["title"],
+            description=pr["body"] or "",
+            state="open" if pr["state"] == "OPEN" else "closed",  # REST reports merged PRs as closed
+            author=(pr["author"] or {}).get("login", "ghost"),
+            author_association=pr["authorAssociation"],
+            base_branch=pr["baseRefName"],
+            head_branch=pr["headRefName"],
+            base_sha=pr["baseRefOid"],
+            head_sha=pr["headRefOid"],
+            repo_owner=owner,
+            repo_name=name,
+            repo_full_name=repo_full_name,
+            created_at=_parse_github_datetime(pr["createdAt"]),
+            updated_at=_parse_github_datetime(pr["updatedAt"]),
+            merged_at=_parse_github_datetime(pr["mergedAt"]),
+            closed_at=_parse_github_datetime(pr["closedAt"]),
+            files=[_pr_file_from_json(f) for f in raw_files],
+            commits_count=pr["commits"]["totalCount"],
+            changed_files_count=pr["changedFiles"],
+            additions=pr["additions"],
+            deletions=pr["deletions"],
+            labels=[label["name"] for label in pr["labels"]["nodes"]],
+            requested_reviewers=[
+                node["requestedReviewer"]["login"]
+                for node in pr["reviewRequests"]["nodes"]
+                if node["requestedReviewer"] and "login" in node["requestedReviewer"]
+            ],
+            reviews=_reviews_from_graphql(pr["reviews"]["nodes"]) if include_reviews else [],
+            html_url=url,
+            diff_url=f"{url}.diff",
+            patch_url=f"{url}.patch"
+        )
+    
+    def _fetch_files(self, pr: PullRequest, pool: Optional[Executor] = None) -> List[PRFile]:
+        """
+        Fetch all changed files in the PR.
+        
+        The page count is known from pr.changed_files, so with a pool every
+        page is requested at once instead of following next-page links.
+        """
         files = []
         
-        for file in pr.get_files():
+        paginated = pr.get_files()
+        pages = max(1, math.ceil(pr.changed_files / self.PER_PAGE))
+        if pool is None or pages == 1:
+            raw_files = paginated
+        else:
+            raw_files = [file for page in pool.map(paginated.get_page, range(pages)) for file in page]
+        
+        for file in raw_files:
             pr_file = PRFile(
                 filename=file.filename,
                 status=file.status,
@@ -273,6 +586,20 @@ class PRFetcher:
         
         return response.text
     
+    def fetch_branch_head_sha(self, repo_full_name: str, branch: str = "main") -> str:
+        """
+        Fetch the commit SHA at the tip of a branch.
+        
+        Args:
+            repo_full_name: Repository in format "owner/repo"
+            branch: Branch name
+        
+        Returns:
+            Head commit SHA
+        """
+        repo = self.github.get_repo(repo_full_name, lazy=True)
+        return repo.get_branch(branch).commit.sha
+    
     def close(self):
         """Close the GitHub client."""
         self.github.close()
@@ -1,6 +1,6 @@
 """Build review units from parsed diffs for granular code review."""
 
-from typing import List, Optional, Set
+from typing import Any, Dict, Iterable, List, Optional, Set
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -113,6 +113,34 @@ class ReviewUnit:
         return "\n".join(lines)
 
 
+def review_units_to_hunks(review_units: Iterable[ReviewUnit]) -> List[Dict[str, Any]]:
+    """
+    Convert review units into the hunk dicts consumed by the workflow.
+    
+    Line lists are passed by reference, not copied.
+    
+    Args:
+        review_units: Review units from a PRReviewSession
+    
+    Returns:
+        List of workflow hunk dicts
+    """
+    return [
+        {
+            "hunk_id": f"{context.file_path}:{context.new_line_start or 0}",
+            "file_path": context.file_path,
+            "old_line_start": context.old_line_start or 0,
+            "old_line_end": context.old_line_end or 0,
+            "new_line_start": context.new_line_start or 0,
+            "new_line_end": context.new_line_end or 0,
+            "added_lines": context.added_lines,
+            "removed_lines": context.removed_lines,
+            "context_lines": context.context_lines
+        }
+        for context in (unit.context for unit in review_units)
+    ]
+
+
 class ReviewUnitBuilder:
     """Build review units from PR data and parsed diffs."""
     
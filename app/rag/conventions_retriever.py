@@ -77,7 +77,7 @@ class ConventionsRetriever:
             end_line = start_line
             
             # Generate snippet ID
-            snippet_hash = hashlib.md5(rule_text.encode()).hexdigest()[:8]
+            snippet_hash = hashlib.blake2b(rule_text.encode(), digest_size=4).hexdigest()
             snippet_id = f"convention_{category_str}_{snippet_hash}"
             
             # Format content with category prefix
@@ -119,7 +119,7 @@ class LocalContextRetriever:
         snippet_content = "\n".join(snippet_lines)
         
         # Generate snippet ID
-        snippet_hash = hashlib.md5(snippet_content.encode()).hexdigest()[:8]
+        snippet_hash = hashlib.blake2b(snippet_content.encode(), digest_size=4).hexdigest()
         snippet_id = f"local_{file_path.replace('/', '_')}_{start_line}_{snippet_hash}"
         
         evidence = Evidence(
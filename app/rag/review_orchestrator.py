@@ -8,6 +8,7 @@ from langchain_ollama import ChatOllama
 from langchain_core.messages import HumanMessage, SystemMessage
 from langgraph.graph import StateGraph, END
 
+from config.connections import ollama_client_kwargs
 from config.settings import settings
 from .evidence import Evidence, CitedClaim, EvidenceType
 from .local_context_retriever import LocalContextRetriever
@@ -102,7 +103,7 @@ class ReviewOrchestrator:
         
         # Initialize Ollama LLM
         self.llm = ChatOllama(
-            base_url=settings.ollama_base_url,
+            **ollama_client_kwargs(settings.ollama_base_url),
             model=settings.ollama_model,
             temperature=settings.ollama_temperature,
         )
@@ -85,7 +85,7 @@ class SimilarCodeRetriever:
             similarity_score = result.get("similarity", 0.0)
             
             # Generate snippet ID from chunk_id
-            snippet_hash = hashlib.md5(chunk_id.encode()).hexdigest()[:8]
+            snippet_hash = hashlib.blake2b(chunk_id.encode(), digest_size=4).hexdigest()
             snippet_id = f"similar_{snippet_hash}"
             
             evidence = Evidence(
@@ -17,6 +17,7 @@ from qdrant_client.models import (
 
 from app.ingest.embedder import EmbeddingResult
 from app.ingest.embedding_manager import EmbeddingMetadata
+from config.connections import qdrant_client_kwargs
 from config.settings import settings
 
 
@@ -52,10 +53,8 @@ class QdrantVectorStore:
         
         # Initialize Qdrant client
         self.client = QdrantClient(
-            url=self.url,
-            api_key=self.api_key,
-            timeout=60,
-            prefer_grpc=False  # Use REST API for better compatibility
+            **qdrant_client_kwargs(self.url, self.api_key, prefer_grpc=False),  # REST API for better compatibility
+            timeout=60
         )
         
         # Initialize collection
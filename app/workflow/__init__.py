@@ -12,9 +12,16 @@ from .state import (
     HITLAction,
     RetrievalBundle,
 )
-from .graph import create_review_workflow, run_workflow
-from .retriever_agent import RetrieverAgent
-from .reviewer_agent import ReviewerAgent
+from .graph import (
+    CHECKPOINT_DURABILITY,
+    create_review_workflow,
+    create_review_workflow_async,
+    get_default_workflow,
+    run_workflow,
+    run_workflow_async,
+)
+from .retriever_agent import RetrieverAgent, AsyncRetrieverAgent
+from .reviewer_agent import ReviewerAgent, AsyncReviewerAgent
 from .planner_agent import PatchPlannerAgent
 from .guardrail_agent import GuardrailAgent
 from .hitl_gate import HITLGate
@@ -35,11 +42,17 @@ __all__ = [
     "EffortEstimate",
     "HITLAction",
     # Workflow
+    "CHECKPOINT_DURABILITY",
     "create_review_workflow",
+    "create_review_workflow_async",
+    "get_default_workflow",
     "run_workflow",
+    "run_workflow_async",
     # Agents (for advanced usage)
     "RetrieverAgent",
+    "AsyncRetrieverAgent",
     "ReviewerAgent",
+    "AsyncReviewerAgent",
     "PatchPlannerAgent",
     "GuardrailAgent",
     "HITLGate",
@@ -1,18 +1,26 @@
 """LangGraph workflow assembly with control flow."""
 
+from functools import lru_cache
 from typing import Dict, Any, Optional
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import MemorySaver
 
 from .state import WorkflowState, HITLAction
-from .retriever_agent import RetrieverAgent
-from .reviewer_agent import ReviewerAgent
+from .retriever_agent import RetrieverAgent, AsyncRetrieverAgent
+from .reviewer_agent import ReviewerAgent, AsyncReviewerAgent
 from .planner_agent import PatchPlannerAgent
 from .guardrail_agent import GuardrailAgent
 from .hitl_gate import HITLGate
 from .publisher_notifier import PublisherNotifier
 from .persistence_agent import PersistenceAgent
-from config.settings import Settings
+from config.settings import Settings, get_settings
+
+
+# Checkpoint only when a run stops (finishes or pauses at the HITL interrupt).
+# The MemorySaver is in-process, so per-node checkpoints could never be
+# recovered after a crash anyway; skipping them avoids re-serializing the
+# full state (hunks, retrieval bundles) after every node.
+CHECKPOINT_DURABILITY = "exit"
 
 
 def should_proceed_to_hitl(state: WorkflowState) -> str:
@@ -53,33 +61,21 @@ def should_publish(state: WorkflowState) -> str:
         return "persistence_reject"
 
 
-def create_review_workflow(
-    github_token: Optional[str] = None,
-    settings: Optional[Settings] = None
+def _build_workflow(
+    retriever: RetrieverAgent,
+    reviewer: ReviewerAgent,
+    planner: PatchPlannerAgent,
+    guardrail: GuardrailAgent,
+    hitl: HITLGate,
+    publisher: PublisherNotifier,
+    persistence: PersistenceAgent
 ) -> StateGraph:
     """
-    Create the LangGraph workflow for PR review.
-    
-    Args:
-        github_token: GitHub API token for posting comments
-        settings: Application settings (includes Slack config for Phase 6)
+    Wire agents into the review graph and compile it.
     
     Returns:
         Compiled StateGraph
     """
-    # Load settings if not provided
-    if settings is None:
-        settings = Settings()
-    
-    # Initialize agents (pass settings to publisher for Slack integration)
-    retriever = RetrieverAgent()
-    reviewer = ReviewerAgent()
-    planner = PatchPlannerAgent()
-    guardrail = GuardrailAgent()
-    hitl = HITLGate(auto_approve=False)  # Wait for web UI decision
-    publisher = PublisherNotifier(github_token=github_token, settings=settings)
-    persistence = PersistenceAgent()
-    
     # Create workflow graph
     workflow = StateGraph(WorkflowState)
     
@@ -139,6 +135,103 @@ def create_review_workflow(
     return app
 
 
+def create_review_workflow(
+    github_token: Optional[str] = None,
+    settings: Optional[Settings] = None
+) -> StateGraph:
+    """
+    Create the LangGraph workflow for PR review.
+    
+    Args:
+        github_token: GitHub API token for posting comments
+        settings: Application settings (includes Slack config for Phase 6)
+    
+    Returns:
+        Compiled StateGraph
+    """
+    # Load settings if not provided
+    if settings is None:
+        settings = get_settings()
+    
+    # Initialize agents (pass settings to publisher for Slack integration)
+    persistence = PersistenceAgent()
+    
+    return _build_workflow(
+        retriever=RetrieverAgent(),
+        reviewer=ReviewerAgent(issue_sink=persistence),  # Streams issues to JSONL as they are found
+        planner=PatchPlannerAgent(),
+        guardrail=GuardrailAgent(),
+        hitl=HITLGate(auto_approve=False),  # Wait for web UI decision
+        publisher=PublisherNotifier(github_token=github_token, settings=settings),
+        persistence=persistence
+    )
+
+
+def create_review_workflow_async(
+    github_token: Optional[str] = None,
+    settings: Optional[Settings] = None
+) -> StateGraph:
+    """
+    Create the PR review workflow with async retriever and reviewer nodes.
+    
+    The I/O-bound nodes are coroutines (the reviewer awaits the LLM's async
+    client), so the graph is meant to be driven with run_workflow_async /
+    ainvoke from an event loop such as FastAPI's without blocking it.
+    
+    Args:
+        github_token: GitHub API token for posting comments
+        settings: Application settings (includes Slack config for Phase 6)
+    
+    Returns:
+        Compiled StateGraph
+    """
+    # Load settings if not provided
+    if settings is None:
+        settings = get_settings()
+    
+    persistence = PersistenceAgent()
+    
+    return _build_workflow(
+        retriever=AsyncRetrieverAgent(),
+        reviewer=AsyncReviewerAgent(
+            issue_sink=persistence,
+            hunk_concurrency=settings.review_hunk_concurrency
+        ),
+        planner=PatchPlannerAgent(),
+        guardrail=GuardrailAgent(),
+        hitl=HITLGate(auto_approve=False),  # Wait for web UI decision
+        publisher=PublisherNotifier(github_token=github_token, settings=settings),
+        persistence=persistence
+    )
+
+
+@lru_cache(maxsize=4)
+def get_default_workflow(
+    github_token: Optional[str] = None,
+    use_async: bool = False
+) -> StateGraph:
+    """
+    Return a shared compiled workflow, building it on first use.
+    
+    Compile once and invoke many times: each run is isolated by its
+    run_id (the checkpoint thread_id), so one compiled graph and its
+    MemorySaver can serve every PR in a batch. The MemorySaver lives as
+    long as the process: run_workflow drops a run's checkpoint once it
+    completes, and a run left paused at HITL must be released with
+    ``workflow.checkpointer.delete_thread(run_id)``.
+    
+    Args:
+        github_token: GitHub API token for posting comments
+        use_async: Use the async retriever/reviewer nodes
+    
+    Returns:
+        Compiled StateGraph
+    """
+    if use_async:
+        return create_review_workflow_async(github_token=github_token)
+    return create_review_workflow(github_token=github_token)
+
+
 def run_workflow(
     initial_state: WorkflowState,
     workflow: Optional[StateGraph] = None
@@ -148,13 +241,13 @@ def run_workflow(
     
     Args:
         initial_state: Initial workflow state
-        workflow: Pre-compiled workflow (creates new if None)
+        workflow: Pre-compiled workflow (uses the shared default if None)
         
     Returns:
         Final state dictionary
     """
     if workflow is None:
-        workflow = create_review_workflow()
+        workflow = get_default_workflow()
     
     # Create config for checkpointing
     config = {"configurable": {"thread_id": initial_state.run_id}}
@@ -168,7 +261,7 @@ def run_workflow(
     
     try:
         # Stream events for visibility
-        for event in workflow.stream(initial_state.model_dump(), config):
+        for event in workflow.stream(initial_state, config, durability=CHECKPOINT_DURABILITY):
             # Each event is a dict with node name as key
             for node_name, node_output in event.items():
                 if node_name != "__end__":
@@ -177,6 +270,9 @@ def run_workflow(
         
         # Get final state
         final_state = workflow.get_state(config)
+        if not final_state.next:
+            # Completed (not paused at HITL): nothing left to resume
+            workflow.checkpointer.delete_thread(initial_state.run_id)
         
         print(f"\n{'='*80}")
         print(f"✅ Workflow Complete - Run ID: {initial_state.run_id}")
@@ -190,3 +286,56 @@ def run_workflow(
         print(f"Error: {e}")
         print(f"{'='*80}\n")
         raise
+
+
+async def run_workflow_async(
+    initial_state: WorkflowState,
+    workflow: Optional[StateGraph] = None
+) -> Dict[str, Any]:
+    """
+    Run the workflow with initial state without blocking the event loop.
+
+    Async counterpart of run_workflow. Coroutine nodes (see
+    create_review_workflow_async) are awaited directly and sync nodes run
+    in worker threads, so several runs can be awaited concurrently, e.g.
+    with asyncio.gather.
+
+    Args:
+        initial_state: Initial workflow state
+        workflow: Pre-compiled workflow (uses the shared async default if None)
+
+    Returns:
+        Final state dictionary
+    """
+    if workflow is None:
+        workflow = get_default_workflow(use_async=True)
+
+    # Create config for checkpointing
+    config = {"configurable": {"thread_id": initial_state.run_id}}
+
+    print(f"\n{'='*80}")
+    print(f"🚀 Starting Workflow - Run ID: {initial_state.run_id}")
+    print(f"{'='*80}\n")
+
+    try:
+        async for _ in workflow.astream(initial_state, config, durability=CHECKPOINT_DURABILITY):
+            pass
+
+        # Get final state
+        final_state = await workflow.aget_state(config)
+        if not final_state.next:
+            # Completed (not paused at HITL): nothing left to resume
+            await workflow.checkpointer.adelete_thread(initial_state.run_id)
+
+        print(f"\n{'='*80}")
+        print(f"✅ Workflow Complete - Run ID: {initial_state.run_id}")
+        print(f"{'='*80}\n")
+
+        return final_state.values if final_state else {}
+
+    except Exception as e:
+        print(f"\n{'='*80}")
+        print(f"❌ Workflow Failed - Run ID: {initial_state.run_id}")
+        print(f"Error: {e}")
+        print(f"{'='*80}\n")
+        raise
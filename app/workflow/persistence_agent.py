@@ -1,56 +1,227 @@
 """Node 7: Persistence - Save workflow state and results."""
 
-import json
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple, Union
 from pathlib import Path
 from datetime import datetime
 
-from .state import WorkflowState
+import orjson
+import ormsgpack
+
+from .state import WorkflowState, ReviewIssue
+
+
+# Supported on-disk formats and their file extensions
+SERIALIZATION_FORMATS = {
+    "json": ".json",
+    "msgpack": ".msgpack",
+}
+
+# Save modes: "full" stores everything, "results_only" drops fields that can
+# be rebuilt on load (hunks from the PR, retrieval bundles by re-running retrieval)
+SAVE_MODES = ("full", "results_only")
+REHYDRATABLE_FIELDS = {"hunks", "retrieval_bundles"}
+
+
+class IssueStreamWriter:
+    """
+    Append-only JSONL writer for review issues.
+    
+    Each issue is written as one line as soon as the reviewer produces it,
+    so serialization overlaps with LLM inference instead of happening in one
+    burst at the end of the run. close() appends a metadata footer line.
+    """
+    
+    def __init__(self, filepath: Path):
+        """
+        Open the issue stream.
+        
+        Args:
+            filepath: Path to the .jsonl file
+        """
+        self.filepath = filepath
+        self.count = 0
+        self._file = open(filepath, 'ab')
+    
+    def write_issue(self, issue: ReviewIssue) -> None:
+        """Append one issue and flush it to disk."""
+        self._file.write(orjson.dumps(issue.model_dump(mode='python'), default=str) + b"\n")
+        self._file.flush()
+        self.count += 1
+    
+    def close(self, **metadata: Any) -> None:
+        """Write the footer record and close the file."""
+        if self._file.closed:
+            return
+        
+        footer = {
+            'issue_count': self.count,
+            'finished_at': datetime.now().isoformat(),
+            'version': '1.0',
+            **metadata,
+        }
+        self._file.write(orjson.dumps({'_footer': footer}, default=str) + b"\n")
+        self._file.close()
+    
+    def __enter__(self) -> "IssueStreamWriter":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close(complete=exc_type is None)
 
 
 class PersistenceAgent:
     """Agent responsible for persisting workflow state and results."""
     
-    def __init__(self, storage_dir: str = "./workflow_runs"):
+    def __init__(self, storage_dir: str = "./workflow_runs", serialization_format: str = "json"):
         """
         Initialize persistence agent.
         
         Args:
             storage_dir: Directory to store workflow runs
+            serialization_format: "json" (orjson, human-readable) or "msgpack" (binary)
         """
+        if serialization_format not in SERIALIZATION_FORMATS:
+            raise ValueError(
+                f"Unknown serialization format: {serialization_format}. "
+                f"Expected one of: {', '.join(SERIALIZATION_FORMATS)}"
+            )
+        
         self.storage_dir = Path(storage_dir)
         self.storage_dir.mkdir(parents=True, exist_ok=True)
+        self.serialization_format = serialization_format
     
-    def save_workflow_state(self, state: WorkflowState) -> str:
+    def save_workflow_state(self, state: WorkflowState, mode: str = "full") -> str:
         """
-        Save complete workflow state to disk.
+        Save workflow state to disk.
         
         Args:
             state: Workflow state to save
+            mode: "full" or "results_only" (skips hunks and retrieval bundles)
             
         Returns:
             Path to saved file
         """
+        if mode not in SAVE_MODES:
+            raise ValueError(f"Unknown save mode: {mode}. Expected one of: {', '.join(SAVE_MODES)}")
+        
         # Create filename
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{state.run_id}_{timestamp}.json"
+        extension = SERIALIZATION_FORMATS[self.serialization_format]
+        filename = f"{state.run_id}_{timestamp}{extension}"
         filepath = self.storage_dir / filename
         
-        # Convert state to dict
-        state_dict = state.model_dump(mode='json')
+        # Convert state to dict (datetimes and enums are encoded natively by orjson/ormsgpack)
+        exclude = REHYDRATABLE_FIELDS if mode == "results_only" else None
+        state_dict = state.model_dump(mode='python', exclude=exclude)
         
         # Add metadata
         state_dict['_metadata'] = {
             'saved_at': datetime.now().isoformat(),
             'version': '1.0',
+            'mode': mode,
         }
         
         # Save to file
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(state_dict, f, indent=2, default=str)
+        if self.serialization_format == "msgpack":
+            data = ormsgpack.packb(state_dict, default=str)
+        else:
+            data = orjson.dumps(state_dict, default=str, option=orjson.OPT_INDENT_2)
+        
+        filepath.write_bytes(data)
         
         return str(filepath)
     
+    @staticmethod
+    def load_workflow_state(
+        path: Union[str, Path],
+        rehydrate: bool = True,
+        github_token: Optional[str] = None
+    ) -> WorkflowState:
+        """
+        Load a workflow state saved by save_workflow_state.
+        
+        States saved with mode="results_only" have their hunks re-fetched
+        from the PR when rehydrate is True; retrieval bundles stay empty.
+        
+        Args:
+            path: Path to a .json or .msgpack state file
+            rehydrate: Re-fetch hunks for results-only states
+            github_token: GitHub token used for rehydration
+            
+        Returns:
+            Validated WorkflowState
+        """
+        path = Path(path)
+        data = path.read_bytes()
+        
+        if path.suffix == SERIALIZATION_FORMATS["msgpack"]:
+            state_dict = ormsgpack.unpackb(data)
+        else:
+            state_dict = orjson.loads(data)
+        
+        metadata = state_dict.pop('_metadata', None) or {}
+        
+        if rehydrate and metadata.get('mode') == "results_only":
+            state_dict['hunks'] = PersistenceAgent._rehydrate_hunks(state_dict, github_token)
+        
+        return WorkflowState.model_validate(state_dict)
+    
+    @staticmethod
+    def _rehydrate_hunks(state_dict: Dict[str, Any], github_token: Optional[str]) -> List[Dict[str, Any]]:
+        """Rebuild hunks for a results-only state by re-fetching the PR."""
+        from app.pr_review import quick_prepare_review, review_units_to_hunks
+        
+        session = quick_prepare_review(
+            repo_full_name=f"{state_dict['repo_owner']}/{state_dict['repo_name']}",
+            pr_number=state_dict['pr_number'],
+            github_token=github_token
+        )
+        
+        if session.pr_data.head_sha != state_dict['pr_sha']:
+            raise ValueError(
+                f"PR #{state_dict['pr_number']} head moved from {state_dict['pr_sha']} "
+                f"to {session.pr_data.head_sha}; cannot rehydrate hunks"
+            )
+        
+        return review_units_to_hunks(session.review_units)
+    
+    def open_issue_stream(self, run_id: str) -> IssueStreamWriter:
+        """
+        Open a JSONL stream that issues are appended to while reviewing.
+        
+        Args:
+            run_id: Workflow run ID (used as the file name)
+            
+        Returns:
+            IssueStreamWriter for the run
+        """
+        return IssueStreamWriter(self.storage_dir / f"{run_id}_issues.jsonl")
+    
+    @staticmethod
+    def load_issue_stream(path: Union[str, Path]) -> Tuple[List[ReviewIssue], Dict[str, Any]]:
+        """
+        Load issues written by an IssueStreamWriter.
+        
+        Args:
+            path: Path to the .jsonl file
+            
+        Returns:
+            Tuple of (issues, footer). The footer is empty if the run did not finish.
+        """
+        issues = []
+        footer = {}
+        
+        with open(path, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                if line.startswith(b'{"_footer"'):
+                    footer = orjson.loads(line)['_footer']
+                    continue
+                issues.append(ReviewIssue.model_validate_json(line))
+        
+        return issues, footer
+    
     def save_summary(self, state: WorkflowState) -> str:
         """
         Save a human-readable summary.
@@ -6,6 +6,8 @@ from collections import defaultdict
 from langchain_ollama import ChatOllama
 from langchain_core.prompts import ChatPromptTemplate
 
+from config.connections import ollama_client_kwargs
+from config.settings import settings
 from .state import WorkflowState, ReviewIssue, FixTask, EffortEstimate
 
 
@@ -61,7 +63,7 @@ class PatchPlannerAgent:
         """
         self.llm = ChatOllama(
             model=model_name,
-            base_url="http://localhost:11434",
+            **ollama_client_kwargs(settings.ollama_base_url),
             temperature=0.2,
             num_predict=2048,
         )
@@ -4,7 +4,7 @@ from typing import Dict, Any, Optional, TYPE_CHECKING
 from datetime import datetime
 
 from .state import WorkflowState, HITLAction
-from config.settings import Settings
+from config.settings import Settings, get_settings
 
 if TYPE_CHECKING:
     from app.notifications import SlackNotifier
@@ -22,7 +22,7 @@ class PublisherNotifier:
             settings: Application settings (for Slack config)
         """
         self.github_token = github_token
-        self.settings = settings or Settings()
+        self.settings = settings or get_settings()
         
         # Initialize Slack notifier if configured (lazy import to avoid circular dependency)
         self.slack_notifier = None
@@ -1,15 +1,77 @@
 """Node 1: Retriever Agent - Retrieve relevant context for each hunk."""
 
-from typing import Dict, Any, List
+import asyncio
+import hashlib
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+import ormsgpack
 
 from .state import WorkflowState, RetrievalBundle
 
 
+class RetrievalCache:
+    """
+    On-disk cache of retrieval bundles, grouped per repo.
+    
+    Entries are keyed by the index SHA (the main HEAD the vector store was
+    built from), hunk_id and query text, so a re-run of the same PR (or a
+    new PR repeating a hunk) skips the vector search until the repo is
+    re-ingested at a new HEAD. Entries live under {cache_dir}/{repo_id}/
+    and are dropped together with the repo's embeddings by CleanupManager.
+    """
+    
+    def __init__(self, cache_dir: str = "retrieval_cache"):
+        """
+        Initialize retrieval cache.
+        
+        Args:
+            cache_dir: Directory to store cached bundles
+        """
+        self.cache_dir = Path(cache_dir)
+    
+    def _get_cache_path(self, repo_id: str, index_sha: str, hunk_id: str, query_text: str) -> Path:
+        """Get the cache file path for a hunk query."""
+        key = hashlib.blake2b(f"{index_sha}\0{hunk_id}\0{query_text}".encode(), digest_size=16).hexdigest()
+        return self.cache_dir / repo_id / f"{key}.msgpack"
+    
+    def get(self, repo_id: str, index_sha: str, hunk_id: str, query_text: str) -> Optional[RetrievalBundle]:
+        """Return the cached bundle for a hunk query, if any."""
+        cache_path = self._get_cache_path(repo_id, index_sha, hunk_id, query_text)
+        try:
+            return RetrievalBundle.model_validate(ormsgpack.unpackb(cache_path.read_bytes()))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"  ⚠ Ignoring unreadable retrieval cache entry {cache_path.name}: {e}")
+            return None
+    
+    def has(self, repo_id: str, index_sha: str, hunk_id: str, query_text: str) -> bool:
+        """Check whether a bundle is cached for a hunk query."""
+        return self._get_cache_path(repo_id, index_sha, hunk_id, query_text).exists()
+    
+    def put(self, repo_id: str, index_sha: str, hunk_id: str, query_text: str, bundle: RetrievalBundle) -> None:
+        """Store a bundle for a hunk query."""
+        cache_path = self._get_cache_path(repo_id, index_sha, hunk_id, query_text)
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            cache_path.write_bytes(ormsgpack.packb(bundle.model_dump(mode='python')))
+        except Exception as e:
+            print(f"  ⚠ Could not cache retrieval bundle for {hunk_id}: {e}")
+
+
 class RetrieverAgent:
     """Agent responsible for retrieving relevant context for code review."""
     
-    def __init__(self):
-        """Initialize retriever agent."""
+    def __init__(self, cache_dir: Optional[str] = "retrieval_cache"):
+        """
+        Initialize retriever agent.
+        
+        Args:
+            cache_dir: Directory for cached retrieval bundles (None disables caching)
+        """
+        self.cache = RetrievalCache(cache_dir) if cache_dir else None
+        
         # Simplified initialization - full RAG integration in future
         # For now, works without vector store (empty retrievals)
         self.vector_store = None
@@ -22,33 +84,92 @@ class RetrieverAgent:
             print(f"  ⚠ Vector store not available: {e}")
             print("  ⚠ Retriever will return empty contexts")
     
+    @staticmethod
+    def _hunk_query(hunk: Dict[str, Any]) -> Tuple[str, str]:
+        """Return (hunk_id, query_text) for a hunk."""
+        file_path = hunk.get("file_path", "")
+        hunk_id = hunk.get("hunk_id", f"{file_path}:{hunk.get('new_line_start', 0)}")
+        
+        # Combine the code change for querying: focus on added + some removed
+        added_lines = hunk.get("added_lines", [])
+        removed_lines = hunk.get("removed_lines", [])
+        return hunk_id, "\n".join(added_lines + removed_lines[:3])
+    
+    def embed_queries(
+        self,
+        hunks: List[Dict[str, Any]],
+        repo_id: str,
+        index_sha: Optional[str] = None
+    ) -> Dict[str, List[float]]:
+        """
+        Embed the queries of all hunks that need a vector search in one batch.
+        
+        Hunks with a cached bundle (or an empty query) are skipped, so only
+        real misses reach the embedding model.
+        
+        Args:
+            hunks: Hunk dictionaries of the PR
+            repo_id: Repository identifier (namespaces the bundle cache)
+            index_sha: main HEAD the vector index was built from (None disables the cache)
+            
+        Returns:
+            Query embedding by query text (empty if retrieval is unavailable)
+        """
+        if not self.vector_store:
+            return {}
+        
+        pending = []
+        for hunk in hunks:
+            hunk_id, query_text = self._hunk_query(hunk)
+            if not query_text.strip():
+                continue
+            if self.cache and index_sha and self.cache.has(repo_id, index_sha, hunk_id, query_text):
+                continue
+            pending.append(query_text)
+        
+        if not pending:
+            return {}
+        try:
+            results = self.embedder.embed_texts(pending)
+        except Exception as e:
+            # Each hunk falls back to embedding its own query
+            print(f"  ⚠ Batch query embedding failed: {e}")
+            return {}
+        return {query_text: result.embedding for query_text, result in zip(pending, results)}
+    
     def retrieve_for_hunk(
         self,
         hunk: Dict[str, Any],
         repo_id: str,
-        style_guide_chunks: List[Dict[str, Any]] = None
+        style_guide_chunks: List[Dict[str, Any]] = None,
+        query_embeddings: Optional[Dict[str, List[float]]] = None,
+        index_sha: Optional[str] = None,
+        vector_repo: Optional[str] = None
     ) -> RetrievalBundle:
         """
         Retrieve context for a single hunk.
         
         Args:
             hunk: Hunk dictionary with file_path, added_lines, removed_lines, etc.
-            repo_id: Repository identifier for vector search
+            repo_id: Repository identifier (namespaces the bundle cache)
             style_guide_chunks: Optional pre-loaded style guide chunks
+            query_embeddings: Query embeddings precomputed by embed_queries
+            index_sha: main HEAD the vector index was built from; bundles are
+                only cached when it is known, so a re-ingest never serves stale ones
+            vector_repo: Value of the points' 'repo' payload (owner/name) to
+                search in; defaults to repo_id
             
         Returns:
             RetrievalBundle with local, similar, and convention context
         """
-        file_path = hunk.get("file_path", "")
-        hunk_id = hunk.get("hunk_id", f"{file_path}:{hunk.get('new_line_start', 0)}")
-        
-        # Extract the code change for querying
-        added_lines = hunk.get("added_lines", [])
-        removed_lines = hunk.get("removed_lines", [])
-        context_lines = hunk.get("context_lines", [])
+        hunk_id, query_text = self._hunk_query(hunk)
         
-        # Combine for query
-        query_text = "\n".join(added_lines + removed_lines[:3])  # Focus on added + some removed
+        # Reuse a bundle from an earlier run of the same hunk against the same index
+        use_cache = self.cache is not None and bool(index_sha)
+        if use_cache:
+            cached = self.cache.get(repo_id, index_sha, hunk_id, query_text)
+            if cached is not None:
+                return cached
         
         # Simplified retrieval for demo
         # TODO: Integrate full RAG retrieval when vector store is populated
@@ -56,16 +177,21 @@ class RetrieverAgent:
         similar_results = []
         convention_results = []
         
+        # Only cache bundles backed by a successful vector search
+        retrieved = False
+        
         # Only attempt retrieval if vector store is available
         if self.vector_store and query_text.strip():
             try:
-                query_embedding = self.embedder.embed_text(query_text)
+                query_embedding = (query_embeddings or {}).get(query_text)
+                if query_embedding is None:
+                    query_embedding = self.embedder.embed_text(query_text).embedding
                 
                 # Search in vector store
                 search_results = self.vector_store.similarity_search(
-                    query_embedding=query_embedding.embedding,
+                    query_embedding=query_embedding,
                     limit=5,
-                    repo=repo_id,
+                    repo=vector_repo or repo_id,
                     min_similarity=0.7,
                 )
                 
@@ -80,6 +206,7 @@ class RetrieverAgent:
                             "similarity": result.get("similarity", 0.0),
                         }
                     })
+                retrieved = True
             except Exception as e:
                 print(f"  ⚠ Retrieval failed for {hunk_id}: {e}")
         
@@ -92,6 +219,10 @@ class RetrieverAgent:
             total_chunks=len(local_results) + len(similar_results) + len(convention_results)
         )
         
+        # Empty results are not cached: they may only mean the repo was not ingested yet
+        if use_cache and retrieved and bundle.total_chunks:
+            self.cache.put(repo_id, index_sha, hunk_id, query_text, bundle)
+        
         return bundle
     
     def __call__(self, state: WorkflowState) -> Dict[str, Any]:
@@ -107,12 +238,58 @@ class RetrieverAgent:
         print(f"\n🔍 Retriever Agent: Processing {len(state.hunks)} hunks...")
         
         retrieval_bundles = {}
+        query_embeddings = self.embed_queries(state.hunks, state.repo_id, state.index_sha)
         
         for hunk in state.hunks:
             try:
                 bundle = self.retrieve_for_hunk(
                     hunk=hunk,
-                    repo_id=state.repo_id
+                    repo_id=state.repo_id,
+                    query_embeddings=query_embeddings,
+                    index_sha=state.index_sha,
+                    vector_repo=state.vector_repo
+                )
+                retrieval_bundles[bundle.hunk_id] = bundle
+                print(f"  ✓ Retrieved {bundle.total_chunks} chunks for {bundle.hunk_id}")
+            except Exception as e:
+                error_msg = f"Retrieval failed for hunk {hunk.get('hunk_id', 'unknown')}: {e}"
+                print(f"  ✗ {error_msg}")
+                state.errors.append(error_msg)
+        
+        return {
+            "retrieval_bundles": retrieval_bundles,
+            "current_node": "retriever"
+        }
+
+
+class AsyncRetrieverAgent(RetrieverAgent):
+    """Retriever agent whose LangGraph node is a coroutine."""
+    
+    async def __call__(self, state: WorkflowState) -> Dict[str, Any]:
+        """
+        Async LangGraph node function: retrieve context for all hunks.
+        
+        The embedder and vector store clients are synchronous, so each
+        hunk's retrieval runs in a worker thread to keep the event loop free.
+        
+        Args:
+            state: Current workflow state
+            
+        Returns:
+            Updates to state (retrieval_bundles)
+        """
+        print(f"\n🔍 Retriever Agent: Processing {len(state.hunks)} hunks...")
+        
+        retrieval_bundles = {}
+        query_embeddings = await asyncio.to_thread(
+            self.embed_queries, state.hunks, state.repo_id, state.index_sha
+        )
+        
+        for hunk in state.hunks:
+            try:
+                bundle = await asyncio.to_thread(
+                    self.retrieve_for_hunk,
+                    hunk, state.repo_id, None, query_embeddings, state.index_sha, state.vector_repo
                 )
                 retrieval_bundles[bundle.hunk_id] = bundle
                 print(f"  ✓ Retrieved {bundle.total_chunks} chunks for {bundle.hunk_id}")
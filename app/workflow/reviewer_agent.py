@@ -1,13 +1,19 @@
 """Node 2: Reviewer Agent - Analyze hunks and generate review issues."""
 
+import asyncio
 import json
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, TYPE_CHECKING
 from langchain_ollama import ChatOllama
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 
+from config.connections import ollama_client_kwargs
+from config.settings import settings
 from .state import WorkflowState, ReviewIssue, IssueSeverity, IssueCategory
 
+if TYPE_CHECKING:
+    from .persistence_agent import PersistenceAgent
+
 
 REVIEW_PROMPT = """You are a senior code reviewer analyzing a pull request change.
 
@@ -77,44 +83,36 @@ Now analyze the code change and output JSON:
 class ReviewerAgent:
     """Agent responsible for reviewing code changes and identifying issues."""
     
-    def __init__(self, model_name: str = "qwen2.5-coder:7b-instruct"):
+    def __init__(
+        self,
+        model_name: str = "qwen2.5-coder:7b-instruct",
+        issue_sink: Optional["PersistenceAgent"] = None
+    ):
         """
         Initialize reviewer agent with LLM.
         
         Args:
             model_name: Ollama model name
+            issue_sink: If set, issues are streamed to its JSONL file as each hunk is reviewed
         """
+        self.issue_sink = issue_sink
         self.llm = ChatOllama(
             model=model_name,
-            base_url="http://localhost:11434",
+            **ollama_client_kwargs(settings.ollama_base_url),
             temperature=0.1,
             num_predict=2048,
         )
         self.parser = JsonOutputParser()
         self.prompt = ChatPromptTemplate.from_template(REVIEW_PROMPT)
     
-    def review_hunk(
-        self,
-        hunk: Dict[str, Any],
-        retrieval_bundle: Any
-    ) -> List[ReviewIssue]:
-        """
-        Review a single hunk with retrieved context.
-        
-        Args:
-            hunk: Hunk dictionary
-            retrieval_bundle: Retrieved context bundle
-            
-        Returns:
-            List of ReviewIssue objects
-        """
+    def _build_prompt_input(self, hunk: Dict[str, Any], retrieval_bundle: Any) -> Dict[str, Any]:
+        """Format a hunk and its retrieved context as prompt variables."""
         # Format context
         local_ctx = self._format_context(retrieval_bundle.local_context, "Local Context")
         similar_ctx = self._format_context(retrieval_bundle.similar_code, "Similar Code")
         conventions_ctx = self._format_context(retrieval_bundle.conventions, "Conventions")
         
-        # Prepare prompt inputs
-        prompt_input = {
+        return {
             "file_path": hunk.get("file_path", "unknown"),
             "old_line_start": hunk.get("old_line_start", 0),
             "old_line_end": hunk.get("old_line_end", 0),
@@ -127,29 +125,76 @@ class ReviewerAgent:
             "similar_code": similar_ctx or "(none)",
             "conventions": conventions_ctx or "(none)",
         }
+    
+    def _parse_issues(self, response: Any) -> List[ReviewIssue]:
+        """Convert an LLM response into ReviewIssue objects."""
+        # Parse JSON response
+        response_text = response.content if hasattr(response, 'content') else str(response)
+        
+        # Extract JSON from response
+        issues_data = self._extract_json(response_text)
+        
+        # Convert to ReviewIssue objects
+        issues = []
+        for issue_dict in issues_data:
+            try:
+                issue = ReviewIssue(**issue_dict)
+                issues.append(issue)
+            except Exception as e:
+                print(f"Failed to parse issue: {e}")
+                continue
+        
+        return issues
+    
+    def review_hunk(
+        self,
+        hunk: Dict[str, Any],
+        retrieval_bundle: Any
+    ) -> List[ReviewIssue]:
+        """
+        Review a single hunk with retrieved context.
+        
+        Args:
+            hunk: Hunk dictionary
+            retrieval_bundle: Retrieved context bundle
+            
+        Returns:
+            List of ReviewIssue objects
+        """
+        prompt_input = self._build_prompt_input(hunk, retrieval_bundle)
         
         # Invoke LLM
         try:
             chain = self.prompt | self.llm
             response = chain.invoke(prompt_input)
+            return self._parse_issues(response)
             
-            # Parse JSON response
-            response_text = response.content if hasattr(response, 'content') else str(response)
-            
-            # Extract JSON from response
-            issues_data = self._extract_json(response_text)
-            
-            # Convert to ReviewIssue objects
-            issues = []
-            for issue_dict in issues_data:
-                try:
-                    issue = ReviewIssue(**issue_dict)
-                    issues.append(issue)
-                except Exception as e:
-                    print(f"Failed to parse issue: {e}")
-                    continue
+        except Exception as e:
+            print(f"Review failed for hunk: {e}")
+            return []
+    
+    async def areview_hunk(
+        self,
+        hunk: Dict[str, Any],
+        retrieval_bundle: Any
+    ) -> List[ReviewIssue]:
+        """
+        Async version of review_hunk using the model's native async client.
+        
+        Args:
+            hunk: Hunk dictionary
+            retrieval_bundle: Retrieved context bundle
             
-            return issues
+        Returns:
+            List of ReviewIssue objects
+        """
+        prompt_input = self._build_prompt_input(hunk, retrieval_bundle)
+        
+        # Invoke LLM without blocking the event loop
+        try:
+            chain = self.prompt | self.llm
+            response = await chain.ainvoke(prompt_input)
+            return self._parse_issues(response)
             
         except Exception as e:
             print(f"Review failed for hunk: {e}")
@@ -211,23 +256,112 @@ class ReviewerAgent:
         
         all_issues = []
         
-        for hunk in state.hunks:
+        # Stream issues to disk while the remaining hunks are reviewed
+        stream = self.issue_sink.open_issue_stream(state.run_id) if self.issue_sink else None
+        
+        try:
+            for hunk in state.hunks:
+                hunk_id = hunk.get("hunk_id", "unknown")
+                
+                # Get retrieval bundle for this hunk
+                bundle = state.retrieval_bundles.get(hunk_id)
+                if not bundle:
+                    print(f"  ⚠ No retrieval bundle for {hunk_id}, skipping...")
+                    continue
+                
+                try:
+                    issues = self.review_hunk(hunk, bundle)
+                    all_issues.extend(issues)
+                    if stream:
+                        for issue in issues:
+                            stream.write_issue(issue)
+                    print(f"  ✓ Found {len(issues)} issues in {hunk_id}")
+                except Exception as e:
+                    error_msg = f"Review failed for {hunk_id}: {e}"
+                    print(f"  ✗ {error_msg}")
+                    state.errors.append(error_msg)
+        finally:
+            if stream:
+                stream.close(run_id=state.run_id, pr_sha=state.pr_sha, hunks_reviewed=len(state.hunks))
+        
+        print(f"\n  Total issues found: {len(all_issues)}")
+        
+        return {
+            "review_issues": all_issues,
+            "current_node": "reviewer"
+        }
+
+
+class AsyncReviewerAgent(ReviewerAgent):
+    """Reviewer agent whose LangGraph node is a coroutine."""
+    
+    def __init__(
+        self,
+        model_name: str = "qwen2.5-coder:7b-instruct",
+        issue_sink: Optional["PersistenceAgent"] = None,
+        hunk_concurrency: int = 8
+    ):
+        """
+        Initialize async reviewer agent.
+        
+        Args:
+            model_name: Ollama model name
+            issue_sink: If set, issues are streamed to its JSONL file as each hunk is reviewed
+            hunk_concurrency: Maximum number of hunks reviewed at once
+        """
+        super().__init__(model_name=model_name, issue_sink=issue_sink)
+        self.hunk_concurrency = max(1, hunk_concurrency)
+    
+    async def __call__(self, state: WorkflowState) -> Dict[str, Any]:
+        """
+        Async LangGraph node function: review all hunks.
+        
+        Hunks are reviewed concurrently (bounded by hunk_concurrency); issues
+        are returned in hunk order regardless of completion order.
+        
+        Args:
+            state: Current workflow state
+            
+        Returns:
+            Updates to state (review_issues)
+        """
+        print(f"\n📝 Reviewer Agent: Analyzing {len(state.hunks)} hunks...")
+        
+        sem = asyncio.Semaphore(self.hunk_concurrency)
+        
+        # Stream issues to disk as each hunk finishes
+        stream = self.issue_sink.open_issue_stream(state.run_id) if self.issue_sink else None
+        
+        async def review_one(hunk: Dict[str, Any]) -> List[ReviewIssue]:
             hunk_id = hunk.get("hunk_id", "unknown")
             
             # Get retrieval bundle for this hunk
             bundle = state.retrieval_bundles.get(hunk_id)
             if not bundle:
                 print(f"  ⚠ No retrieval bundle for {hunk_id}, skipping...")
-                continue
+                return []
             
             try:
-                issues = self.review_hunk(hunk, bundle)
-                all_issues.extend(issues)
+                async with sem:
+                    issues = await self.areview_hunk(hunk, bundle)
+                if stream:
+                    for issue in issues:
+                        stream.write_issue(issue)
                 print(f"  ✓ Found {len(issues)} issues in {hunk_id}")
+                return issues
             except Exception as e:
                 error_msg = f"Review failed for {hunk_id}: {e}"
                 print(f"  ✗ {error_msg}")
                 state.errors.append(error_msg)
+                return []
+        
+        try:
+            results = await asyncio.gather(*(review_one(hunk) for hunk in state.hunks))
+        finally:
+            if stream:
+                stream.close(run_id=state.run_id, pr_sha=state.pr_sha, hunks_reviewed=len(state.hunks))
+        
+        all_issues = [issue for issues in results for issue in issues]
         
         print(f"\n  Total issues found: {len(all_issues)}")
         
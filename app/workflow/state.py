@@ -106,6 +106,8 @@ class WorkflowState(BaseModel):
     repo_owner: str
     repo_name: str
     repo_id: str  # For Qdrant collection reference
+    vector_repo: Optional[str] = None  # Qdrant 'repo' payload (owner/name); defaults to repo_id
+    index_sha: Optional[str] = None  # main HEAD the vector index was built from
     pr_number: int
     pr_sha: str
     diff_hash: str
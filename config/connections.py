@@ -0,0 +1,118 @@
+"""Client connection helpers for Qdrant and Ollama.
+
+Both services can be reached over a Unix domain socket on single-host
+deployments by setting the URL to ``unix:///path/to/socket``
+(e.g. QDRANT_URL=unix:///var/run/qdrant.sock), which skips the TCP
+loopback stack on every call.
+"""
+
+from typing import Any, Dict, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import httpx
+
+
+UDS_PREFIX = "unix://"
+
+# Placeholder origin for HTTP over a Unix socket (the host is never resolved)
+_UDS_HTTP_ORIGIN = "http://localhost"
+
+
+def uds_path(url: str) -> Optional[str]:
+    """Return the socket path for a unix:// URL, or None for network URLs."""
+    if url.startswith(UDS_PREFIX):
+        return url[len(UDS_PREFIX):]
+    return None
+
+
+def qdrant_client_kwargs(
+    url: str,
+    api_key: Optional[str] = None,
+    prefer_grpc: bool = False
+) -> Dict[str, Any]:
+    """
+    Build QdrantClient keyword arguments for a URL.
+
+    Args:
+        url: Qdrant URL (http(s)://host:port or unix:///path/to/socket)
+        api_key: Optional API key
+        prefer_grpc: Use gRPC instead of REST (network URLs only)
+
+    Returns:
+        Keyword arguments for QdrantClient(...)
+    """
+    path = uds_path(url)
+    if path is None:
+        return {"url": url, "api_key": api_key, "prefer_grpc": prefer_grpc}
+
+    import httpx
+
+    # qdrant-client builds gRPC channels from host:port, so a socket is REST-only;
+    # extra kwargs are handed to the underlying httpx client
+    return {
+        "url": _UDS_HTTP_ORIGIN,
+        "api_key": api_key,
+        "prefer_grpc": False,
+        "transport": httpx.HTTPTransport(uds=path),
+    }
+
+
+def ollama_client_kwargs(base_url: str) -> Dict[str, Any]:
+    """
+    Build ChatOllama keyword arguments for a base URL.
+
+    Args:
+        base_url: Ollama URL (http://host:port or unix:///path/to/socket)
+
+    Returns:
+        Keyword arguments for ChatOllama(...)
+    """
+    path = uds_path(base_url)
+    if path is None:
+        return {"base_url": base_url}
+
+    import httpx
+
+    return {
+        "base_url": _UDS_HTTP_ORIGIN,
+        "sync_client_kwargs": {"transport": httpx.HTTPTransport(uds=path)},
+        "async_client_kwargs": {"transport": httpx.AsyncHTTPTransport(uds=path)},
+    }
+
+
+def ollama_http_client(base_url: str, timeout: float = 5.0) -> "httpx.Client":
+    """
+    Create a plain HTTP client for Ollama's REST API (e.g. /api/tags).
+
+    Args:
+        base_url: Ollama URL (http://host:port or unix:///path/to/socket)
+        timeout: Request timeout in seconds
+
+    Returns:
+        httpx.Client whose base_url points at Ollama
+    """
+    import httpx
+
+    path = uds_path(base_url)
+    if path is None:
+        return httpx.Client(base_url=base_url, timeout=timeout)
+    return httpx.Client(base_url=_UDS_HTTP_ORIGIN, timeout=timeout, transport=httpx.HTTPTransport(uds=path))
+
+
+def ollama_async_http_client(base_url: str, timeout: float = 5.0) -> "httpx.AsyncClient":
+    """
+    Create an async HTTP client for Ollama's REST API (e.g. /api/tags).
+
+    Args:
+        base_url: Ollama URL (http://host:port or unix:///path/to/socket)
+        timeout: Request timeout in seconds
+
+    Returns:
+        httpx.AsyncClient whose base_url points at Ollama
+    """
+    import httpx
+
+    path = uds_path(base_url)
+    if path is None:
+        return httpx.AsyncClient(base_url=base_url, timeout=timeout)
+    return httpx.AsyncClient(base_url=_UDS_HTTP_ORIGIN, timeout=timeout, transport=httpx.AsyncHTTPTransport(uds=path))
@@ -0,0 +1,57 @@
+"""Logging configuration for Repo_Copilot."""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+from typing import Optional
+
+from config.settings import settings
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that enqueues records unformatted.
+
+    The stock prepare() renders the message and any traceback on the calling
+    thread; since the queue never leaves the process, the listener can do it.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+# Background listener that owns the real (blocking) handlers
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def setup_logging(level: Optional[str] = None) -> None:
+    """
+    Route all logging through a queue drained by a background thread.
+
+    Callers only enqueue records (QueueHandler), so request handlers never
+    block on the stdout lock or pay for formatting messages and tracebacks;
+    a QueueListener formats and writes them to the console.
+    Safe to call more than once.
+
+    Args:
+        level: Log level name (defaults to settings.log_level)
+    """
+    global _listener
+
+    root = logging.getLogger()
+    root.setLevel((level or settings.log_level).upper())
+
+    if _listener is not None:
+        return
+
+    log_queue: queue.Queue = queue.Queue(-1)
+
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    root.addHandler(_DeferredQueueHandler(log_queue))
+
+    _listener = logging.handlers.QueueListener(log_queue, console, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
@@ -1,5 +1,8 @@
 """Configuration settings for Repo_Copilot."""
 
+from functools import lru_cache
+
+from pydantic import AliasChoices, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional, List
 
@@ -9,6 +12,11 @@ class Settings(BaseSettings):
     
     # GitHub API
     github_token: Optional[str] = None
+    github_pool_size: int = 16  # Keep-alive connections to api.github.com per token
+    # Fetch PRs with reviews in one GraphQL query (falls back to REST); GITHUB_USE_GRAPHQL is the legacy name
+    github_graphql_reviews: bool = Field(
+        True, validation_alias=AliasChoices("github_graphql_reviews", "github_use_graphql")
+    )
     
     # Legacy Google Gemini API (no longer used, kept for backward compatibility)
     google_api_key: Optional[str] = None
@@ -22,9 +30,11 @@ class Settings(BaseSettings):
     qdrant_url: str = "http://localhost:6333"  # Qdrant server URL
     qdrant_api_key: Optional[str] = None  # Optional for cloud Qdrant
     qdrant_collection_name: str = "code_embeddings"  # Collection name
+    qdrant_prefer_grpc: bool = False  # Use gRPC (port 6334) instead of REST
     
     # Ingestion settings
     temp_clone_directory: str = "./temp_repos"
+    ingested_index_path: str = "./ingested.json"  # Ingested repos + HEAD SHAs, survives restarts
     max_file_size_kb: int = 1024  # Skip files larger than 1MB
     
     # File filtering patterns
@@ -112,18 +122,34 @@ class Settings(BaseSettings):
     embedding_dimension: int = 1024  # BGE-large dimension
     embedding_device: str = "cpu"  # "cpu" or "cuda" for GPU acceleration
     embedding_normalize: bool = True  # Normalize embeddings for cosine similarity
+    embedding_query_cache_size: int = 1024  # Query embeddings kept in memory per embedder (0 = off)
     
     # Ollama LLM settings
     ollama_base_url: str = "http://localhost:11434"
     ollama_model: str = "qwen2.5-coder:7b-instruct"
     ollama_temperature: float = 0.1  # Low temperature for code review
+    review_hunk_concurrency: int = 8  # Max hunks reviewed in parallel by the async reviewer
     
     # HITL (Human-in-the-Loop) settings
     hitl_base_url: str = "http://localhost:8000"  # Base URL for HITL web interface
     
+    # API settings
+    max_concurrent_reviews: int = 2  # Full PR reviews run at once by POST /review; others queue
+    workflow_process_workers: int = 2  # Processes running review workflows (0 = run in a thread instead)
+    pr_cache_size: int = 256  # Recently fetched PRs kept in memory
+    pr_cache_ttl_seconds: int = 60  # How long a fetched PR is reused before re-hitting GitHub
+    hitl_max_paused_workflows: int = 64  # Workflows awaiting a HITL decision kept in memory
+    hitl_pause_ttl_seconds: int = 3600  # How long a paused workflow waits before it is dropped
+    review_jobs_max: int = 256  # Queued/finished POST /review jobs kept for polling
+    review_job_ttl_seconds: int = 86400  # How long a review job (and its result) can be polled
+    
     # Notification settings (Phase 6)
     notification_enabled: bool = True
     
+    # Logging
+    log_level: str = "INFO"
+    debug_tracebacks: bool = False  # Include tracebacks in API error responses (always logged)
+    
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -131,5 +157,17 @@ class Settings(BaseSettings):
     )
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Return the process-wide settings, reading the environment and .env once.
+    
+    Configuration is fixed for the life of the process; use this (or the
+    module-level ``settings``) instead of constructing Settings() per call,
+    e.g. as a FastAPI dependency: ``settings: Settings = Depends(get_settings)``.
+    """
+    return Settings()
+
+
 # Global settings instance
-settings = Settings()
+settings = get_settings()
@@ -0,0 +1,136 @@
+"""Example script demonstrating the PR review workflow."""
+
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List, Tuple, TYPE_CHECKING
+
+# The workflow stack (langgraph, agents, qdrant) is imported inside the
+# examples so that running this script only loads what is actually used
+if TYPE_CHECKING:
+    from app.workflow import WorkflowState
+
+
+def build_initial_state(repo_full_name: str, pr_number: int) -> "WorkflowState":
+    """Fetch a PR with the Phase 2 coordinator and build the workflow state."""
+    from app.api.orchestrator import compute_diff_hash
+    from app.pr_review import quick_prepare_review, review_units_to_hunks
+    from app.workflow import WorkflowState
+
+    session = quick_prepare_review(
+        repo_full_name=repo_full_name,
+        pr_number=pr_number
+    )
+
+    repo_owner, repo_name = repo_full_name.split("/")
+
+    hunks = review_units_to_hunks(session.review_units)
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    return WorkflowState(
+        run_id=f"{repo_name}_PR{pr_number}_{timestamp}",
+        repo_owner=repo_owner,
+        repo_name=repo_name,
+        repo_id=f"{repo_owner}_{repo_name}_main",
+        vector_repo=repo_full_name,
+        pr_number=pr_number,
+        pr_sha=session.pr_data.head_sha,
+        diff_hash=compute_diff_hash(hunks),
+        hunks=hunks,
+    )
+
+
+def example_single_pr():
+    """Review a single PR."""
+    print("="*70)
+    print("Example 1: Review a Single PR")
+    print("="*70)
+
+    from app.workflow import get_default_workflow, run_workflow
+
+    initial_state = build_initial_state("AnandD1/ScratchYOLO", 2)
+
+    workflow = get_default_workflow()
+    final_state = run_workflow(initial_state, workflow)
+
+    print(f"\n✓ Issues found: {len(final_state.get('review_issues', []))}")
+
+    return final_state
+
+
+async def run_batch(
+    prs: List[Tuple[str, int]],
+    max_concurrency: int = 8
+) -> List[Dict[str, Any]]:
+    """
+    Review several PRs concurrently.
+
+    Each run is mostly waiting on GitHub, Qdrant and the LLM, so the runs
+    are overlapped with asyncio.gather instead of executed one after the
+    other. The semaphore bounds how many runs are in flight at once.
+
+    Args:
+        prs: List of (repo_full_name, pr_number) pairs
+        max_concurrency: Maximum number of workflows running at once
+
+    Returns:
+        Final state dictionaries, in the same order as prs
+    """
+    from app.workflow import get_default_workflow, run_workflow_async
+
+    # Compile once, invoke many times (one checkpoint thread per run_id)
+    workflow = get_default_workflow(use_async=True)
+    sem = asyncio.Semaphore(max_concurrency)
+
+    async def one(repo_full_name: str, pr_number: int) -> Dict[str, Any]:
+        async with sem:
+            state = await asyncio.to_thread(build_initial_state, repo_full_name, pr_number)
+            return await run_workflow_async(state, workflow)
+
+    return await asyncio.gather(*(one(repo, number) for repo, number in prs))
+
+
+def example_batch_prs():
+    """Review a batch of PRs concurrently."""
+    print("\n" + "="*70)
+    print("Example 2: Batch PR Processing")
+    print("="*70)
+
+    prs = [
+        ("AnandD1/ScratchYOLO", 1),
+        ("AnandD1/ScratchYOLO", 2),
+    ]
+
+    results = asyncio.run(run_batch(prs))
+
+    for (repo_full_name, pr_number), final_state in zip(prs, results):
+        issues = len(final_state.get('review_issues', []))
+        print(f"  {repo_full_name}#{pr_number}: {issues} issues")
+
+    return results
+
+
+def main():
+    """Run all examples."""
+    print("\n" + "🚀"*35)
+    print("Repo_Copilot - Workflow Examples")
+    print("🚀"*35 + "\n")
+
+    # Run examples (commented out to avoid calling GitHub and the LLM)
+    # Uncomment the ones you want to try
+
+    # Example 1: Single PR
+    # result1 = example_single_pr()
+
+    # Example 2: Batch of PRs
+    # result2 = example_batch_prs()
+
+    print("\n" + "="*70)
+    print("Examples Complete!")
+    print("="*70)
+    print("\nTo run these examples, uncomment the function calls in main()")
+    print("Note: Requires GITHUB_TOKEN in .env, Qdrant and Ollama running")
+
+
+if __name__ == "__main__":
+    main()
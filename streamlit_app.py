@@ -109,10 +109,22 @@ def run_pr_review(repo_url, pr_number, github_token, run_evaluation):
         response = requests.post(
             f"{API_BASE_URL}/review",
             json=payload,
-            timeout=600  # 10 minutes timeout
+            timeout=30
         )
+        queued = response.json()
+        if not queued.get('success'):
+            return queued
         
-        return response.json()
+        # Review runs in the background; poll until it finishes
+        run_id = queued['data']['run_id']
+        deadline = time.time() + 600  # 10 minutes timeout
+        while time.time() < deadline:
+            status = requests.get(f"{API_BASE_URL}/review/{run_id}", timeout=30).json()
+            if status.get('data', {}).get('status') not in ("queued", "running"):
+                return status
+            time.sleep(2)
+        
+        return {"success": False, "error": f"Timed out waiting for review {run_id}"}
     except Exception as e:
         return {"success": False, "error": str(e)}
 
@@ -23,3 +23,41 @@ def sample_repo_path(tmp_path):
     (repo_path / "README.md").write_text("# Readme")
     
     return repo_path
+
+
+@pytest.fixture
+def vector_store():
+    """Create a QdrantVectorStore backed by an in-memory Qdrant."""
+    import app.ingest  # noqa: F401  (app.storage imports app.ingest)
+    from qdrant_client import QdrantClient
+    from app.storage import QdrantVectorStore
+    from config.settings import settings
+
+    store = QdrantVectorStore.__new__(QdrantVectorStore)
+    store.client = QdrantClient(":memory:")
+    store.collection_name = settings.qdrant_collection_name
+    store._init_collection()
+    return store
+
+
+@pytest.fixture
+def ingest_chunk(vector_store):
+    """Return a function storing one chunk the way quick_ingest_repo does."""
+    from app.ingest.embedder import EmbeddingResult
+    from app.ingest.embedding_manager import EmbeddingMetadata
+    from config.settings import settings
+
+    def ingest(repo: str, file_path: str, vector, content: str = "x = 1"):
+        chunk_id = f"{repo}::{file_path}::0"
+        vector_store.insert_embeddings(
+            embeddings=[EmbeddingResult(chunk_id, vector, 1, "test", len(vector))],
+            metadata_list=[EmbeddingMetadata(
+                chunk_id=chunk_id, chunk_index=0, repo=repo, branch="main", file_path=file_path,
+                language="python", start_line=1, end_line=1, chunk_type="code", symbol=None,
+                imports=None, embedding_model="test", embedding_dimension=settings.embedding_dimension,
+                token_count=1, content_hash=chunk_id,
+            )],
+            contents=[content],
+        )
+
+    return ingest
@@ -0,0 +1,124 @@
+"""Tests for cleanup manager."""
+
+import pytest
+from app.api.cleanup import CleanupManager, fast_rmtree, vector_repo_name
+
+
+@pytest.fixture
+def cleanup_manager(tmp_path):
+    """Create a cleanup manager working inside a temporary directory."""
+    manager = CleanupManager()
+    manager.temp_repos_dir = tmp_path / "temp_repos"
+    manager.embedding_cache_dir = tmp_path / "embedding_cache"
+    manager.retrieval_cache_dir = tmp_path / "retrieval_cache"
+    manager.temp_repos_dir.mkdir()
+    manager.embedding_cache_dir.mkdir()
+    return manager
+
+
+def test_vector_repo_name():
+    """Test mapping repo IDs to the owner/name payload of ingested points."""
+    assert vector_repo_name("owner_repo_main") == "owner/repo"
+    assert vector_repo_name("my-org_my_repo_main") == "my-org/my_repo"
+
+
+def test_fast_rmtree(tmp_path):
+    """Test deleting a nested tree with files and a directory symlink."""
+    root = tmp_path / "repo"
+    objects = root / ".git" / "objects" / "ab"
+    objects.mkdir(parents=True)
+    for i in range(50):
+        (objects / f"obj{i}").write_text("x")
+    (root / "main.py").write_text("print('hello')")
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "keep.txt").write_text("keep")
+    (root / "link").symlink_to(outside, target_is_directory=True)
+
+    fast_rmtree(root)
+
+    assert not root.exists()
+    assert (outside / "keep.txt").exists()
+
+
+class TestCleanupManager:
+    """Tests for CleanupManager class."""
+
+    def test_cleanup_embedding_cache_repo_directory(self, cleanup_manager):
+        """Test deleting a repo's cache directory."""
+        repo_dir = cleanup_manager.embedding_cache_dir / "owner_repo_main"
+        repo_dir.mkdir()
+        (repo_dir / "owner_repo_main_chunk1_abc.json").write_text("{}")
+        other_dir = cleanup_manager.embedding_cache_dir / "other_repo_main"
+        other_dir.mkdir()
+        (other_dir / "other_repo_main_chunk1_abc.json").write_text("{}")
+
+        cleanup_manager.cleanup_embedding_cache("owner_repo_main")
+
+        assert not repo_dir.exists()
+        assert (other_dir / "other_repo_main_chunk1_abc.json").exists()
+
+    def test_cleanup_embedding_cache_flat_layout(self, cleanup_manager):
+        """Test deleting legacy flat cache files."""
+        cache_dir = cleanup_manager.embedding_cache_dir
+        (cache_dir / "owner_repo_main_chunk1_abc.json").write_text("{}")
+        (cache_dir / "other_repo_main_chunk1_abc.json").write_text("{}")
+
+        cleanup_manager.cleanup_embedding_cache("owner_repo_main")
+
+        assert not (cache_dir / "owner_repo_main_chunk1_abc.json").exists()
+        assert (cache_dir / "other_repo_main_chunk1_abc.json").exists()
+
+    def test_cleanup_all_temp_repos(self, cleanup_manager):
+        """Test deleting all temp repos keeps the directory."""
+        repo_dir = cleanup_manager.temp_repos_dir / "repo"
+        repo_dir.mkdir()
+        (repo_dir / "file.py").write_text("print('hello')")
+
+        cleanup_manager.cleanup_all_temp_repos()
+
+        assert cleanup_manager.temp_repos_dir.exists()
+        assert not repo_dir.exists()
+
+    def test_cleanup_qdrant_collections(self, cleanup_manager, vector_store, ingest_chunk):
+        """Test counting and deleting ingested vectors for several repos in one call."""
+        from config.settings import settings
+
+        vector = [1.0] * settings.embedding_dimension
+        for repo in ["a/x", "b/y", "c/z"]:
+            ingest_chunk(repo, "app.py", vector)
+        cleanup_manager.qdrant_client = vector_store.client
+
+        assert cleanup_manager.count_repo_vectors("a_x_main") == 1
+
+        cleanup_manager.cleanup_qdrant_collections(["a_x_main", "b_y_main"])
+
+        remaining = vector_store.client.scroll(vector_store.collection_name)[0]
+        assert [point.payload["repo"] for point in remaining] == ["c/z"]
+        assert cleanup_manager.count_repo_vectors("a_x_main") == 0
+
+    def test_cleanup_all_embedding_cache(self, cleanup_manager):
+        """Test deleting every cache file, nested and flat, keeps the directory."""
+        cache_dir = cleanup_manager.embedding_cache_dir
+        repo_dir = cache_dir / "owner_repo_main"
+        repo_dir.mkdir()
+        (repo_dir / "owner_repo_main_chunk1_abc.json").write_text("{}")
+        (cache_dir / "other_repo_main_chunk1_abc.json").write_text("{}")
+
+        cleanup_manager.cleanup_all_embedding_cache()
+
+        assert cache_dir.exists()
+        assert list(cache_dir.iterdir()) == []
+
+    @pytest.mark.parametrize("previous, expected", [
+        (None, "full"),
+        ("owner_repo_main", "same_repo"),
+        ("other_repo_main", "new_repo"),
+    ])
+    def test_prepare_for(self, cleanup_manager, previous, expected):
+        """Test that prepare_for picks the cleanup matching the previous repo."""
+        cleanup_manager.qdrant_client = None
+        (cleanup_manager.temp_repos_dir / "repo").mkdir()
+
+        assert cleanup_manager.prepare_for("owner_repo_main", previous=previous) == expected
+        assert list(cleanup_manager.temp_repos_dir.iterdir()) == []
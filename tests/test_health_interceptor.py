@@ -0,0 +1,49 @@
+"""Tests for the liveness-probe ASGI interceptor."""
+
+import asyncio
+
+from app.api.health_interceptor import HealthCheckInterceptor
+
+
+async def _downstream(scope, receive, send):
+    await send({"type": "http.response.start", "status": 404, "headers": []})
+    await send({"type": "http.response.body", "body": b"downstream"})
+
+
+def _request(app, method, path):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": method, "path": path, "headers": []}
+    asyncio.run(app(scope, receive, send))
+    return messages[0]["status"], dict(messages[0]["headers"]), messages[1]["body"]
+
+
+class TestHealthCheckInterceptor:
+    """Tests for HealthCheckInterceptor class."""
+
+    def test_answers_liveness_without_downstream(self):
+        """Test that GET /health/live is answered with the prebuilt response."""
+        status, _, body = _request(HealthCheckInterceptor(_downstream), "GET", "/health/live")
+
+        assert status == 200
+        assert body == b'{"status":"ok"}'
+
+    def test_rejects_other_methods(self):
+        """Test that non-GET liveness requests get 405 with an Allow header."""
+        status, headers, _ = _request(HealthCheckInterceptor(_downstream), "POST", "/health/live")
+
+        assert status == 405
+        assert headers[b"allow"] == b"GET, HEAD"
+
+    def test_passes_other_paths_through(self):
+        """Test that every other request reaches the wrapped app."""
+        status, _, body = _request(HealthCheckInterceptor(_downstream), "GET", "/health")
+
+        assert status == 404
+        assert body == b"downstream"
@@ -0,0 +1,155 @@
+"""Tests for the workflow orchestrator helpers."""
+
+import pytest
+from config.settings import Settings
+from app.api.orchestrator import MemoryCache, WorkflowOrchestrator, compute_diff_hash
+
+
+class TestMemoryCache:
+    """Tests for MemoryCache class."""
+
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest untouched entry is evicted when full."""
+        cache = MemoryCache(max_size=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_cleanup_drops_expired(self):
+        """Test that expired entries are not returned and are swept by cleanup."""
+        cache = MemoryCache(max_size=4, ttl_seconds=60)
+        cache.set("stale", 1, ttl_seconds=0)
+        cache.set("fresh", 2)
+
+        assert cache.cleanup() == 1
+        assert cache.get("stale") is None
+        assert len(cache) == 1
+
+    def test_on_evict_skips_pop(self):
+        """Test that evicted and expired entries reach on_evict but popped ones do not."""
+        evicted = []
+        cache = MemoryCache(max_size=1, ttl_seconds=60, on_evict=lambda key, value: evicted.append(key))
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("c", 3, ttl_seconds=0)
+        cache.get("c")
+        cache.set("d", 4)
+        cache.pop("d")
+
+        assert evicted == ["a", "b", "c"]
+
+
+class TestPausedWorkflows:
+    """Tests for checkpoint release of paused workflows."""
+
+    def test_evicted_run_releases_checkpoint(self, tmp_path):
+        """Test that evicting a paused run drops its checkpoint from the shared graph."""
+        from typing import TypedDict
+        from langgraph.checkpoint.memory import MemorySaver
+        from langgraph.graph import END, StateGraph
+
+        class State(TypedDict):
+            n: int
+
+        graph = StateGraph(State)
+        graph.add_node("step", lambda state: {"n": state["n"] + 1})
+        graph.set_entry_point("step")
+        graph.add_edge("step", END)
+        workflow = graph.compile(checkpointer=MemorySaver())
+
+        settings = Settings(
+            ingested_index_path=str(tmp_path / "ingested.json"),
+            hitl_max_paused_workflows=1
+        )
+        orchestrator = WorkflowOrchestrator(settings)
+        for run_id in ("run1", "run2"):
+            workflow.invoke({"n": 0}, {"configurable": {"thread_id": run_id}})
+            orchestrator.active_workflows.set(run_id, {"workflow": workflow})
+
+        assert set(workflow.checkpointer.storage) == {"run2"}
+
+
+class TestIngestedIndex:
+    """Tests for the persisted ingested-repos index."""
+
+    def test_index_survives_restart(self, tmp_path):
+        """Test that a recorded ingestion is reused only while HEAD is unchanged."""
+        settings = Settings(ingested_index_path=str(tmp_path / "state" / "ingested.json"))
+        orchestrator = WorkflowOrchestrator(settings)
+        orchestrator.current_repo_id = "owner_repo_main"
+        orchestrator._record_ingestion(
+            "owner_repo_main", "owner", "repo", {"chunks_created": 42}, 1.5, head_sha="abc123"
+        )
+
+        restarted = WorkflowOrchestrator(settings)
+        restarted.cleanup_manager.qdrant_client = None
+
+        assert restarted.current_repo_id == "owner_repo_main"
+        assert restarted._current_ingestion("owner_repo_main", "abc123")["chunks_created"] == 42
+        assert restarted._current_ingestion("owner_repo_main", None) is not None
+        assert restarted._current_ingestion("owner_repo_main", "def456") is None
+
+    def test_index_entry_requires_vectors(self, tmp_path, vector_store, ingest_chunk):
+        """Test that a recorded ingestion is reused only while its vectors are stored."""
+        settings = Settings(ingested_index_path=str(tmp_path / "ingested.json"))
+        orchestrator = WorkflowOrchestrator(settings)
+        orchestrator.cleanup_manager.qdrant_client = vector_store.client
+        orchestrator._record_ingestion("owner_repo_main", "owner", "repo", {"chunks_created": 1}, 1.0, head_sha="abc123")
+
+        assert orchestrator._current_ingestion("owner_repo_main", "abc123") is None
+
+        ingest_chunk("owner/repo", "app.py", [1.0] * settings.embedding_dimension)
+
+        assert orchestrator._current_ingestion("owner_repo_main", "abc123") is not None
+
+    def test_reingest_drops_stale_vectors(self, tmp_path, monkeypatch, vector_store, ingest_chunk):
+        """Test that re-ingesting replaces the repo's points instead of upserting over them."""
+        import app.api.orchestrator as orchestrator_module
+
+        settings = Settings(ingested_index_path=str(tmp_path / "ingested.json"))
+        orchestrator = WorkflowOrchestrator(settings)
+        orchestrator.cleanup_manager.qdrant_client = vector_store.client
+        vector = [1.0] * settings.embedding_dimension
+        ingest_chunk("owner/repo", "deleted.py", vector)
+        ingest_chunk("other/repo", "app.py", vector)
+
+        def fake_ingest(repo_url, branch, settings_obj):
+            ingest_chunk("owner/repo", "app.py", vector)
+            return {"chunks_created": 1}
+
+        monkeypatch.setattr(orchestrator_module, "quick_ingest_repo", fake_ingest)
+
+        orchestrator._rebuild_vectors(WorkflowOrchestrator.parse_github_url("owner/repo"))
+
+        points = vector_store.client.scroll(vector_store.collection_name)[0]
+        assert sorted((p.payload["repo"], p.payload["file_path"]) for p in points) == [
+            ("other/repo", "app.py"), ("owner/repo", "app.py")
+        ]
+
+
+def test_parse_github_url():
+    """Test the supported GitHub URL forms."""
+    for url in ["https://github.com/owner/repo", "http://github.com/owner/repo.git/", "github.com/owner/repo.git", " owner/repo "]:
+        ref = WorkflowOrchestrator.parse_github_url(url)
+        assert (ref.owner, ref.repo) == ("owner", "repo")
+        assert ref.clone_url == "https://github.com/owner/repo"
+        assert ref.repo_id == "owner_repo_main"
+
+    with pytest.raises(ValueError):
+        WorkflowOrchestrator.parse_github_url("https://github.com/owner")
+
+
+def test_compute_diff_hash():
+    """Test that the diff hash is short, stable and sensitive to changed lines."""
+    hunk = {"file_path": "app.py", "new_line_start": 1, "new_line_end": 2, "added_lines": ["x = 1"]}
+
+    digest = compute_diff_hash([hunk])
+
+    assert len(digest) == 16
+    assert compute_diff_hash([dict(hunk)]) == digest
+    assert compute_diff_hash([{**hunk, "added_lines": ["x = 2"]}]) != digest
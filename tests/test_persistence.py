@@ -0,0 +1,76 @@
+"""Tests for workflow persistence."""
+
+import pytest
+from app.workflow import PersistenceAgent, WorkflowState, ReviewIssue, GuardrailResult
+
+
+@pytest.fixture
+def workflow_state():
+    """Create a workflow state with review results."""
+    return WorkflowState(
+        run_id="repo_pr1",
+        repo_owner="owner",
+        repo_name="repo",
+        repo_id="owner_repo_main",
+        pr_number=1,
+        pr_sha="abc123",
+        diff_hash="deadbeef",
+        hunks=[{"hunk_id": "app.py:1", "file_path": "app.py", "added_lines": ["x = 1"]}],
+        review_issues=[
+            ReviewIssue(
+                severity="major",
+                category="correctness",
+                file_path="app.py",
+                line_number=1,
+                explanation="Unused variable",
+                suggestion="Remove it",
+                evidence_references=["app.py:1-1"],
+            )
+        ],
+        guardrail_result=GuardrailResult(passed=True),
+    )
+
+
+class TestPersistenceAgent:
+    """Tests for PersistenceAgent class."""
+
+    @pytest.mark.parametrize("serialization_format", ["json", "msgpack"])
+    def test_save_and_load_round_trip(self, tmp_path, workflow_state, serialization_format):
+        """Test that a saved state loads back unchanged."""
+        agent = PersistenceAgent(storage_dir=str(tmp_path), serialization_format=serialization_format)
+
+        path = agent.save_workflow_state(workflow_state)
+        loaded = PersistenceAgent.load_workflow_state(path)
+
+        assert path.endswith(f".{serialization_format}")
+        assert loaded == workflow_state
+
+    def test_results_only_skips_hunks(self, tmp_path, workflow_state):
+        """Test that results-only saves drop rehydratable fields."""
+        agent = PersistenceAgent(storage_dir=str(tmp_path))
+
+        path = agent.save_workflow_state(workflow_state, mode="results_only")
+        loaded = PersistenceAgent.load_workflow_state(path, rehydrate=False)
+
+        assert loaded.hunks == []
+        assert loaded.review_issues == workflow_state.review_issues
+        assert loaded.pr_sha == workflow_state.pr_sha
+
+    def test_issue_stream_round_trip(self, tmp_path, workflow_state):
+        """Test that streamed issues load back with their footer."""
+        agent = PersistenceAgent(storage_dir=str(tmp_path))
+
+        with agent.open_issue_stream(workflow_state.run_id) as stream:
+            for issue in workflow_state.review_issues:
+                stream.write_issue(issue)
+
+        issues, footer = PersistenceAgent.load_issue_stream(stream.filepath)
+
+        assert issues == workflow_state.review_issues
+        assert footer["issue_count"] == 1
+        assert footer["complete"] is True
+
+    def test_unknown_format(self, tmp_path):
+        """Test that an unknown format is rejected."""
+        with pytest.raises(ValueError):
+            PersistenceAgent(storage_dir=str(tmp_path), serialization_format="xml")
@@ -0,0 +1,88 @@
+"""Tests for the PR fetcher."""
+
+import json
+
+from app.pr_review.pr_fetcher import PRFetcher
+
+
+PR_JSON = {
+    "number": 1,
+    "title": "Fix bug",
+    "body": None,
+    "state": "open",
+    "user": {"login": "alice"},
+    "author_association": "OWNER",
+    "base": {"ref": "main", "sha": "base1"},
+    "head": {"ref": "fix", "sha": "head1"},
+    "created_at": "2024-01-31T12:00:00Z",
+    "updated_at": "2024-01-31T12:00:00Z",
+    "merged_at": None,
+    "closed_at": None,
+    "commits": 1,
+    "changed_files": 1,
+    "additions": 1,
+    "deletions": 0,
+    "labels": [{"name": "bug"}],
+    "requested_reviewers": [],
+    "html_url": "https://github.com/owner/repo/pull/1",
+    "diff_url": "https://github.com/owner/repo/pull/1.diff",
+    "patch_url": "https://github.com/owner/repo/pull/1.patch",
+}
+
+FILE_JSON = {"filename": "app.py", "status": "modified", "additions": 1, "deletions": 0, "changes": 1, "patch": "@@"}
+
+
+class FakeRequester:
+    """Requester that serves a PR resource honouring If-None-Match, and its files."""
+
+    def __init__(self):
+        self.etag = '"v1"'
+        self.requests = []
+
+    def requestJson(self, verb, url, headers=None):
+        self.requests.append(url)
+        if headers and headers.get("If-None-Match") == self.etag:
+            return 304, {}, ""
+        return 200, {"etag": self.etag}, json.dumps(PR_JSON)
+
+    def requestJsonAndCheck(self, verb, url, parameters=None):
+        self.requests.append(url)
+        return {}, [FILE_JSON]
+
+
+class TestPRFetcher:
+    """Tests for PRFetcher class."""
+
+    def test_fetch_pr_reuses_data_on_not_modified(self):
+        """Test that a 200 body is used directly, a 304 returns the cached PR and a new ETag refetches."""
+        fetcher = PRFetcher(github_token="token", graphql_reviews=False)
+        requester = FakeRequester()
+        fetcher.github._Github__requester = requester
+
+        first = fetcher.fetch_pr("owner/repo", 1)
+        assert first.head_sha == "head1"
+        assert [f.filename for f in first.files] == ["app.py"]
+        assert requester.requests == ["/repos/owner/repo/pulls/1", "/repos/owner/repo/pulls/1/files"]
+
+        assert fetcher.fetch_pr("owner/repo", 1) is first
+        requester.etag = '"v2"'
+        assert fetcher.fetch_pr("owner/repo", 1) is not first
+        assert len(requester.requests) == 5
+
+    def test_fetch_pr_with_reviews_skips_etag(self):
+        """Test that reviews are always fetched in full, since they do not change the PR ETag."""
+        fetcher = PRFetcher(github_token="token", graphql_reviews=False)
+        fetcher.github._Github__requester = FakeRequester()
+        fetched = []
+
+        def fake_rest(repo_full_name, pr_number, include_reviews=False):
+            fetched.append(include_reviews)
+            return object()
+
+        fetcher._fetch_pr_rest = fake_rest
+
+        fetcher.fetch_pr("owner/repo", 1, include_reviews=True)
+        fetcher.fetch_pr("owner/repo", 1, include_reviews=True)
+
+        assert fetched == [True, True]
+        assert fetcher.github._Github__requester.requests == []
@@ -0,0 +1,53 @@
+"""Tests for the retrieval cache."""
+
+from app.workflow import RetrievalBundle
+from app.workflow.retriever_agent import RetrievalCache
+
+
+class TestRetrievalCache:
+    """Tests for RetrievalCache class."""
+
+    def test_round_trip_per_query(self, tmp_path):
+        """Test that a bundle is returned only for the same repo, hunk and query."""
+        cache = RetrievalCache(cache_dir=str(tmp_path))
+        bundle = RetrievalBundle(
+            hunk_id="app.py:1",
+            similar_code=[{"content": "x = 1", "metadata": {"file_path": "app.py"}}],
+            total_chunks=1,
+        )
+
+        cache.put("owner_repo_main", "sha1", "app.py:1", "x = 1", bundle)
+
+        assert cache.get("owner_repo_main", "sha1", "app.py:1", "x = 1") == bundle
+        assert cache.get("owner_repo_main", "sha1", "app.py:1", "x = 2") is None
+        assert cache.get("other_repo_main", "sha1", "app.py:1", "x = 1") is None
+
+    def test_reingest_invalidates(self, tmp_path):
+        """Test that a bundle cached for one index SHA is not served for another."""
+        cache = RetrievalCache(cache_dir=str(tmp_path))
+        bundle = RetrievalBundle(hunk_id="app.py:1", total_chunks=0)
+
+        cache.put("owner_repo_main", "sha1", "app.py:1", "x = 1", bundle)
+
+        assert cache.get("owner_repo_main", "sha2", "app.py:1", "x = 1") is None
+
+
+class TestRetrieverAgent:
+    """Tests for RetrieverAgent class."""
+
+    def test_retrieves_ingested_chunk(self, vector_store, ingest_chunk):
+        """Test that a chunk stored by ingestion is found with the state's vector_repo."""
+        from config.settings import settings
+        from app.workflow.retriever_agent import RetrieverAgent
+
+        vector = [1.0] + [0.0] * (settings.embedding_dimension - 1)
+        ingest_chunk("owner/repo", "app.py", vector, content="def f(): pass")
+        agent = RetrieverAgent(cache_dir=None)
+        agent.vector_store = vector_store
+        hunk = {"hunk_id": "app.py:1", "file_path": "app.py", "added_lines": ["def f(): pass"]}
+
+        bundle = agent.retrieve_for_hunk(
+            hunk, "owner_repo_main", query_embeddings={"def f(): pass": vector}, vector_repo="owner/repo"
+        )
+
+        assert [chunk["content"] for chunk in bundle.similar_code] == ["def f(): pass"]
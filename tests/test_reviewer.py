@@ -0,0 +1,58 @@
+"""Tests for the async reviewer agent."""
+
+import asyncio
+
+import pytest
+from app.workflow import AsyncReviewerAgent, WorkflowState, RetrievalBundle, ReviewIssue
+
+
+@pytest.fixture
+def workflow_state():
+    """Create a workflow state with several hunks ready for review."""
+    hunk_ids = [f"app.py:{i}" for i in range(1, 7)]
+    return WorkflowState(
+        run_id="repo_pr1",
+        repo_owner="owner",
+        repo_name="repo",
+        repo_id="owner_repo_main",
+        pr_number=1,
+        pr_sha="abc123",
+        diff_hash="deadbeef",
+        hunks=[{"hunk_id": hunk_id, "file_path": "app.py"} for hunk_id in hunk_ids],
+        retrieval_bundles={hunk_id: RetrievalBundle(hunk_id=hunk_id) for hunk_id in hunk_ids},
+    )
+
+
+class TestAsyncReviewerAgent:
+    """Tests for AsyncReviewerAgent class."""
+
+    def test_reviews_hunks_concurrently_in_order(self, workflow_state):
+        """Test that hunks run in parallel up to the cap and issues keep hunk order."""
+        agent = AsyncReviewerAgent(hunk_concurrency=3)
+        in_flight = 0
+        peak = 0
+
+        async def fake_review(hunk, bundle):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return [
+                ReviewIssue(
+                    severity="minor",
+                    category="style",
+                    file_path=hunk["file_path"],
+                    line_number=int(hunk["hunk_id"].split(":")[1]),
+                    explanation="Style nit",
+                    suggestion="Fix it",
+                    evidence_references=[hunk["hunk_id"]],
+                )
+            ]
+
+        agent.areview_hunk = fake_review
+
+        result = asyncio.run(agent(workflow_state))
+
+        assert peak == 3
+        assert [issue.line_number for issue in result["review_issues"]] == [1, 2, 3, 4, 5, 6]